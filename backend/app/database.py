@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+from typing import Dict, List
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
@@ -8,6 +9,18 @@ connect_args = {"check_same_thread": False} if DB_URL.startswith("sqlite") else
 
 engine = create_engine(DB_URL, pool_pre_ping=True, connect_args=connect_args)
 
+if DB_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL: 읽기가 쓰기를 막지 않음 / busy_timeout: 쓰기 경합 시 즉시 "database is locked" 대신 대기
+        # foreign_keys: SQLite 는 연결마다 꺼진 채 시작 → 켜야 ondelete=CASCADE/SET NULL 이 동작
+        #   (passive_deletes 관계의 rental_day_slots, ORM 관계가 없는 집계 테이블 등)
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -18,3 +31,29 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def ensure_columns(table: str, columns: Dict[str, str]) -> List[str]:
+    """
+    create_all은 기존 테이블에 컬럼을 추가하지 않으므로(SQLite),
+    누락된 컬럼만 ALTER TABLE ADD COLUMN. 추가한 컬럼명 목록 반환.
+    columns: {"avg_rating": "FLOAT NOT NULL DEFAULT 0.0", ...}
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+    added: List[str] = []
+    with engine.begin() as conn:
+        existing = {r[1] for r in conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()}
+        for name, ddl in columns.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+                print(f"[database] added {table}.{name}")
+                added.append(name)
+    return added
+
+
+def ensure_indexes() -> None:
+    """create_all은 이미 있는 테이블에 새로 선언된 인덱스를 만들지 않으므로 누락분만 생성"""
+    for table in Base.metadata.sorted_tables:
+        for ix in table.indexes:
+            ix.create(bind=engine, checkfirst=True)
@@ -1,19 +1,137 @@
 # FILE: app/deps.py
+"""
+인증 의존성
+
+- get_current_user: Bearer 토큰 → Principal(id, email, is_admin)
+  · typ=access 토큰(짧은 수명)은 클레임만으로 Principal 생성 → DB 조회 없음
+    폐기/권한 변경은 refresh 때 확인 (services.refresh_tokens)
+  · 예전 토큰(typ 없음)이나 이 프로세스에서 발급 이후 사용자가 바뀐 토큰은 사용자 행을 다시 확인
+  · 토큰별 결과를 TTL/LRU 캐시 → 같은 토큰의 반복 요청은 JWT 디코드도 없이 통과
+  · 사용자 행이 수정/삭제되면 commit 후 그 사용자의 캐시 항목을 모두 무효화 (invalidate_user)
+- get_current_user_model: ORM User 전체가 필요한 곳(/auth/me 등)에서만 사용
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+
 from . import models
-from .database import get_db
-from .settings import SECRET_KEY, ALGORITHM  # ← 통일
+from .database import SessionLocal, get_db
+from .settings import (  # ← 통일
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES,
+)
 
 # tokenUrl은 문서용이지만 경로는 실제 있는 엔드포인트로
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> models.User:
+
+@dataclass(frozen=True)
+class Principal:
+    """요청 처리에 필요한 최소 사용자 정보 (라우터는 id / is_admin 만 사용)"""
+    id: int
+    email: str
+    is_admin: bool = False
+
+
+# -------------------- 토큰 캐시 --------------------
+_lock = threading.Lock()
+_cache: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()  # token → (principal, 만료 monotonic)
+_by_user: Dict[int, Set[str]] = {}
+_generation: Dict[int, int] = {}
+_changed_at: Dict[int, float] = {}  # user_id → 마지막 변경 시각(epoch). 이보다 먼저 발급된 access 토큰은 클레임을 믿지 않음
+
+
+def _cache_get(token: str) -> Optional[Principal]:
+    with _lock:
+        hit = _cache.get(token)
+        if hit is None:
+            return None
+        principal, expires = hit
+        if time.monotonic() >= expires:
+            _drop(token, principal.id)
+            return None
+        _cache.move_to_end(token)
+        return principal
+
+
+def _drop(token: str, user_id: int) -> None:
+    # _lock 을 잡은 상태에서 호출
+    _cache.pop(token, None)
+    tokens = _by_user.get(user_id)
+    if tokens is not None:
+        tokens.discard(token)
+        if not tokens:
+            _by_user.pop(user_id, None)
+
+
+def _cache_put(token: str, principal: Principal, ttl: float, gen: int) -> None:
+    if ttl <= 0:
+        return
+    with _lock:
+        # 조회하는 사이 무효화됐으면 넣지 않음
+        if _generation.get(principal.id, 0) != gen:
+            return
+        _cache[token] = (principal, time.monotonic() + ttl)
+        _cache.move_to_end(token)
+        _by_user.setdefault(principal.id, set()).add(token)
+        while len(_cache) > AUTH_CACHE_MAX_ENTRIES:
+            old_token, (old, _) = _cache.popitem(last=False)
+            _drop(old_token, old.id)
+
+
+def invalidate_user(user_id: int) -> None:
+    """사용자 변경(권한/삭제 등) 시 그 사용자의 캐시된 토큰을 모두 제거"""
+    now = time.time()
+    with _lock:
+        _generation[user_id] = _generation.get(user_id, 0) + 1
+        _changed_at[user_id] = now
+        for token in _by_user.pop(user_id, set()):
+            _cache.pop(token, None)
+        if len(_changed_at) > AUTH_CACHE_MAX_ENTRIES:
+            # access 토큰 수명보다 오래된 기록은 의미 없음
+            horizon = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            for uid in [u for u, t in _changed_at.items() if t < horizon]:
+                del _changed_at[uid]
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
+        _by_user.clear()
+        _changed_at.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, _ctx) -> None:
+    ids = {o.id for o in list(session.dirty) + list(session.deleted) if isinstance(o, models.User)}
+    if ids:
+        session.info.setdefault("auth_dirty_users", set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for uid in session.info.pop("auth_dirty_users", ()):
+        invalidate_user(uid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("auth_dirty_users", None)
+
+
+# -------------------- 의존성 --------------------
+def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    principal = _cache_get(token)
+    if principal is not None:
+        return principal
+
     cred_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -24,10 +142,42 @@ def get_current_user(
         user_id = payload.get("sub")
         if user_id is None:
             raise cred_exc
-    except JWTError:
+        user_id = int(user_id)
+    except (JWTError, ValueError):
         raise cred_exc
 
-    user = db.get(models.User, int(user_id))
+    with _lock:
+        gen = _generation.get(user_id, 0)
+        changed = _changed_at.get(user_id)
+    iat = payload.get("iat")
+    if payload.get("typ") == "access" and iat is not None and (changed is None or float(iat) > changed):
+        principal = Principal(
+            id=user_id, email=payload.get("email") or "", is_admin=bool(payload.get("is_admin", False))
+        )
+    else:
+        with SessionLocal() as db:
+            user = db.get(models.User, user_id)
+            if not user:
+                raise cred_exc
+            principal = Principal(id=user.id, email=user.email, is_admin=bool(getattr(user, "is_admin", False)))
+
+    # 토큰 만료 시각을 넘겨 캐시하지 않음
+    exp = payload.get("exp")
+    ttl = AUTH_CACHE_TTL_SECONDS if exp is None else min(AUTH_CACHE_TTL_SECONDS, float(exp) - time.time())
+    _cache_put(token, principal, ttl, gen)
+    return principal
+
+
+def get_current_user_model(
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> models.User:
+    """ORM User 가 필요한 엔드포인트용 (프로필 응답 등)"""
+    user = db.get(models.User, principal.id)
     if not user:
-        raise cred_exc
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
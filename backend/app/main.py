@@ -1,5 +1,6 @@
 # FILE: app/main.py
 import os
+import asyncio
 import base64
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,15 +9,16 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.routing import APIRoute
 
 # ✅ 절대 임포트
-from app.database import Base, engine
-from app import models  # 모델 등록용 (create_all 전에 임포트)
+from app import migrations
 from app.routers import auth, products, rentals, photos
 from app.routers import payments, reviews
 from app.routers import products_popular  # 인기 상품 라우터
 from app.routers.reviews_summary import router as reviews_summary_router  # ✅ 리뷰 요약
-
-# --- DB schema bootstrap ---
-Base.metadata.create_all(bind=engine)
+from app.routers import search  # /search/products (검색 호환 경로)
+from app.routers import rental_events  # /rentals/events (아웃박스 소비)
+from app.routers import media  # /media (내용 해시 URL, 영구 캐시)
+from app.services import expiry, media_variants, upload_gc
+from app.settings import EXPIRY_SWEEP_INTERVAL_SECONDS, UPLOAD_GC_INTERVAL_SECONDS
 
 app = FastAPI(
     title="Sallae Mallae API",
@@ -25,6 +27,15 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# --- DB schema bootstrap (임포트 시가 아니라 시작 시 실행: app.migrations) ---
+@app.on_event("startup")
+def _bootstrap():
+    migrations.run()
+    _ensure_upload_tree()
+    _ensure_placeholder_png(os.path.join(PRODUCTS_DIR, "placeholder.png"))
+    # (선택) photos에도 플레이스홀더 하나 넣어둠
+    _ensure_placeholder_png(os.path.join(PHOTOS_DIR, "placeholder.png"))
+
 # --- CORS (dev: allow all origins) ---
 app.add_middleware(
     CORSMiddleware,
@@ -35,7 +46,17 @@ app.add_middleware(
 )
 
 # --- (선택) 응답 압축 ---
-app.add_middleware(GZipMiddleware, minimum_size=1024)
+class _GZipExceptMedia(GZipMiddleware):
+    """이미지(이미 압축됨, Range 응답)와 SSE(버퍼링되면 이벤트가 늦게 감)는 압축하지 않음"""
+    SKIP_PREFIXES = ("/media/", "/static/", "/rentals/events/stream")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope.get("path", "").startswith(self.SKIP_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(_GZipExceptMedia, minimum_size=1024)
 
 # --- Health check ---
 @app.get("/")
@@ -67,24 +88,21 @@ def _ensure_placeholder_png(dst_path: str) -> None:
     except Exception as e:
         print("[main] placeholder create failed:", repr(e))
 
-# 업로드 트리 보장 + 플레이스홀더 생성
-_ensure_upload_tree()
-_ensure_placeholder_png(os.path.join(PRODUCTS_DIR, "placeholder.png"))
-# (선택) photos에도 플레이스홀더 하나 넣어둠
-_ensure_placeholder_png(os.path.join(PHOTOS_DIR, "placeholder.png"))
-
-# /static → uploads 마운트
-app.mount("/static", StaticFiles(directory=UPLOAD_ROOT), name="static")
+# /static → uploads 마운트 (폴더는 시작 시 _bootstrap 에서 생성)
+app.mount("/static", StaticFiles(directory=UPLOAD_ROOT, check_dir=False), name="static")
 
 # --- Routers ---
 app.include_router(auth.router)
 app.include_router(products.router)
+app.include_router(rental_events.router)  # /rentals/{rental_id} 보다 먼저
 app.include_router(rentals.router)
 app.include_router(photos.router)
 app.include_router(payments.router)
 app.include_router(reviews.router)
 app.include_router(products_popular.router)
 app.include_router(reviews_summary_router)
+app.include_router(search.router)
+app.include_router(media.router)
 
 # --- Debug: print registered routes on startup ---
 def _dump_routes() -> None:
@@ -98,3 +116,30 @@ def _dump_routes() -> None:
 @app.on_event("startup")
 def _on_startup():
     _dump_routes()
+
+# --- Background: 대여 만료 스위퍼 (조회 API는 쓰기 없이 읽기만) ---
+@app.on_event("startup")
+async def _start_expiry_sweeper():
+    app.state.expiry_task = asyncio.create_task(expiry.run_periodically(EXPIRY_SWEEP_INTERVAL_SECONDS))
+
+@app.on_event("shutdown")
+async def _stop_expiry_sweeper():
+    task = getattr(app.state, "expiry_task", None)
+    if task:
+        task.cancel()
+
+# --- Background: 고아 업로드 격리 (설정 시에만) ---
+@app.on_event("startup")
+async def _start_upload_gc():
+    if UPLOAD_GC_INTERVAL_SECONDS > 0:
+        app.state.upload_gc_task = asyncio.create_task(upload_gc.run_periodically(UPLOAD_GC_INTERVAL_SECONDS))
+
+@app.on_event("shutdown")
+async def _stop_upload_gc():
+    task = getattr(app.state, "upload_gc_task", None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+def _stop_media_workers():
+    media_variants.shutdown()
@@ -0,0 +1,30 @@
+# FILE: app/migrations.py
+"""
+스키마 보정 + 파생 테이블 백필 (멱등)
+
+- 앱 시작(startup 이벤트) 때 한 번 실행. 수동 실행: python -m app.scripts.migrate
+- 임포트만으로는 DB 를 건드리지 않음 → 테스트/스크립트가 app.main 을 부작용 없이 임포트 가능
+"""
+from __future__ import annotations
+
+from .database import Base, SessionLocal, engine, ensure_columns, ensure_indexes
+from . import models  # noqa: F401  (create_all 전에 모델 등록)
+from .services import booking, product_stats, search_index, trending
+
+
+def run() -> None:
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    search_index.ensure_index(engine)  # 상품 FTS 인덱스 (SQLite FTS5, 없으면 LIKE 폴백)
+    ensure_columns("products", {
+        "avg_rating": "FLOAT NOT NULL DEFAULT 0.0",
+        "review_count": "INTEGER NOT NULL DEFAULT 0",
+    })
+    ensure_columns("product_stats", product_stats.HISTOGRAM_COLUMNS)
+    ensure_columns("photos", {"sha256": "VARCHAR(64)", "size_bytes": "INTEGER", "variants": "TEXT"})
+    ensure_columns("products", {"image_variants": "TEXT"})
+    with SessionLocal() as db:  # 집계/비정규화 값이 원본과 어긋나 있으면 보정 (컬럼 추가 여부와 무관)
+        product_stats.ensure_backfilled(db)
+        trending.ensure_backfilled(db)
+        booking.ensure_backfilled(db)
+        db.commit()
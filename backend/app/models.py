@@ -14,7 +14,9 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     Text,
+    Float,
     Index,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -92,6 +94,11 @@ class Product(Base):
     # 노출/검색용 메타
     region: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    image_variants: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # services.media_variants
+
+    # 리뷰 집계(비정규화): 리뷰 작성 시 같은 트랜잭션에서 갱신 (services.product_stats)
+    avg_rating: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # 소유자 (등록자)
     owner_id: Mapped[Optional[int]] = mapped_column(
@@ -113,6 +120,15 @@ class Product(Base):
     reviews: Mapped[List["Review"]] = relationship(
         "Review", back_populates="product", cascade="all,delete-orphan"
     )
+    stats: Mapped[Optional["ProductStats"]] = relationship(
+        "ProductStats", back_populates="product", uselist=False, cascade="all,delete-orphan"
+    )
+    trend: Mapped[Optional["ProductTrend"]] = relationship(
+        "ProductTrend", uselist=False, cascade="all,delete-orphan"
+    )
+    activity: Mapped[List["ProductActivityDaily"]] = relationship(
+        "ProductActivityDaily", cascade="all,delete-orphan"
+    )
 
     __table_args__ = (
         Index("ix_products_owner_created", "owner_id", "created_at"),
@@ -156,9 +172,35 @@ class Rental(Base):
     reviews: Mapped[List["Review"]] = relationship(
         "Review", back_populates="rental", cascade="all,delete-orphan"
     )
+    day_slots: Mapped[List["RentalDaySlot"]] = relationship(
+        "RentalDaySlot", cascade="all,delete-orphan", passive_deletes=True
+    )
 
     __table_args__ = (
         Index("ix_rentals_product_period", "product_id", "start_date", "end_date"),
+        # 소유자 대시보드: 상품별 상태 건수/매출 집계를 인덱스만으로 처리
+        Index("ix_rentals_product_status_price", "product_id", "status", "total_price"),
+    )
+
+
+class RentalDaySlot(Base):
+    """
+    (상품, 날짜) 예약 슬롯. 활성 대여가 점유한 날마다 1행.
+    UNIQUE(product_id, day) 덕분에 동시 예약이 와도 DB가 한쪽만 통과시킴 (services.booking)
+    """
+    __tablename__ = "rental_day_slots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    rental_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("rentals.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "day", name="uq_rental_day_slots_product_day"),
     )
 
 
@@ -178,6 +220,11 @@ class Photo(Base):
 
     file_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    # 업로드 시 계산한 내용 해시/크기 (services.uploads). 예전 행은 NULL
+    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # 파생본(썸네일 등) URL JSON (services.media_variants). 생성 전/Pillow 없음이면 NULL
+    variants: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False, index=True
@@ -229,12 +276,178 @@ class Review(Base):
     )
 
 
+class ProductStats(Base):
+    """
+    상품별 인기 집계(물리화 테이블)
+    - 리뷰/대여 생성·상태 변경 시 같은 트랜잭션에서 증분 갱신 (services.product_stats)
+    - /products/popular 는 ix_product_stats_popularity 로 상위 K개만 읽음
+    """
+    __tablename__ = "product_stats"
+
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rental_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # CANCELED 제외
+
+    # 별점 분포(1~5): 상세 화면 히스토그램용
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    popularity: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    product: Mapped[Product] = relationship("Product", back_populates="stats")
+
+    __table_args__ = (
+        Index("ix_product_stats_popularity", "popularity"),
+    )
+
+
+class ProductTrend(Base):
+    """
+    시간 감쇠 인기(트렌딩) 점수
+    - score_log = log2( Σ weight · 2^((t - epoch) / half_life) )  (services.trending)
+    - 기준 시점(epoch)에 고정된 값이라 시간이 지나도 순서가 변하지 않음 → 재계산 없이 인덱스 정렬
+    """
+    __tablename__ = "product_trends"
+
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    score_log: Mapped[float] = mapped_column(Float, nullable=False)
+    last_event_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_product_trends_score", "score_log"),
+    )
+
+
+class ProductActivityDaily(Base):
+    """상품별 일 단위(UTC) 활동 카운터: 최근 N일 대여/리뷰 수를 원본 스캔 없이 조회"""
+    __tablename__ = "product_activity_daily"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    rentals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reviews: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "day", name="uq_product_activity_daily"),
+    )
+
+
+class ProductActivityHourly(Base):
+    """상품별 시간 단위(UTC, 정시) 활동 카운터: 최근 N시간 조회용. 오래된 행은 스위퍼가 정리"""
+    __tablename__ = "product_activity_hourly"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    hour: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    rentals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reviews: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "hour", name="uq_product_activity_hourly"),
+    )
+
+
+class MediaBlob(Base):
+    """
+    내용 주소(SHA-256) 업로드 저장소의 blob 1개 (services.blob_store)
+    - 파일: uploads/blobs/ab/cd/<sha256><ext>  (같은 바이트는 한 번만 저장)
+    - ref_count: 이 blob 을 가리키는 행(photos.url / products.image_url) 수. 0 이 되면 파일 삭제
+    """
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    ext: Mapped[str] = mapped_column(String(10), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RentalEvent(Base):
+    """
+    대여 상태 변경 아웃박스 (services.outbox)
+    - 대여 생성/상태 전이와 같은 트랜잭션에서 1행씩 기록 → 커밋된 변경만 보임
+    - seq 는 단조 증가(AUTOINCREMENT, 재사용 없음): 소비자는 seq > 마지막 처리값 만 읽음
+    - 원본 대여가 지워져도 이벤트는 남도록 FK 없음
+    """
+    __tablename__ = "rental_events"
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    rental_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    old_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # 생성 이벤트는 None
+    new_status: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_rental_events_user_seq", "user_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class OutboxOffset(Base):
+    """아웃박스 소비자별 처리 위치 (consumer 이름 → 마지막으로 처리한 seq)"""
+    __tablename__ = "outbox_offsets"
+
+    consumer: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class RefreshToken(Base):
+    """
+    회전식 refresh 토큰 (services.refresh_tokens)
+    - 원문은 저장하지 않고 sha256 만 저장 (token_hash 유니크 인덱스 → refresh 때만 조회)
+    - 한 번 쓰면 revoked_at 이 찍히고 같은 family 로 새 토큰 발급
+    - 이미 쓴 토큰이 다시 오면(탈취 의심) family 전체 폐기
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    family_id: Mapped[str] = mapped_column(String(32), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
 __all__ = [
     "User",
     "Product",
     "Rental",
     "Photo",
     "Review",
+    "RentalDaySlot",
+    "ProductStats",
+    "ProductTrend",
+    "ProductActivityDaily",
+    "ProductActivityHourly",
+    "MediaBlob",
+    "RentalEvent",
+    "OutboxOffset",
+    "RefreshToken",
     "RentalStatus",
     "PhotoKind",
 ]
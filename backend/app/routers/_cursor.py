@@ -0,0 +1,50 @@
+# app/routers/_cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """페이지 커서(불투명 문자열)로 인코딩: urlsafe base64(JSON)"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(s: Optional[str]) -> Optional[Dict[str, Any]]:
+    """디코딩 실패/빈 값/객체가 아닌 JSON 이면 None (첫 페이지로 취급)"""
+    if not s:
+        return None
+    try:
+        obj = json.loads(base64.urlsafe_b64decode(s.encode()).decode())
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _invalid() -> HTTPException:
+    return HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def cursor_int(cur: Dict[str, Any], key: str) -> Optional[int]:
+    """커서의 정수 필드 (없으면 None, 정수가 아니면 400)"""
+    v = cur.get(key)
+    if v is None:
+        return None
+    if isinstance(v, bool) or not isinstance(v, int):
+        raise _invalid()
+    return v
+
+
+def cursor_datetime(cur: Dict[str, Any], key: str) -> Optional[datetime]:
+    """커서의 ISO 시각 필드 (없으면 None, 형식이 틀리면 400)"""
+    v = cur.get(key)
+    if v is None:
+        return None
+    if not isinstance(v, str):
+        raise _invalid()
+    try:
+        return datetime.fromisoformat(v)
+    except ValueError:
+        raise _invalid()
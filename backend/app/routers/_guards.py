@@ -1,18 +1,41 @@
 # app/routers/_guards.py
+from typing import Optional
+
 from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+
 
-def assert_owner_or_admin(resource_owner_id: int, user) -> None:
+def is_admin_now(user, db: Optional[Session] = None) -> bool:
+    """
+    관리자 권한 확인. access 토큰 클레임은 발급 시점 값이라(수명 동안 유효)
+    클레임이 관리자일 때만 DB 의 현재 is_admin 을 한 번 더 확인 → 강등/삭제 즉시 반영.
+    일반 사용자 요청은 DB 조회 없음.
+    """
+    if not getattr(user, "is_admin", False):
+        return False
+    stmt = select(models.User.is_admin).where(models.User.id == getattr(user, "id", None))
+    if db is None:
+        with SessionLocal() as s:
+            return bool(s.scalar(stmt))
+    return bool(db.scalar(stmt))
+
+
+def assert_owner_or_admin(resource_owner_id: int, user, db: Optional[Session] = None) -> None:
     """
     리소스 소유자이거나 관리자일 때만 통과.
     아니면 403 Forbidden 발생.
     """
-    if (getattr(user, "id", None) != resource_owner_id) and (not getattr(user, "is_admin", False)):
+    if getattr(user, "id", None) != resource_owner_id and not is_admin_now(user, db):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
 
-def require_admin(user) -> None:
+def require_admin(user, db: Optional[Session] = None) -> None:
     """
-    관리자만 허용해야 하는 엔드포인트에서 사용.
+    관리자만 허용해야 하는 엔드포인트에서 사용 (DB 의 현재 권한 기준).
     """
-    if not getattr(user, "is_admin", False):
+    if not is_admin_now(user, db):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
@@ -1,26 +1,31 @@
 # FILE: app/routers/auth.py
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
-from passlib.context import CryptContext
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
-from ..deps import get_current_user          # ✅ 검증은 deps의 단일 경로만 사용
+from ..database import SessionLocal
+from ..deps import get_current_user, get_current_user_model  # ✅ 검증은 deps의 단일 경로만 사용
+from ..services import passwords, refresh_tokens
 from ..settings import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES  # ✅ 한 곳에서만 키 관리
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # Password hashing
 # -----------------------------
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt 는 services.passwords 의 전용 풀에서만 실행 (이벤트 루프/기본 스레드풀을 막지 않음)
+pwd_context = passwords.pwd_context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -28,80 +33,186 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def _overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress. Retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
 # -----------------------------
 # JWT
 # -----------------------------
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    # 만료는 UTC 기준으로 설정
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    # 만료는 UTC 기준으로 설정. typ=access 토큰은 클레임(sub/email/is_admin)만으로 인가 (deps.get_current_user)
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode = data.copy()
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": now, "typ": "access"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def _token_pair(db: Session, user_id: int, email: str, is_admin: bool, family_id: Optional[str] = None) -> schemas.Token:
+    """access 토큰 + 새 refresh 토큰 (refresh 행 commit 은 호출 측)"""
+    access = create_access_token({"sub": str(user_id), "email": email, "is_admin": is_admin})
+    return schemas.Token(
+        access_token=access,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_tokens.issue(db, user_id, family_id),
+    )
+
+# -----------------------------
+# Helpers
+# -----------------------------
+# bcrypt 를 기다리는 동안 DB 커넥션을 잡고 있으면 로그인 폭주가 커넥션 풀을 다 써서
+# 다른 요청까지 막힘 → 조회/저장은 각각 짧은 세션(스레드)에서, 해시는 passwords 풀에서
+
+def _lookup(email: str) -> Optional[Tuple[int, str, str, bool]]:
+    """(id, email, hashed_password, is_admin) 또는 None"""
+    with SessionLocal() as db:
+        user = db.query(models.User).filter(models.User.email == email).first()
+        if not user:
+            return None
+        return user.id, user.email, user.hashed_password, bool(getattr(user, "is_admin", False))
+
+def _email_taken(email: str) -> bool:
+    with SessionLocal() as db:
+        return db.query(models.User.id).filter(models.User.email == email).first() is not None
+
+def _add_user(db_user: models.User) -> models.User:
+    # _email_taken 이후 같은 이메일이 먼저 가입된 경우(동시 요청)는 UNIQUE 위반 → 400
+    with SessionLocal() as db:
+        db.add(db_user)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Email already registered.")
+        db.refresh(db_user)
+        return db_user
+
+def _login_tokens(user_id: int, email: str, is_admin: bool) -> schemas.Token:
+    with SessionLocal() as db:
+        token = _token_pair(db, user_id, email, is_admin)
+        db.commit()
+        return token
+
+def _rotate(raw: str) -> schemas.Token:
+    # refresh 때만 DB 확인: 토큰 폐기 여부 + 사용자 존재/현재 권한을 새 access 토큰 클레임에 반영
+    with SessionLocal() as db:
+        user, new_raw = refresh_tokens.rotate(db, raw)
+        return schemas.Token(
+            access_token=create_access_token({
+                "sub": str(user.id),
+                "email": user.email,
+                "is_admin": bool(getattr(user, "is_admin", False)),
+            }),
+            expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            refresh_token=new_raw,
+        )
+
+def _revoke(raw: str) -> None:
+    with SessionLocal() as db:
+        refresh_tokens.revoke(db, raw)
+
+def _save_rehash(user_id: int, old_hash: str, new_hash: str) -> None:
+    # 저장된 해시의 cost 가 현재 설정과 다를 때만 호출됨. 그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음
+    with SessionLocal() as db:
+        user = db.get(models.User, user_id)
+        if user is not None and user.hashed_password == old_hash:
+            user.hashed_password = new_hash
+            db.commit()
+
+async def _authenticate(email: str, password: str) -> Optional[schemas.Token]:
+    found = await asyncio.to_thread(_lookup, email)
+    if not found:
+        return None
+    user_id, user_email, hashed, is_admin = found
+    try:
+        ok, new_hash = await passwords.verify_and_update(password, hashed)
+    except passwords.Overloaded:
+        raise _overloaded()
+    if not ok:
+        return None
+    if new_hash:
+        try:
+            await asyncio.to_thread(_save_rehash, user_id, hashed, new_hash)
+        except Exception:  # 재해시 실패는 로그인 실패가 아님 (다음 로그인에서 다시 시도)
+            logger.exception("password rehash failed for user %s", user_id)
+    return await asyncio.to_thread(_login_tokens, user_id, user_email, is_admin)
+
 # -----------------------------
 # Endpoints
 # -----------------------------
 
 @router.post("/register", response_model=schemas.UserOut, status_code=201)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate):
     """
     회원가입
     Body: { email, password, full_name? }
     """
-    exists = db.query(models.User).filter(models.User.email == user.email).first()
-    if exists:
+    if await asyncio.to_thread(_email_taken, user.email):
         raise HTTPException(status_code=400, detail="Email already registered.")
 
+    try:
+        hashed = await passwords.hash_password(user.password)
+    except passwords.Overloaded:
+        raise _overloaded()
     db_user = models.User(
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=hashed,
         full_name=user.full_name,
         is_admin=False,  # 기본값
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await asyncio.to_thread(_add_user, db_user)
 
 @router.post("/login", response_model=schemas.Token)
-def login(payload: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(payload: schemas.UserLogin):
     """
     JSON 로그인
     Body: { email, password }
     """
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    token = await _authenticate(payload.email, payload.password)
+    if not token:
         raise HTTPException(status_code=401, detail="Invalid email or password.")
-
-    token = create_access_token({
-        "sub": str(user.id),
-        "email": user.email,
-        "is_admin": bool(getattr(user, "is_admin", False)),
-    })
-    return schemas.Token(access_token=token)
+    return token
 
 @router.post("/token", response_model=schemas.Token)
-def login_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_token(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     OAuth2 Password Flow (폼 로그인용: username = email)
     """
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    token = await _authenticate(form_data.username, form_data.password)
+    if not token:
         raise HTTPException(status_code=401, detail="Incorrect username or password.")
+    return token
 
-    token = create_access_token({
-        "sub": str(user.id),
-        "email": user.email,
-        "is_admin": bool(getattr(user, "is_admin", False)),
-    })
-    return schemas.Token(access_token=token)
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh(payload: schemas.RefreshIn):
+    """
+    refresh 토큰 회전: 쓴 토큰은 폐기되고 새 access/refresh 쌍을 돌려줌.
+    이미 쓴 토큰을 다시 보내면 같은 로그인에서 이어진 refresh 토큰이 모두 폐기됨 (다시 로그인 필요)
+    """
+    try:
+        return await asyncio.to_thread(_rotate, payload.refresh_token)
+    except refresh_tokens.InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout", status_code=204)
+async def logout(payload: schemas.RefreshIn):
+    """
+    refresh 토큰 폐기 (같은 로그인에서 이어진 토큰 전체).
+    이미 받은 access 토큰은 만료(ACCESS_TOKEN_EXPIRE_MINUTES)까지 유효
+    """
+    await asyncio.to_thread(_revoke, payload.refresh_token)
 
 @router.get("/me", response_model=schemas.UserOut)
-def me(current_user: models.User = Depends(get_current_user)):
+def me(current_user: models.User = Depends(get_current_user_model)):
     """
     현재 로그인 사용자 정보.
-    반드시 deps.get_current_user를 통해 같은 검증 경로를 타게 한다.
+    반드시 deps.get_current_user를 통해 같은 검증 경로를 타게 한다. (프로필 전체가 필요해서 ORM User 로 조회)
     """
     return current_user
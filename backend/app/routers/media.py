@@ -0,0 +1,177 @@
+# FILE: app/routers/media.py
+"""
+업로드 미디어 서빙 (내용 해시 URL → 영구 캐시)
+
+- GET/HEAD /media/<sha256><ext>             : 원본 blob (services.blob_store)
+- GET/HEAD /media/<sha256><ext>?variant=... : 미리 만든 축소본(thumb/card/full). Accept 에 image/webp 가 있으면 webp
+- GET/HEAD /media/v/<kind>/<file>           : 축소본 파일 직접 (services.media_variants 가 기록한 URL)
+
+응답 헤더
+- Cache-Control: public, max-age=1년, immutable  → 같은 URL 은 내용이 절대 바뀌지 않음
+- ETag: 강한 ETag (원본은 sha256 그대로, 축소본은 파일명+크기+mtime)
+- If-None-Match / If-Modified-Since → 304 (본문 없음)
+- Range: bytes=a-b (단일 구간) → 206, If-Range 지원, 범위 밖 → 416
+/static 마운트는 예전 URL 호환용으로 유지
+"""
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from ..services import blob_store, media_variants
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CHUNK = 256 * 1024
+# media_variants 가 만드는 이름만: <stem>_<size>.<webp|jpg> (".", ".." 등은 여기서 404)
+_VARIANT_FILE_RE = re.compile(
+    r"^[A-Za-z0-9][\w-]*_(?:%s)\.(?:webp|jpg)$" % "|".join(map(re.escape, media_variants.SIZES))
+)
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [t.strip() for t in header.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+def _not_modified_since(header: Optional[str], mtime: float) -> bool:
+    if not header:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """단일 구간만 지원: (start, end 포함). 형식이 다르면 None(전체 응답), 범위 밖이면 (-1, -1)"""
+    m = _RANGE_RE.match(header.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return None
+    if m.group(1):
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    else:  # bytes=-N : 마지막 N 바이트
+        start, end = max(size - int(m.group(2)), 0), size - 1
+    if start >= size or start > end:
+        return (-1, -1)
+    return (start, end)
+
+
+async def _iter_file(path: Path, start: int, length: int):
+    f = await asyncio.to_thread(path.open, "rb")
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _serve(request: Request, path: Path, etag: str, vary: Optional[str] = None) -> Response:
+    try:
+        st = await asyncio.to_thread(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not stat.S_ISREG(st.st_mode):  # 디렉터리 등은 서빙하지 않음
+        raise HTTPException(status_code=404, detail="Not found")
+
+    headers = {
+        "Cache-Control": CACHE_CONTROL,
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+    if vary:
+        headers["Vary"] = vary
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    # 조건부 요청: If-None-Match 가 있으면 If-Modified-Since 는 무시 (RFC 9110)
+    inm = request.headers.get("if-none-match")
+    if _etag_matches(inm, etag) or (
+        inm is None and _not_modified_since(request.headers.get("if-modified-since"), st.st_mtime)
+    ):
+        return Response(status_code=304, headers=headers)
+
+    rng = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if rng and (if_range is None or if_range.strip() == etag):
+        parsed = _parse_range(rng, st.st_size)
+        if parsed == (-1, -1):
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{st.st_size}"})
+        if parsed is not None:
+            start, end = parsed
+            length = end - start + 1
+            headers.update({"Content-Range": f"bytes {start}-{end}/{st.st_size}", "Content-Length": str(length)})
+            if request.method == "HEAD":
+                return Response(status_code=206, headers=headers, media_type=media_type)
+            return StreamingResponse(
+                _iter_file(path, start, length), status_code=206, headers=headers, media_type=media_type
+            )
+
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=st, method=request.method)
+
+
+def _variant_etag(path: Path) -> str:
+    st = path.stat()
+    base = f"{path.name}-{st.st_size}-{st.st_mtime_ns}"
+    return '"' + hashlib.sha1(base.encode()).hexdigest() + '"'
+
+
+@router.api_route("/v/{kind}/{filename}", methods=["GET", "HEAD"])
+async def get_variant_file(kind: str, filename: str, request: Request):
+    if kind not in media_variants.subdirs() or not _VARIANT_FILE_RE.match(filename):
+        raise HTTPException(status_code=404, detail="Not found")
+    path = media_variants.VARIANT_ROOT / kind / filename
+    try:
+        etag = await asyncio.to_thread(_variant_etag, path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Not found")
+    return await _serve(request, path, etag)
+
+
+@router.api_route("/{name}", methods=["GET", "HEAD"])
+async def get_blob(
+    name: str,
+    request: Request,
+    variant: Optional[str] = Query(None, description="thumb | card | full (미리 만든 축소본)"),
+):
+    parsed = blob_store.parse_name(name)
+    if not parsed:
+        raise HTTPException(status_code=404, detail="Not found")
+    sha, ext = parsed
+
+    if variant:
+        if variant not in media_variants.SIZES:
+            raise HTTPException(status_code=400, detail="Unknown variant")
+        fmt = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+        for kind in media_variants.subdirs():
+            path = media_variants.file_for(kind, sha, variant, fmt)
+            if await asyncio.to_thread(path.exists):
+                etag = await asyncio.to_thread(_variant_etag, path)
+                return await _serve(request, path, etag, vary="Accept")
+        # 아직 생성 전이면 원본으로 (짧게만 캐시)
+        resp = await _serve(request, blob_store.path_for(sha, ext), f'"{sha}"', vary="Accept")
+        resp.headers["Cache-Control"] = "public, max-age=60"
+        return resp
+
+    return await _serve(request, blob_store.path_for(sha, ext), f'"{sha}"')
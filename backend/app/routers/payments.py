@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from typing import Optional
 
 from ..database import get_db
-from ..deps import get_current_user
+from ..deps import Principal, get_current_user
 from .. import models
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -26,7 +26,7 @@ def _calc_expected_amount(r: models.Rental) -> float:
     # 데모: 대여료 합계 + 보증금 기준 (모델에 이미 total_price, deposit 존재)
     return float((r.total_price or 0) + (r.deposit or 0))
 
-def _do_checkout(payload: PayIn, db: Session, user: models.User) -> PayOut:
+def _do_checkout(payload: PayIn, db: Session, user: Principal) -> PayOut:
     r = db.get(models.Rental, payload.rental_id)
     if not r:
         raise HTTPException(status_code=404, detail="Rental not found")
@@ -53,7 +53,7 @@ def _do_checkout(payload: PayIn, db: Session, user: models.User) -> PayOut:
 def checkout(
     payload: PayIn,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return _do_checkout(payload, db, user)
 
@@ -62,6 +62,6 @@ def checkout(
 def simulate(
     payload: PayIn,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return _do_checkout(payload, db, user)
@@ -1,13 +1,15 @@
 # FILE: app/routers/photos.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from pathlib import Path
-import shutil
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, List
 
 from .. import models
 from ..database import get_db
+from ..services import blob_store, media_variants, uploads
+from ..deps import Principal
 from .auth import get_current_user
 
 router = APIRouter(prefix="/photos", tags=["photos"])
@@ -19,7 +21,7 @@ PHOTO_DIR.mkdir(parents=True, exist_ok=True)
 
 # main.py에 app.mount("/static", StaticFiles(directory="uploads"), name="static") 필수
 STATIC_PREFIX = "/static/photos"
-ALLOWED = {".jpg", ".jpeg", ".png", ".webp"}
+ALLOWED = uploads.ALLOWED_IMAGE_EXTS
 
 
 def _now_iso() -> str:
@@ -72,6 +74,8 @@ def _normalize_photo_dict(p: models.Photo) -> Dict[str, Any]:
         if isinstance(created, datetime):
             created = created.astimezone(timezone.utc).isoformat()
 
+    variants = media_variants.parse(getattr(p, "variants", None))
+
     return {
         "id": p.id,
         "rental_id": p.rental_id,
@@ -79,84 +83,163 @@ def _normalize_photo_dict(p: models.Photo) -> Dict[str, Any]:
         "file_url": file_url,   # 서버 내부 표준
         "url": file_url,        # 클라이언트 호환
         "created_at": created,
+        "sha256": getattr(p, "sha256", None),
+        "size_bytes": getattr(p, "size_bytes", None),
+        "thumbnail_url": media_variants.thumbnail_url(variants, file_url),
+        "variants": variants,   # 썸네일/카드/전체 (생성 전이면 빈 dict)
     }
 
 
+MAX_BATCH_FILES = 20
+
+
+def _insert_photos(db: Session, rid: int, phase_val: str, blobs: List[blob_store.Blob]) -> List[Dict[str, Any]]:
+    """DB insert (스레드에서 실행): blob 참조 +1, 모델 컬럼명에 맞춰 동적 set. 여러 장이어도 commit 1회."""
+    names = _photo_field_names()
+    photos = []
+    for blob in blobs:
+        photo = models.Photo()
+        photo.rental_id = rid
+        if names["phase"]:
+            setattr(photo, names["phase"], phase_val)
+        if names["file"]:
+            setattr(photo, names["file"], blob.url)
+        photo.sha256 = blob.sha256
+        photo.size_bytes = blob.size
+        # created_at은 DB default면 생략
+        photos.append(photo)
+
+    try:
+        for blob in blobs:
+            blob_store.acquire(db, blob)
+        db.add_all(photos)
+        db.flush()  # id/created_at 확정 → commit 후 다시 읽지 않도록 여기서 응답을 만듦
+        out = [_normalize_photo_dict(p) for p in photos]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return out
+
+
+async def _resolve_target(db: Session, rid: Optional[int], phase: Optional[str]) -> str:
+    """rental 존재 확인 + phase 정규화 (단건/일괄 공용)"""
+    if not rid:
+        raise HTTPException(status_code=422, detail="rental_id is required")
+
+    # 대여 존재/소유 확인(원하면 소유 확인 주석 해제)
+    rental = await asyncio.to_thread(db.get, models.Rental, rid)
+    if not rental:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    # if rental.user_id != current_user.id and not getattr(current_user, "is_admin", False):
+    #     raise HTTPException(status_code=403, detail="Not allowed")
+
+    phase_val = (phase or "").strip().upper()
+    if phase_val not in ("BEFORE", "AFTER"):
+        raise HTTPException(status_code=400, detail="phase must be BEFORE or AFTER")
+    return phase_val
+
+
 @router.post("/upload", status_code=201)
 async def upload_photo(
+    background: BackgroundTasks,
     rental_id: Optional[int] = Form(None),
     rental_id_alias: Optional[int] = Form(None, alias="rentalId"),
     phase: Optional[str] = Form(None),
     kind: Optional[str] = Form(None),  # phase alias
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     업로드 폼 키 허용:
       - rental_id 또는 rentalId
       - phase 또는 kind (BEFORE/AFTER)
       - file
+
+    파일 쓰기/해시와 DB 작업은 모두 스레드에서 실행 (이벤트 루프를 막지 않음)
     """
     rid = rental_id if rental_id is not None else rental_id_alias
-    if not rid:
-        raise HTTPException(status_code=422, detail="rental_id is required")
+    phase_val = await _resolve_target(db, rid, phase or kind)
 
-    # 대여 존재/소유 확인(원하면 소유 확인 주석 해제)
-    rental = db.get(models.Rental, rid)
-    if not rental:
-        raise HTTPException(status_code=404, detail="Rental not found")
-    # if rental.user_id != current_user.id and not getattr(current_user, "is_admin", False):
-    #     raise HTTPException(status_code=403, detail="Not allowed")
+    ext = uploads.image_ext(file.filename)
 
-    # phase/확장자 체크
-    phase_val = (phase or kind or "").strip().upper()
-    if phase_val not in ("BEFORE", "AFTER"):
-        raise HTTPException(status_code=400, detail="phase must be BEFORE or AFTER")
-
-    ext = Path(file.filename or "").suffix.lower()
-    if ext not in ALLOWED:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
-
-    # 파일 저장
-    ts = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-    fname = f"rental{rid}_{phase_val}_{ts}{ext}"
-    dst = PHOTO_DIR / fname
+    # 파일 저장 (청크 스트리밍 + 크기 상한 + sha256) → 내용 주소 blob (같은 사진 재업로드는 1번만 저장)
     try:
-        with dst.open("wb") as f:
-            shutil.copyfileobj(file.file, f)
+        blob = await blob_store.put(file, ext)
+    except HTTPException:
+        raise
     except Exception as e:
         print("[/photos/upload] save ERROR:", repr(e))
         raise HTTPException(status_code=500, detail="Upload failed")
 
-    url = _build_url(fname)
+    try:
+        out = (await asyncio.to_thread(_insert_photos, db, rid, phase_val, [blob]))[0]
+    except Exception as e:
+        # 아무도 참조하지 않으면 파일 삭제
+        await asyncio.to_thread(blob_store.cleanup_if_unreferenced, blob)
+        print("[/photos/upload] DB ERROR:", repr(e))
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+    # 썸네일/카드/전체 파생본은 응답 후 프로세스 풀에서 생성
+    background.add_task(media_variants.generate, "photo", out["id"], blob.path)
+    return out
 
-    # DB insert: 모델 컬럼명에 맞춰 동적 set
-    names = _photo_field_names()
-    photo = models.Photo()
-    photo.rental_id = rid
-    if names["phase"]:
-        setattr(photo, names["phase"], phase_val)
-    if names["file"]:
-        setattr(photo, names["file"], url)
-    # created_at은 DB default면 생략
+
+@router.post("/upload/batch", status_code=201)
+async def upload_photos_batch(
+    background: BackgroundTasks,
+    rental_id: Optional[int] = Form(None),
+    rental_id_alias: Optional[int] = Form(None, alias="rentalId"),
+    phase: Optional[str] = Form(None),
+    kind: Optional[str] = Form(None),  # phase alias
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    한 대여·한 단계(BEFORE/AFTER) 사진 여러 장을 요청 1번으로 업로드.
+    - 폼 키: rental_id|rentalId, phase|kind, files (여러 개)
+    - 파일은 순서대로 blob 저장소에 스트리밍, Photo 행은 트랜잭션 1개로 모두 insert
+    - 하나라도 실패하면 전체 실패 (새로 저장한 파일은 정리)
+    응답: 업로드 순서대로 정규화된 사진 목록
+    """
+    rid = rental_id if rental_id is not None else rental_id_alias
+    phase_val = await _resolve_target(db, rid, phase or kind)
+
+    if not files:
+        raise HTTPException(status_code=422, detail="files is required")
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {MAX_BATCH_FILES})")
+    exts = [uploads.image_ext(f.filename) for f in files]  # 저장 전에 모두 검증
+
+    blobs: List[blob_store.Blob] = []
+
+    async def _cleanup():
+        for b in blobs:
+            await asyncio.to_thread(blob_store.cleanup_if_unreferenced, b)
 
     try:
-        db.add(photo)
-        db.commit()
-        db.refresh(photo)
+        for f, ext in zip(files, exts):
+            blobs.append(await blob_store.put(f, ext))
+    except HTTPException:
+        await _cleanup()
+        raise
     except Exception as e:
-        # 롤백 및 파일 삭제
-        db.rollback()
-        try:
-            if dst.exists():
-                dst.unlink()
-        except Exception:
-            pass
-        print("[/photos/upload] DB ERROR:", repr(e))
+        await _cleanup()
+        print("[/photos/upload/batch] save ERROR:", repr(e))
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+    try:
+        out = await asyncio.to_thread(_insert_photos, db, rid, phase_val, blobs)
+    except Exception as e:
+        await _cleanup()
+        print("[/photos/upload/batch] DB ERROR:", repr(e))
         raise HTTPException(status_code=500, detail="Upload failed")
 
-    return _normalize_photo_dict(photo)
+    # 파생본: 서로 다른 사진은 프로세스 풀에서 병렬로, 같은 내용은 한 번만 렌더링
+    background.add_task(media_variants.generate_many, "photo", [(item["id"], b.path) for item, b in zip(out, blobs)])
+    return out
 
 
 # 조회(여러 alias 제공)
@@ -191,7 +274,7 @@ def list_photos_query(
 def delete_photo(
     photo_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     p = db.get(models.Photo, photo_id)
     if not p:
@@ -201,10 +284,11 @@ def delete_photo(
     if not rental or rental.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    # 실제 파일 삭제
+    # 실제 파일 삭제: blob 이면 flush 때 참조 -1 (blob_store, 0 이 되면 commit 후 삭제),
+    # 예전 방식 파일은 바로 삭제
     names = _photo_field_names()
     file_url = getattr(p, names["file"], None) or ""
-    if file_url.startswith(f"{STATIC_PREFIX}/"):
+    if not blob_store.sha_from_url(file_url) and file_url.startswith(f"{STATIC_PREFIX}/"):
         try:
             fname = file_url[len(f"{STATIC_PREFIX}/") :]
             path = PHOTO_DIR / fname
@@ -1,14 +1,16 @@
 # FILE: app/routers/products.py
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import and_, or_, exists
 from typing import List, Optional
 from pathlib import Path
-import shutil
-from datetime import datetime
+import asyncio
+from datetime import date
 
 from .. import models, schemas
 from ..database import get_db
+from ..services import availability, blob_store, media_variants, product_stats, search_index, uploads
+from ._cursor import encode_cursor, decode_cursor, cursor_datetime, cursor_int
 
 # ✅ 로드 경로 로그(정말 이 파일이 로딩되는지 확인용)
 print("[ROUTER] products loaded from:", Path(__file__).resolve())
@@ -23,6 +25,7 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 @router.post("/with-image", response_model=schemas.ProductOut, include_in_schema=True)
 @router.post("/with-image/", response_model=schemas.ProductOut, include_in_schema=True)
 async def create_product_with_image(
+    background: BackgroundTasks,
     # 이름은 name/title 둘 다 허용
     name: Optional[str] = Form(None),
     title: Optional[str] = Form(None),
@@ -40,21 +43,11 @@ async def create_product_with_image(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
+    """파일 쓰기와 DB 작업은 스레드에서 실행 (이벤트 루프를 막지 않음)"""
     # 파일 확장자 검증
-    suffix = Path(file.filename).suffix.lower()
-    if suffix not in [".jpg", ".jpeg", ".png", ".webp"]:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
+    suffix = uploads.image_ext(file.filename)
 
-    # 저장
-    ts = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-    fname = f"product_{ts}{suffix}"
-    dst = UPLOAD_DIR / fname
-    with dst.open("wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    image_url = f"/static/products/{fname}"  # /static mount는 main.py에서 처리
-
-    # 값 정리
+    # 값 정리 (파일을 쓰기 전에 검증 → 거절된 요청이 파일을 남기지 않음)
     resolved_name = (name or title or "").strip()
     resolved_price = (
         price_per_day
@@ -64,6 +57,10 @@ async def create_product_with_image(
     if not resolved_name or resolved_price is None:
         raise HTTPException(status_code=400, detail="name/title and price are required")
 
+    # 저장 (청크 스트리밍 + 크기 상한 + sha256) → 내용 주소 blob
+    blob = await blob_store.put(file, suffix)
+    image_url = blob.url  # /static mount는 main.py에서 처리
+
     new = models.Product(
         name=resolved_name,
         description=description,
@@ -75,8 +72,27 @@ async def create_product_with_image(
         region=region,
         image_url=image_url,
     )
-    db.add(new)
-    db.commit()
+    try:
+        out = await asyncio.to_thread(_insert_product, db, new, blob)
+    except Exception:
+        await asyncio.to_thread(blob_store.cleanup_if_unreferenced, blob)
+        raise
+    # 썸네일/카드/전체 파생본은 응답 후 프로세스 풀에서 생성
+    background.add_task(media_variants.generate, "product", out["id"], blob.path)
+    return out
+
+
+def _insert_product(db: Session, new: models.Product, blob: blob_store.Blob) -> dict:
+    try:
+        blob_store.acquire(db, blob)
+        db.add(new)
+        db.flush()
+        search_index.upsert_product(db, new)
+        product_stats.on_product_created(db, new.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(new)
     return _normalize_product_row(new)
 
@@ -92,6 +108,7 @@ def _normalize_product_row(p) -> dict:
     name = getattr(p, "name", None)
     price = getattr(p, "price_per_day", None)
     image_url = getattr(p, "image_url", None) or getattr(p, "thumbnail_url", None)
+    variants = media_variants.parse(getattr(p, "image_variants", None))
 
     return {
         "id": getattr(p, "id", None),
@@ -99,41 +116,43 @@ def _normalize_product_row(p) -> dict:
         "title": name,  # ✅ 프론트 하위호환
         "description": getattr(p, "description", None),
         "image_url": image_url,
+        "thumbnail_url": media_variants.thumbnail_url(variants, image_url),
+        "variants": variants,
         "category": getattr(p, "category", None),
         "category_key": getattr(p, "category_key", None),
         "region": getattr(p, "region", None),
         "price_per_day": price,
         "daily_price": float(price) if price is not None else None,  # ✅ 클라 호환
         "deposit": getattr(p, "deposit", None),
+        "avg_rating": (getattr(p, "avg_rating", None) if getattr(p, "review_count", 0) else None),
+        "review_count": getattr(p, "review_count", None) or 0,
         "created_at": getattr(p, "created_at", None),
         "updated_at": getattr(p, "updated_at", None),
     }
 
 
-# -------------------- 목록 --------------------
-@router.get("", response_model=List[schemas.ProductOut])
-def list_products(
-    db: Session = Depends(get_db),
-    q: Optional[str] = Query(None, description="이름/설명 검색"),
-    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
-    region: Optional[str] = Query(None),
-    # 페이지네이션: page/size 우선 적용 (프론트 로그와 호환)
-    page: int = Query(1, ge=1),
-    size: int = Query(50, ge=1, le=200),
-    # (구버전 호환: skip/limit가 오면 무시)
-    skip: Optional[int] = Query(None, ge=0),
-    limit: Optional[int] = Query(None, ge=1, le=200),
-    include_inactive: bool = Query(False, description="비활성 상품 포함 여부(필드가 있으면)"),
-    sort: Optional[str] = Query(None, description="정렬 키(popular 등). 현재는 무시되고 별도 /products/popular 사용 권장"),
+# -------------------- 목록 필터 (목록/커서 페이지 공용) --------------------
+def _filtered_query(
+    db: Session,
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    region: Optional[str] = None,
+    include_inactive: bool = False,
+    available_from: Optional[date] = None,
+    available_to: Optional[date] = None,
 ):
     query = db.query(models.Product)
 
-    # 검색: name/description like
+    # 검색: FTS 인덱스(n-gram) 우선, 사용 불가 시 name/description like
     if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(models.Product.name.like(like), models.Product.description.like(like))
-        )
+        ids = search_index.matching_ids(db, q)
+        if ids is not None:
+            query = query.filter(models.Product.id.in_(ids))
+        else:
+            like = f"%{q}%"
+            query = query.filter(
+                or_(models.Product.name.like(like), models.Product.description.like(like))
+            )
 
     # 카테고리: 라벨/키 둘 다 허용
     if category:
@@ -150,12 +169,54 @@ def list_products(
     if region:
         query = query.filter(models.Product.region == region)
 
+    # 기간 내 대여 가능: 겹치는 활성 대여가 없는 상품만 (NOT EXISTS 1회, ix_rentals_product_period 사용)
+    if available_from or available_to:
+        if not (available_from and available_to):
+            raise HTTPException(status_code=400, detail="available_from and available_to must be given together")
+        if available_to <= available_from:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+        R = models.Rental
+        query = query.filter(
+            ~exists().where(
+                R.product_id == models.Product.id,
+                R.start_date < available_to,
+                R.end_date > available_from,
+                R.status.notin_(availability.INACTIVE_STATUSES),
+            )
+        )
+
     # is_active 컬럼이 있는 경우에만 적용
     if not include_inactive and hasattr(models.Product, "is_active"):
         query = query.filter(
             (models.Product.is_active == True) | (models.Product.is_active.is_(None))  # noqa: E712
         )
 
+    return query
+
+
+# -------------------- 목록 --------------------
+@router.get("", response_model=List[schemas.ProductOut])
+def list_products(
+    db: Session = Depends(get_db),
+    q: Optional[str] = Query(None, description="이름/설명 검색"),
+    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
+    region: Optional[str] = Query(None),
+    # 페이지네이션: page/size 우선 적용 (프론트 로그와 호환)
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=200),
+    # (구버전 호환: skip/limit가 오면 무시)
+    skip: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    include_inactive: bool = Query(False, description="비활성 상품 포함 여부(필드가 있으면)"),
+    sort: Optional[str] = Query(None, description="정렬 키(popular 등). 현재는 무시되고 별도 /products/popular 사용 권장"),
+    available_from: Optional[date] = Query(None, description="이 기간에 대여 가능한 상품만 (시작일)"),
+    available_to: Optional[date] = Query(None, description="이 기간에 대여 가능한 상품만 (종료일, 미포함)"),
+):
+    query = _filtered_query(
+        db, q=q, category=category, region=region, include_inactive=include_inactive,
+        available_from=available_from, available_to=available_to,
+    )
+
     # 페이지네이션 계산(page/size 우선)
     if page is not None and size is not None:
         _skip = (page - 1) * size
@@ -168,6 +229,85 @@ def list_products(
     return [_normalize_product_row(r) for r in rows]
 
 
+# -------------------- 목록 (커서 페이지) --------------------
+@router.get("/page")
+@router.get("/page/")
+def list_products_paged(
+    db: Session = Depends(get_db),
+    q: Optional[str] = Query(None, description="이름/설명 검색"),
+    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
+    region: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    include_inactive: bool = Query(False),
+    available_from: Optional[date] = Query(None, description="이 기간에 대여 가능한 상품만 (시작일)"),
+    available_to: Optional[date] = Query(None, description="이 기간에 대여 가능한 상품만 (종료일, 미포함)"),
+):
+    """
+    최신순 keyset 페이지네이션: (created_at DESC, id DESC)
+    - OFFSET 없이 마지막 (created_at, id) 이후만 조회 → 몇 번째 페이지든 비용 동일
+    - 새 상품이 추가돼도 다음 페이지가 밀리지 않음
+    - category/region 필터는 ix_products_*_created 인덱스를 그대로 탐색
+    """
+    query = _filtered_query(
+        db, q=q, category=category, region=region, include_inactive=include_inactive,
+        available_from=available_from, available_to=available_to,
+    )
+
+    cur = decode_cursor(cursor) or {}
+    last_id = cursor_int(cur, "last_id")
+    last_dt = cursor_datetime(cur, "last_created_at")
+    if last_id is not None and last_dt is not None:
+        query = query.filter(
+            or_(
+                models.Product.created_at < last_dt,
+                and_(models.Product.created_at == last_dt, models.Product.id < last_id),
+            )
+        )
+
+    rows = (
+        query.order_by(models.Product.created_at.desc(), models.Product.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = (
+        encode_cursor({"last_created_at": items[-1].created_at.isoformat(), "last_id": items[-1].id})
+        if has_more and items
+        else None
+    )
+
+    return {
+        "items": [schemas.ProductOut.model_validate(_normalize_product_row(r)).model_dump() for r in items],
+        "next_cursor": next_cursor,
+    }
+
+
+# -------------------- 검색 (클라 호환 경로) --------------------
+@router.get("/search", response_model=List[schemas.ProductOut])
+@router.get("/search/", response_model=List[schemas.ProductOut])
+def search_products(
+    db: Session = Depends(get_db),
+    q: Optional[str] = Query(None, description="이름/설명 검색"),
+    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
+    region: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=200),
+    sort: Optional[str] = Query(None),
+    available_from: Optional[date] = Query(None),
+    available_to: Optional[date] = Query(None),
+):
+    """ApiService.searchProducts 폴백 경로. 동작은 GET /products 와 동일."""
+    return list_products(
+        db=db, q=q, category=category, region=region,
+        page=page, size=size, skip=None, limit=None,
+        include_inactive=False, sort=sort,
+        available_from=available_from, available_to=available_to,
+    )
+
+
 # -------------------- 단건 --------------------
 @router.get("/{product_id:int}", response_model=schemas.ProductOut)
 def get_product(product_id: int, db: Session = Depends(get_db)):
@@ -219,6 +359,10 @@ def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)
         owner_id=owner_id,
     )
     db.add(new)
+    db.flush()
+    blob_store.acquire_url(db, image_url)  # 이미 올라간 blob URL 을 쓰는 경우 참조 +1
+    search_index.upsert_product(db, new)
+    product_stats.on_product_created(db, new.id)
     db.commit()
     db.refresh(new)
     return _normalize_product_row(new)
@@ -244,12 +388,19 @@ def update_product(
         dp = data.pop("daily_price")
         data["price_per_day"] = int(dp) if dp is not None else None
 
+    # 이미지 교체: 이전 blob 참조 -1, 새 blob 참조 +1 (blob 이 아닌 URL 은 무시)
+    if "image_url" in data and data["image_url"] != p.image_url:
+        blob_store.release_urls(db, [p.image_url])
+        blob_store.acquire_url(db, data["image_url"])
+
     # 모델에 존재하는 필드만 세팅
     for k, v in list(data.items()):
         if hasattr(models.Product, k):
             setattr(p, k, v)
 
     db.add(p)
+    if "name" in data or "description" in data:
+        search_index.upsert_product(db, p)
     db.commit()
     db.refresh(p)
     return _normalize_product_row(p)
@@ -261,6 +412,8 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
     p = db.get(models.Product, product_id)
     if not p:
         raise HTTPException(status_code=404, detail="Product not found")
+    # 상품 이미지 + (대여 cascade 로 같이 지워지는) 대여 사진의 blob 참조는 flush 때 blob_store 가 해제
     db.delete(p)
+    search_index.remove_product(db, product_id)
     db.commit()
     return
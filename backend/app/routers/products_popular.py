@@ -1,12 +1,14 @@
 # FILE: app/routers/products_popular.py
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from sqlalchemy import func, select, literal
+from sqlalchemy import func, select, literal, or_
 
 from app.database import get_db
 from app import models
+from app.services import trending
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -28,6 +30,22 @@ class PopularProductOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TrendingProductOut(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    region: Optional[str] = None
+    daily_price: float
+    image_url: Optional[str] = None
+
+    trend_score: float           # 현재 시점 감쇠 점수
+    rentals_window: int = 0      # 최근 window_days(또는 window_hours) 대여 수
+    reviews_window: int = 0      # 최근 window_days(또는 window_hours) 리뷰 수
+    last_event_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
 def _coalesce(expr, default):
     return func.coalesce(expr, default)
 
@@ -76,6 +94,22 @@ def _image_column():
     return literal(None)
 
 
+def _filter_category(stmt, category: Optional[str]):
+    """카테고리 필터 (category, category_key 어느 쪽이든 있으면 적용)"""
+    if not category:
+        return stmt
+    cat = getattr(models.Product, "category", None)
+    cat_key = getattr(models.Product, "category_key", None)
+    conds = []
+    if cat is not None:
+        conds.append(cat == category)
+    if cat_key is not None:
+        conds.append(cat_key == category)
+    if conds:
+        stmt = stmt.where(or_(*conds))
+    return stmt
+
+
 @router.get("/popular", response_model=List[PopularProductOut], summary="인기 상품 목록")
 def get_popular_products(
     db: Session = Depends(get_db),
@@ -84,32 +118,10 @@ def get_popular_products(
     min_reviews: int = Query(0, ge=0, description="최소 리뷰 수 필터"),
 ):
     """
-    인기 점수(popularity) 산식:
-      - 평점 기여: (avg_rating / 5.0) * 0.7
-      - 리뷰수 기여: ln(1 + review_count) * 0.2
-      - 대여수 기여: ln(1 + rental_count) * 0.3
+    인기 점수는 product_stats 에 미리 계산돼 있음 (services.product_stats.popularity_score).
+    ix_product_stats_popularity 순으로 상위 limit 개만 읽고, 집계/정렬을 매 요청마다 하지 않음.
     """
-
-    # 리뷰 집계
-    reviews_subq = (
-        select(
-            models.Review.product_id.label("pid"),
-            func.count(models.Review.id).label("review_count"),
-            func.avg(models.Review.rating).label("avg_rating"),
-        )
-        .group_by(models.Review.product_id)
-        .subquery()
-    )
-
-    # 대여 집계
-    rentals_subq = (
-        select(
-            models.Rental.product_id.label("pid"),
-            func.count(models.Rental.id).label("rental_count"),
-        )
-        .group_by(models.Rental.product_id)
-        .subquery()
-    )
+    S = models.ProductStats
 
     name_col = _name_column()
     price_col = _price_column()
@@ -125,42 +137,24 @@ def get_popular_products(
             _coalesce(region_col, literal("전국")).label("region"),
             price_col.label("daily_price"),
             image_col.label("image_url"),
-            _coalesce(reviews_subq.c.avg_rating, literal(None)).label("avg_rating"),
-            _coalesce(reviews_subq.c.review_count, literal(0)).label("review_count"),
-            _coalesce(rentals_subq.c.rental_count, literal(0)).label("rental_count"),
+            models.Product.avg_rating,
+            models.Product.review_count,
+            S.rental_count,
+            S.popularity,
         )
-        .select_from(models.Product)
-        .join(reviews_subq, reviews_subq.c.pid == models.Product.id, isouter=True)
-        .join(rentals_subq, rentals_subq.c.pid == models.Product.id, isouter=True)
+        .select_from(S)
+        .join(models.Product, models.Product.id == S.product_id)
     )
 
-    # 카테고리 필터 (category, category_key 어느 쪽이든 있으면 적용)
-    if category:
-        cat = getattr(models.Product, "category", None)
-        cat_key = getattr(models.Product, "category_key", None)
-        conds = []
-        if cat is not None:
-            conds.append(cat == category)
-        if cat_key is not None:
-            conds.append(cat_key == category)
-        if conds:
-            stmt = stmt.where(func.or_(*conds))
+    stmt = _filter_category(stmt, category)
 
     if min_reviews > 0:
-        stmt = stmt.where(_coalesce(reviews_subq.c.review_count, literal(0)) >= min_reviews)
+        stmt = stmt.where(models.Product.review_count >= min_reviews)
 
+    stmt = stmt.order_by(S.popularity.desc(), S.product_id.desc()).limit(limit)
     rows = db.execute(stmt).all()
 
-    # popularity 계산
-    import math
-
-    def score(avg: Optional[float], rcnt: int, rencnt: int) -> float:
-        s_avg = ((avg or 0.0) / 5.0) * 0.7
-        s_rev = math.log1p(max(rcnt, 0)) * 0.2
-        s_ren = math.log1p(max(rencnt, 0)) * 0.3
-        return float(s_avg + s_rev + s_ren)
-
-    items = [
+    return [
         PopularProductOut(
             id=r.id,
             name=r.name,
@@ -168,13 +162,70 @@ def get_popular_products(
             region=r.region,
             daily_price=float(r.daily_price or 0),
             image_url=r.image_url,
-            rating_avg=(float(r.avg_rating) if r.avg_rating is not None else None),
+            rating_avg=(float(r.avg_rating) if r.review_count else None),
             rating_count=int(r.review_count or 0),
             rental_count=int(r.rental_count or 0),
-            popularity=score(r.avg_rating, int(r.review_count or 0), int(r.rental_count or 0)),
+            popularity=float(r.popularity or 0.0),
         )
         for r in rows
     ]
 
-    items.sort(key=lambda x: x.popularity, reverse=True)
-    return items[:limit]
+
+@router.get("/trending", response_model=List[TrendingProductOut], summary="트렌딩 상품 목록")
+def get_trending_products(
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
+    window_days: int = Query(7, ge=1, le=30, description="최근 활동 수 집계 기간(일)"),
+    window_hours: Optional[int] = Query(
+        None, ge=1, le=trending.HOURLY_RETENTION_HOURS, description="지정 시 시간 단위 집계 기간(window_days 대신)"
+    ),
+):
+    """
+    최근 활동 위주 인기 순위 (대여 1.0, 리뷰 0.5, 반감기 72시간 지수 감쇠).
+    점수는 이벤트 발생 시 product_trends 에 누적돼 있고 ix_product_trends_score 로 상위 K개만 읽음.
+    최근 N일 카운트는 일 단위 버킷(product_activity_daily)에서 상위 K개에 대해서만 합산.
+    window_hours 를 주면 시간 단위 버킷(product_activity_hourly, 최근 7일 보관)에서 합산.
+    취소된 대여는 점수/카운트에서 빠짐.
+    """
+    T = models.ProductTrend
+
+    stmt = (
+        select(
+            models.Product.id,
+            _name_column().label("name"),
+            _pcol("category").label("category"),
+            _coalesce(_pcol("region", "전국"), literal("전국")).label("region"),
+            _price_column().label("daily_price"),
+            _image_column().label("image_url"),
+            T.score_log,
+            T.last_event_at,
+        )
+        .select_from(T)
+        .join(models.Product, models.Product.id == T.product_id)
+    )
+    stmt = _filter_category(stmt, category)
+    stmt = stmt.order_by(T.score_log.desc(), T.product_id.desc()).limit(limit)
+    rows = db.execute(stmt).all()
+
+    now = datetime.utcnow()
+    if window_hours:
+        counts = trending.window_counts_hourly(db, [r.id for r in rows], window_hours, now=now)
+    else:
+        counts = trending.window_counts(db, [r.id for r in rows], window_days, today=now.date())
+
+    return [
+        TrendingProductOut(
+            id=r.id,
+            name=r.name,
+            category=r.category,
+            region=r.region,
+            daily_price=float(r.daily_price or 0),
+            image_url=r.image_url,
+            trend_score=trending.current_score(r.score_log, now),
+            rentals_window=counts.get(r.id, (0, 0))[0],
+            reviews_window=counts.get(r.id, (0, 0))[1],
+            last_event_at=r.last_event_at,
+        )
+        for r in rows
+    ]
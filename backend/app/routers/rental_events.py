@@ -0,0 +1,164 @@
+# FILE: app/routers/rental_events.py
+"""
+대여 상태 변경 이벤트(아웃박스) 소비 API
+
+- GET  /rentals/events?after=<seq>       : seq 이후 이벤트 (관리자, 전체)
+- GET  /rentals/events?consumer=<name>   : after 생략 시 저장된 소비자 위치부터
+- POST /rentals/events/ack               : 소비자 위치 저장 (처리 완료한 마지막 seq)
+- GET  /rentals/events/me?after=<seq>    : 내 대여의 이벤트만 (앱 증분 동기화용)
+- GET  /rentals/events/stream            : 내 대여 상태 변경 SSE (폴링 대체)
+  · 각 이벤트의 id = seq. 재연결 시 Last-Event-ID 이후분을 아웃박스에서 먼저 보내고 실시간으로 이어감
+
+/rentals/{rental_id} 보다 먼저 등록해야 함 (main.py)
+"""
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..database import SessionLocal, get_db
+from ..deps import Principal, get_current_user, oauth2_scheme
+from ..services import live_events, outbox
+from ._guards import require_admin
+
+HEARTBEAT_SECONDS = 15.0   # 프록시 유휴 타임아웃 방지용 주석 라인
+RESYNC_SECONDS = 60.0      # 다른 워커에서 난 변경을 아웃박스에서 보충하는 주기
+
+router = APIRouter(prefix="/rentals/events", tags=["rentals"])
+
+
+def _page(events, after: int, limit: int) -> schemas.RentalEventPage:
+    return schemas.RentalEventPage(
+        events=[schemas.RentalEventOut.model_validate(e) for e in events],
+        next_after=events[-1].seq if events else after,
+        has_more=len(events) >= limit,
+    )
+
+
+@router.get("", response_model=schemas.RentalEventPage)
+@router.get("/", response_model=schemas.RentalEventPage)
+def list_events(
+    after: Optional[int] = Query(None, ge=0),
+    consumer: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(100, ge=1, le=outbox.MAX_READ),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    require_admin(user, db)
+    if after is None:
+        after = outbox.get_offset(db, consumer) if consumer else 0
+    return _page(outbox.read(db, after=after, limit=limit), after, limit)
+
+
+@router.post("/ack")
+def ack_events(
+    payload: schemas.OutboxAckIn,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    require_admin(user, db)
+    if payload.seq < 0 or payload.seq > outbox.head(db):
+        raise HTTPException(status_code=400, detail="Invalid seq")
+    last = outbox.ack(db, payload.consumer, payload.seq)
+    db.commit()
+    return {"consumer": payload.consumer, "last_seq": last}
+
+
+@router.get("/me", response_model=schemas.RentalEventPage)
+def my_events(
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=outbox.MAX_READ),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    return _page(outbox.read(db, after=after, limit=limit, user_id=user.id), after, limit)
+
+
+# ---------- SSE ----------
+def _auth_user_id(token: str) -> int:
+    # 스트림이 열려 있는 동안 DB 커넥션을 잡고 있지 않도록 의존성 대신 직접 인증 (캐시 미스일 때만 짧게 조회)
+    return get_current_user(token).id
+
+
+def _replay(user_id: int, after: int) -> List[dict]:
+    out: List[dict] = []
+    with SessionLocal() as db:
+        while True:
+            events = outbox.read(db, after=after, limit=outbox.MAX_READ, user_id=user_id)
+            out.extend(outbox.to_dict(e) for e in events)
+            if len(events) < outbox.MAX_READ:
+                return out
+            after = events[-1].seq
+
+
+def _head() -> int:
+    with SessionLocal() as db:
+        return outbox.head(db)
+
+
+def _sse(ev: dict) -> str:
+    return f"id: {ev['seq']}\nevent: rental_status\ndata: {json.dumps(ev, ensure_ascii=False)}\n\n"
+
+
+async def _stream(request: Request, user_id: int, last_seq: int):
+    sub = live_events.subscribe(user_id)  # 재생 전에 구독해야 사이에 난 이벤트를 놓치지 않음
+    loop = asyncio.get_running_loop()
+    try:
+        yield "retry: 3000\n\n"
+        backlog = await asyncio.to_thread(_replay, user_id, last_seq)
+        next_resync = loop.time() + RESYNC_SECONDS
+        while True:
+            for ev in backlog:
+                if ev["seq"] > last_seq:
+                    last_seq = ev["seq"]
+                    yield _sse(ev)
+            backlog = []
+            if await request.is_disconnected():
+                return
+            if sub.overflow or loop.time() >= next_resync:
+                # 느린 클라이언트(큐 넘침) 또는 주기 보충: 큐를 비우고 아웃박스에서 다시 읽음
+                sub.overflow = False
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                backlog = await asyncio.to_thread(_replay, user_id, last_seq)
+                next_resync = loop.time() + RESYNC_SECONDS
+                continue
+            try:
+                ev = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            backlog = [ev]
+    finally:
+        live_events.unsubscribe(sub)
+
+
+@router.get("/stream")
+async def stream_my_events(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    after: Optional[int] = Query(None, ge=0, description="이 seq 이후부터 (Last-Event-ID 가 우선)"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    내 대여 상태 변경을 Server-Sent Events 로 전달.
+    after/Last-Event-ID 를 모두 생략하면 현재 시점 이후 변경만 보냄.
+    """
+    user_id = await asyncio.to_thread(_auth_user_id, token)
+
+    if last_event_id and last_event_id.strip().isdigit():
+        start = int(last_event_id)
+    elif after is not None:
+        start = after
+    else:
+        start = await asyncio.to_thread(_head)
+
+    return StreamingResponse(
+        _stream(request, user_id, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
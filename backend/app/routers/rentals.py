@@ -1,15 +1,17 @@
 # FILE: app/routers/rentals.py
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, select, update
+from collections import Counter
 from datetime import datetime, date, timezone, timedelta
 from typing import List, Optional, Dict, Any, Union
-import base64
-import json
 
 from .. import models, schemas
 from ..database import get_db
-from ..deps import get_current_user
+from ..deps import Principal, get_current_user
+from ._guards import is_admin_now, require_admin
+from ..services import availability, booking, outbox, product_stats, trending
+from ._cursor import encode_cursor as _encode_cursor_payload, decode_cursor as _decode_cursor_payload, cursor_int
 
 router = APIRouter(prefix="/rentals", tags=["rentals"])
 
@@ -46,20 +48,14 @@ def _status(name: str):
 
 _EXPIRED = _status("EXPIRED")
 _CLOSED = models.RentalStatus.CLOSED
-_INACTIVE_SET = tuple([_CLOSED] + ([_EXPIRED] if _EXPIRED else []))
-
-
-def _encode_cursor_payload(payload: Dict[str, Any]) -> str:
-    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
-
-
-def _decode_cursor_payload(s: Optional[str]) -> Optional[Dict[str, Any]]:
-    if not s:
-        return None
-    try:
-        return json.loads(base64.urlsafe_b64decode(s.encode()).decode())
-    except Exception:
-        return None
+# 취소는 반납 완료(CLOSED)와 구분: 인기 집계의 대여수(rental_count)에서 빠짐
+_CANCELED = _status("CANCELED") or _CLOSED
+_INACTIVE_SET = tuple(dict.fromkeys([_CLOSED, _CANCELED] + ([_EXPIRED] if _EXPIRED else [])))
+# 소유자 대시보드 total_revenue 에 들어가는 상태 (확정된 대여만).
+# PENDING/CANCELED 는 매출 아님, EXPIRED 는 미확정 PENDING 의 만료와 구분이 안 되므로 제외
+REVENUE_STATUSES = frozenset(
+    s.value for s in (models.RentalStatus.ACTIVE, _status("RETURN_REQUESTED"), _CLOSED) if s is not None
+)
 
 
 def _to_local(dt: datetime) -> datetime:
@@ -76,17 +72,34 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def _set_status(db: Session, r: models.Rental, new_status: models.RentalStatus) -> None:
+    """모든 상태 전이는 여기로: 파생 데이터(상품 집계 등)를 같은 트랜잭션에서 갱신"""
+    old_status = r.status
+    r.status = new_status
+    db.add(r)
+    product_stats.on_rental_status_changed(db, r.product_id, old_status, new_status)
+    trending.on_rental_status_changed(db, r.product_id, r.created_at, old_status, new_status)
+    booking.on_status_changed(db, r, old_status, new_status)
+    availability.mark_dirty(db, r.product_id)
+    if old_status != new_status:
+        outbox.record(db, r, old_status, new_status)
+
+
 # ---------- create / availability ----------
 @router.post("", response_model=schemas.RentalOut, status_code=201)
 @router.post("/", response_model=schemas.RentalOut, status_code=201)
 def create_rental(
     payload: schemas.RentalCreate,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """
     End date is treated as exclusive. Overlap condition:
     (exist.start < new.end) AND (exist.end > new.start)
+
+    Checked against the database (not the per-process interval cache, which is
+    only for read endpoints); the per-day slot insert (UNIQUE(product_id, day))
+    in the same transaction settles concurrent requests.
     """
     product = db.get(models.Product, payload.product_id)
     if not product:
@@ -108,18 +121,8 @@ def create_rental(
     if end <= start:
         raise HTTPException(status_code=400, detail="Invalid date range")
 
-    # Overlap check
-    overlap = (
-        db.query(models.Rental)
-        .filter(
-            models.Rental.product_id == payload.product_id,
-            models.Rental.status.notin_(_INACTIVE_SET),
-            models.Rental.start_date < end,
-            models.Rental.end_date > start,
-        )
-        .first()
-    )
-    if overlap:
+    # Overlap check (DB, indexed by product/period)
+    if availability.has_overlap_db(db, product.id, start, end):
         raise HTTPException(status_code=409, detail="This product is already booked for the selected dates")
 
     days = _days_between(start, end)
@@ -134,6 +137,16 @@ def create_rental(
         status=models.RentalStatus.PENDING,
     )
     db.add(rental)
+    # 날짜 슬롯 선점: UNIQUE(product_id, day) 위반이면 동시 예약에 밀린 것 → 즉시 409
+    try:
+        booking.reserve(db, rental)
+    except booking.SlotConflict:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This product is already booked for the selected dates")
+    product_stats.on_rental_created(db, product.id)
+    availability.mark_dirty(db, product.id)
+    trending.record_rental(db, product.id, rental.created_at)
+    outbox.record(db, rental, None, rental.status)
     db.commit()
     db.refresh(rental)
     return rental
@@ -151,17 +164,7 @@ def check_availability(
     if end <= start:
         raise HTTPException(status_code=400, detail="Invalid date range")
 
-    exists = (
-        db.query(models.Rental)
-        .filter(
-            models.Rental.product_id == product_id,
-            models.Rental.status.notin_(_INACTIVE_SET),
-            models.Rental.start_date < end,
-            models.Rental.end_date > start,
-        )
-        .first()
-    )
-    return {"available": exists is None}
+    return {"available": availability.is_available(db, product_id, start, end)}
 
 
 # ---------- blocked dates ----------
@@ -170,6 +173,9 @@ def check_availability(
 def get_blocked_dates(
     product_id: int,
     expand: bool = Query(False, description="If true, returns list of 'YYYY-MM-DD' (end exclusive)"),
+    encoding: Optional[str] = Query(None, description="'bitmap' → compact calendar {base, days, bitmap}"),
+    base: Optional[date] = Query(None, description="bitmap start date (default: first blocked day)"),
+    days: Optional[int] = Query(None, ge=1, le=3660, description="bitmap length in days"),
     db: Session = Depends(get_db),
 ):
     """
@@ -177,93 +183,130 @@ def get_blocked_dates(
 
     - expand=False (default): [{"start": "...", "end": "..."}]
     - expand=True : ["YYYY-MM-DD", ...] (unique, sorted)
+    - encoding=bitmap : {"base": "YYYY-MM-DD", "days": N, "bitmap": "<urlsafe base64>"}
+      bit i (LSB-first per byte) set => base + i days is blocked
     """
-    rows = (
-        db.query(models.Rental)
-        .filter(
-            models.Rental.product_id == product_id,
-            models.Rental.status.notin_(_INACTIVE_SET),
-        )
-        .all()
-    )
+    ivs = availability.intervals(db, product_id)
+
+    if encoding == "bitmap":
+        return availability.bitmap(ivs, base=base, days=days)
 
     if not expand:
-        return [
-            {
-                "start": (r.start_date.isoformat() if isinstance(r.start_date, (date, datetime)) else str(r.start_date)),
-                "end": (r.end_date.isoformat() if isinstance(r.end_date, (date, datetime)) else str(r.end_date)),
-            }
-            for r in rows
+        return [{"start": s.isoformat(), "end": e.isoformat()} for s, e in ivs]
+
+    return availability.expand_days(ivs)
+
+
+# ---------- read-side expiry ----------
+# 실제 EXPIRED 전환은 services.expiry 스위퍼가 주기적으로 일괄 처리.
+# 조회 API는 쓰기 없이, 종료일이 지난 활성 대여를 EXPIRED 로 "보이게"만 함.
+def _is_overdue(r: models.Rental, today_local: date) -> bool:
+    return r.status not in _INACTIVE_SET and _as_date(r.end_date) < today_local
+
+
+def _rental_out(r: models.Rental, today_local: date, expand: frozenset = frozenset()) -> schemas.RentalExpandedOut:
+    # product/photos 는 expand 요청 시에만 채움 (RentalOut 필드만 ORM 에서 읽어 지연 로딩 방지)
+    out = schemas.RentalExpandedOut(**schemas.RentalOut.model_validate(r).model_dump())
+    update: Dict[str, Any] = {}
+    if _is_overdue(r, today_local):
+        update["status"] = _EXPIRED or _CLOSED
+    if "product" in expand and r.product is not None:
+        p = r.product
+        update["product"] = schemas.RentalProductBrief(
+            id=p.id,
+            name=p.name,
+            title=p.name,
+            image_url=p.image_url,
+            category=p.category,
+            region=p.region,
+            price_per_day=p.price_per_day,
+            daily_price=float(p.price_per_day) if p.price_per_day is not None else None,
+        )
+    if "photos" in expand:
+        update["photos"] = [
+            schemas.RentalPhotoBrief(
+                id=ph.id,
+                phase=getattr(ph.kind, "value", ph.kind) or "",
+                url=ph.url or ph.file_path,
+                created_at=ph.created_at,
+            )
+            for ph in sorted(r.photos, key=lambda ph: ph.id, reverse=True)
         ]
+    return out.model_copy(update=update) if update else out
 
-    out_dates = set()
-    for r in rows:
-        s = _as_date(r.start_date)
-        e = _as_date(r.end_date)
-        cur = s
-        while cur < e:  # exclusive
-            out_dates.add(cur.isoformat())
-            cur = cur + timedelta(days=1)
 
-    return sorted(out_dates)
+_EXPANDABLE = {"product", "photos"}
 
 
-# ---------- expire update ----------
-def _expire_overdue_for_user(db: Session, user_id: int) -> None:
-    """Mark ended ACTIVE/PENDING as EXPIRED (or CLOSED) by KST today."""
-    today_local = datetime.now(KST).date()
-    rows_to_expire = (
-        db.query(models.Rental)
-        .filter(
-            models.Rental.user_id == user_id,
-            models.Rental.status.notin_(_INACTIVE_SET),
-        )
-        .all()
-    )
-    changed = False
-    for r in rows_to_expire:
-        if _to_local(datetime.combine(r.end_date, datetime.min.time())).date() < today_local:
-            r.status = _EXPIRED or _CLOSED
-            db.add(r)
-            changed = True
-    if changed:
-        db.commit()
+def _parse_expand(expand: Optional[str]) -> frozenset:
+    """expand=product,photos → {"product", "photos"} (모르는 값은 무시)"""
+    if not expand:
+        return frozenset()
+    return frozenset(x.strip() for x in expand.split(",") if x.strip() in _EXPANDABLE)
+
+
+def _with_expand(q, expand: frozenset):
+    """관련 상품/사진을 IN 쿼리 한 번씩으로 미리 로드 (행마다 지연 로딩 방지)"""
+    if "product" in expand:
+        q = q.options(selectinload(models.Rental.product))
+    if "photos" in expand:
+        q = q.options(selectinload(models.Rental.photos))
+    return q
+
+
+def _active_conds_overdue(today_local: date):
+    """아직 활성 상태지만 종료일이 지난(스위퍼 대기 중) 대여 조건"""
+    return [
+        models.Rental.status.notin_(_INACTIVE_SET),
+        models.Rental.end_date < today_local,
+    ]
+
+
+def _active_conds(today_local: date):
+    """활성(미만료) 대여 조건: 상태 + 종료일 (스위퍼가 아직 안 돌았어도 만료분 제외)"""
+    return [
+        models.Rental.status.notin_(_INACTIVE_SET),
+        models.Rental.end_date >= today_local,
+    ]
 
 
 # ---------- list / get ----------
-@router.get("/me", response_model=List[schemas.RentalOut])
-@router.get("/me/", response_model=List[schemas.RentalOut])
+@router.get("/me", response_model=List[schemas.RentalExpandedOut])
+@router.get("/me/", response_model=List[schemas.RentalExpandedOut])
 def list_my_rentals(
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     skip: int = 0,
     limit: int = 50,
     include_inactive: Optional[bool] = None,
     include_closed: Optional[bool] = Query(None, description="Deprecated. Use include_inactive"),
+    expand: Optional[str] = Query(None, description="Inline related data: product,photos"),
 ):
     if include_closed is not None:
         include_inactive = include_closed
     include_inactive = bool(include_inactive) if include_inactive is not None else False
 
-    _expire_overdue_for_user(db, user.id)
+    today_local = datetime.now(KST).date()
+    expand_set = _parse_expand(expand)
 
-    q = db.query(models.Rental).filter(models.Rental.user_id == user.id)
+    q = _with_expand(db.query(models.Rental), expand_set).filter(models.Rental.user_id == user.id)
     if not include_inactive:
-        q = q.filter(models.Rental.status.notin_(_INACTIVE_SET))
+        q = q.filter(*_active_conds(today_local))
 
     rows = q.order_by(models.Rental.id.desc()).offset(skip).limit(limit).all()
-    return rows
+    return [_rental_out(r, today_local, expand_set) for r in rows]
 
 
-@router.get("/my", response_model=List[schemas.RentalOut])
-@router.get("/my/", response_model=List[schemas.RentalOut])
+@router.get("/my", response_model=List[schemas.RentalExpandedOut])
+@router.get("/my/", response_model=List[schemas.RentalExpandedOut])
 def list_my_rentals_alias(
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     skip: int = 0,
     limit: int = 50,
     include_inactive: Optional[bool] = None,
     include_closed: Optional[bool] = Query(None),
+    expand: Optional[str] = Query(None, description="Inline related data: product,photos"),
 ):
     return list_my_rentals(
         db=db,
@@ -272,6 +315,7 @@ def list_my_rentals_alias(
         limit=limit,
         include_inactive=include_inactive,
         include_closed=include_closed,
+        expand=expand,
     )
 
 
@@ -279,30 +323,37 @@ def list_my_rentals_alias(
 @router.get("/me/page/")
 def list_my_rentals_paged(
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     status: Optional[models.RentalStatus] = Query(None),
     include_inactive: Optional[bool] = None,
     include_closed: Optional[bool] = Query(None, description="Deprecated. Use include_inactive"),
+    expand: Optional[str] = Query(None, description="Inline related data: product,photos"),
 ):
     if include_closed is not None:
         include_inactive = include_closed
     include_inactive = bool(include_inactive) if include_inactive is not None else False
 
-    _expire_overdue_for_user(db, user.id)
+    today_local = datetime.now(KST).date()
+    expand_set = _parse_expand(expand)
 
     cur = _decode_cursor_payload(cursor) or {}
-    last_id = cur.get("last_id")
+    last_id = cursor_int(cur, "last_id")
 
     conds = [models.Rental.user_id == user.id]
-    if status:
+    if status and status == (_EXPIRED or _CLOSED):
+        # 스위퍼가 아직 처리 안 한 만료분도 포함
+        conds.append(or_(models.Rental.status == status, and_(*_active_conds_overdue(today_local))))
+    elif status:
         conds.append(models.Rental.status == status)
+        if status not in _INACTIVE_SET:
+            conds.append(models.Rental.end_date >= today_local)
     elif not include_inactive:
-        conds.append(models.Rental.status.notin_(_INACTIVE_SET))
+        conds.extend(_active_conds(today_local))
 
-    stmt = db.query(models.Rental).filter(and_(*conds))
-    if last_id:
+    stmt = _with_expand(db.query(models.Rental), expand_set).filter(and_(*conds))
+    if last_id is not None:
         stmt = stmt.filter(models.Rental.id < last_id)
     rows = stmt.order_by(models.Rental.id.desc()).limit(limit + 1).all()
 
@@ -311,17 +362,97 @@ def list_my_rentals_paged(
     next_cursor = _encode_cursor_payload({"last_id": items[-1].id}) if has_more and items else None
 
     return {
-        "items": [schemas.RentalOut.model_validate(r).model_dump() for r in items],
+        "items": [
+            _rental_out(r, today_local, expand_set).model_dump()
+            for r in items
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/owner")
+@router.get("/owner/")
+def list_owner_rentals(
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    status: Optional[models.RentalStatus] = Query(None),
+    owner_id: Optional[int] = Query(None, description="Admin only: view another owner's dashboard"),
+):
+    """
+    Rentals of products I own (Product.owner_id), newest first, plus per-status
+    counts and revenue (sum of total_price) across all of them.
+
+    - summary: one GROUP BY over ix_rentals_product_status_price (index-only).
+      `total_revenue` counts only REVENUE_STATUSES (confirmed rentals); PENDING and
+      CANCELED amounts stay visible per status in `by_status`.
+    - items: keyset on rental id; returned only with `summary` on the first page.
+      The plan is `SEARCH rentals USING COVERING INDEX ix_rentals_product_status_price
+      (product_id=?)` per owned product + `USE TEMP B-TREE FOR ORDER BY`: the sort sees
+      only (rowid) from the covering index and keeps the top limit+1, so rows are read
+      for the page alone. Cost is linear in the owner's rental count (~0.45 ms at 4k
+      rentals / 2k products, SQLite 3.40). No index can serve `id DESC` across an IN
+      list; if owners grow far beyond that, denormalize owner_id onto rentals with an
+      (owner_id, id) index.
+    """
+    if owner_id is not None and owner_id != user.id and not is_admin_now(user, db):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    oid = owner_id if owner_id is not None else user.id
+
+    owned = select(models.Product.id).where(models.Product.owner_id == oid)
+    today_local = datetime.now(KST).date()
+
+    cur = _decode_cursor_payload(cursor) or {}
+    last_id = cursor_int(cur, "last_id")
+
+    q = _with_expand(db.query(models.Rental), frozenset({"product"})).filter(models.Rental.product_id.in_(owned))
+    if status:
+        q = q.filter(models.Rental.status == status)
+    if last_id is not None:
+        q = q.filter(models.Rental.id < last_id)
+    rows = q.order_by(models.Rental.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = _encode_cursor_payload({"last_id": items[-1].id}) if has_more and items else None
+
+    out: Dict[str, Any] = {
+        "items": [_rental_out(r, today_local, frozenset({"product"})).model_dump() for r in items],
         "next_cursor": next_cursor,
     }
 
+    if not cursor:
+        grouped = db.execute(
+            select(
+                models.Rental.status,
+                func.count(models.Rental.id),
+                func.coalesce(func.sum(models.Rental.total_price), 0),
+            )
+            .where(models.Rental.product_id.in_(owned))
+            .group_by(models.Rental.status)
+        ).all()
+        by_status = {
+            getattr(st, "value", st): {"count": int(cnt), "revenue": int(rev or 0)}
+            for st, cnt, rev in grouped
+        }
+        out["summary"] = {
+            "owner_id": oid,
+            "by_status": by_status,
+            "total_count": sum(v["count"] for v in by_status.values()),
+            "total_revenue": sum(
+                v["revenue"] for st, v in by_status.items() if st in REVENUE_STATUSES
+            ),
+        }
+    return out
+
 
 @router.get("")
 @router.get("/")
 def list_rentals_root_compat(
     request: Request,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     skip: int = 0,
     limit: int = 50,
     include_inactive: Optional[bool] = None,
@@ -331,7 +462,7 @@ def list_rentals_root_compat(
     if user_param and user_param.lower() == "me":
         return list_my_rentals(
             db=db, user=user, skip=skip, limit=limit,
-            include_inactive=include_inactive, include_closed=include_closed
+            include_inactive=include_inactive, include_closed=include_closed, expand=None,
         )
     raise HTTPException(status_code=400, detail="Unsupported query. Use /rentals/me or /rentals/my")
 
@@ -340,50 +471,169 @@ def list_rentals_root_compat(
 def get_rental(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     r = db.get(models.Rental, rental_id)
     if not r:
         raise HTTPException(status_code=404, detail="Rental not found")
 
-    if (user.id != r.user_id) and (not getattr(user, "is_admin", False)):
+    if (user.id != r.user_id) and not is_admin_now(user, db):
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    today_local = datetime.now(KST).date()
-    if r.status not in _INACTIVE_SET and _to_local(datetime.combine(r.end_date, datetime.min.time())).date() < today_local:
-        r.status = _EXPIRED or _CLOSED
-        db.add(r)
-        db.commit()
-        db.refresh(r)
-    return r
+    return _rental_out(r, datetime.now(KST).date())
 
 
 # ---------- status actions ----------
-def _ensure_owner_or_admin(r: models.Rental, user: models.User):
-    if (user.id != r.user_id) and (not getattr(user, "is_admin", False)):
+def _ensure_owner_or_admin(r: models.Rental, user: Principal, db: Session):
+    if (user.id != r.user_id) and not is_admin_now(user, db):
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
+# 상태 전이 규칙 (단건/일괄 엔드포인트 공용). 허용되지 않으면 HTTPException(400)
+def _check_cancel(r: models.Rental, today_local: date) -> None:
+    if r.status not in (models.RentalStatus.PENDING, models.RentalStatus.ACTIVE):
+        raise HTTPException(status_code=400, detail="Only PENDING or ACTIVE rentals can be canceled")
+    if _to_local(datetime.combine(r.start_date, datetime.min.time())).date() <= today_local:
+        raise HTTPException(status_code=400, detail="Cannot cancel on/after start date")
+
+
+def _check_request_return(r: models.Rental, today_local: date) -> None:
+    if r.status != models.RentalStatus.ACTIVE:
+        raise HTTPException(status_code=400, detail="Only ACTIVE rentals can request return")
+    if _to_local(datetime.combine(r.start_date, datetime.min.time())).date() > today_local:
+        raise HTTPException(status_code=400, detail="Cannot request return before rental period starts")
+
+
+def _check_confirm_return(r: models.Rental, today_local: date) -> None:
+    if r.status != models.RentalStatus.RETURN_REQUESTED:
+        raise HTTPException(status_code=400, detail="Only RETURN_REQUESTED rentals can be closed")
+
+
+# action -> (target status, rule)
+_TRANSITIONS = {
+    "cancel": (_CANCELED, _check_cancel),
+    "request_return": (models.RentalStatus.RETURN_REQUESTED, _check_request_return),
+    "confirm_return": (_CLOSED, _check_confirm_return),
+}
+
+
+def _apply_bulk_status(db: Session, rentals: List[models.Rental], new_status: models.RentalStatus) -> List[int]:
+    """
+    new_status 로 가는 대여들을 검증 당시 상태(source)별 UPDATE ... RETURNING id 로 전이.
+    각 행은 자기가 검증된 바로 그 상태일 때만 바뀌고, 실제로 바뀐 행만 파생 데이터
+    (집계/트렌딩/예약 슬롯/가용성 캐시/아웃박스)에 반영 → 그 사이 다른 요청이 옮긴 행은 중복 반영 없음.
+    실제로 바뀐 id 목록 반환.
+    """
+    if not rentals:
+        return []
+    R = models.Rental
+    now = datetime.utcnow()
+    by_source: Dict[models.RentalStatus, List[models.Rental]] = {}
+    for r in rentals:
+        by_source.setdefault(r.status, []).append(r)
+
+    changed: List[models.Rental] = []
+    for source, group in by_source.items():
+        if source == new_status:
+            continue
+        updated = set(db.scalars(
+            update(R)
+            .where(R.id.in_([r.id for r in group]), R.status == source)
+            .values(status=new_status, updated_at=now)
+            .returning(R.id)
+            .execution_options(synchronize_session=False)
+        ))
+        changed.extend(r for r in group if r.id in updated)
+
+    for r in changed:
+        product_stats.on_rental_status_changed(db, r.product_id, r.status, new_status)
+        trending.on_rental_status_changed(db, r.product_id, r.created_at, r.status, new_status)
+        availability.mark_dirty(db, r.product_id)
+    if new_status in _INACTIVE_SET:
+        booking.release(db, [r.id for r in changed if r.status not in _INACTIVE_SET])
+    outbox.record_many(db, [(r.id, r.product_id, r.user_id, r.status) for r in changed], new_status)
+    return [r.id for r in changed]
+
+
+@router.post("/batch/transition")
+@router.post("/batch/transition/")
+def batch_transition(
+    payload: schemas.RentalBatchTransitionIn,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    """
+    Admin: apply cancel / request_return / confirm_return to many rentals at once.
+
+    Same rules as the single endpoints, validated per item. Valid items are applied
+    with one guarded bulk UPDATE per (current status, target status) pair and a
+    single commit. A rental_id listed more than once fails on every copy.
+    Returns per-item results.
+    """
+    require_admin(user, db)
+
+    wanted = [(it.rental_id, it.action) for it in payload.items]
+    if len(wanted) > 500:
+        raise HTTPException(status_code=400, detail="Too many items (max 500)")
+
+    ids = list({rid for rid, _ in wanted})
+    rentals = {r.id: r for r in db.query(models.Rental).filter(models.Rental.id.in_(ids)).all()} if ids else {}
+    today_local = datetime.now(KST).date()
+
+    # 같은 rental_id 가 두 번 이상 오면 어느 쪽도 적용하지 않음 (어떤 action 이 이길지 모호)
+    seen = Counter(rid for rid, _ in wanted)
+    results: Dict[int, Dict[str, Any]] = {}
+    by_target: Dict[models.RentalStatus, List[models.Rental]] = {}
+    for rid, action in wanted:
+        if seen[rid] > 1:
+            results[rid] = {"rental_id": rid, "ok": False, "error": "Duplicate rental_id in batch"}
+            continue
+        r = rentals.get(rid)
+        if r is None:
+            results[rid] = {"rental_id": rid, "ok": False, "error": "Rental not found"}
+            continue
+        if action not in _TRANSITIONS:
+            results[rid] = {"rental_id": rid, "ok": False, "error": f"Unknown action: {action}"}
+            continue
+        target, check = _TRANSITIONS[action]
+        try:
+            check(r, today_local)
+        except HTTPException as e:
+            results[rid] = {"rental_id": rid, "ok": False, "error": e.detail}
+            continue
+        by_target.setdefault(target, []).append(r)
+        results[rid] = {"rental_id": rid, "ok": True, "status": getattr(target, "value", target)}
+
+    for target, group in by_target.items():
+        applied = set(_apply_bulk_status(db, group, target))
+        for r in group:
+            if r.id not in applied:
+                results[r.id] = {"rental_id": r.id, "ok": False, "error": "Rental status changed concurrently"}
+    db.commit()
+
+    out = [results[rid] for rid in dict.fromkeys(rid for rid, _ in wanted)]
+    return {
+        "results": out,
+        "applied": sum(1 for x in out if x["ok"]),
+        "failed": sum(1 for x in out if not x["ok"]),
+    }
+
+
 @router.patch("/{rental_id}/cancel", response_model=schemas.RentalOut)
 @router.patch("/{rental_id}/cancel/", response_model=schemas.RentalOut)
 def cancel_rental(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     r = db.get(models.Rental, rental_id)
     if not r:
         raise HTTPException(status_code=404, detail="Rental not found")
-    _ensure_owner_or_admin(r, user)
+    _ensure_owner_or_admin(r, user, db)
 
-    today_local = datetime.now(KST).date()
-    if r.status not in (models.RentalStatus.PENDING, models.RentalStatus.ACTIVE):
-        raise HTTPException(status_code=400, detail="Only PENDING or ACTIVE rentals can be canceled")
-    if _to_local(datetime.combine(r.start_date, datetime.min.time())).date() <= today_local:
-        raise HTTPException(status_code=400, detail="Cannot cancel on/after start date")
+    _check_cancel(r, datetime.now(KST).date())
 
-    r.status = _CLOSED
-    db.add(r)
+    _set_status(db, r, _CANCELED)
     db.commit()
     db.refresh(r)
     return r
@@ -394,7 +644,7 @@ def cancel_rental(
 def cancel_rental_post_alias(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return cancel_rental(rental_id, db, user)
 
@@ -404,21 +654,16 @@ def cancel_rental_post_alias(
 def request_return(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     r = db.get(models.Rental, rental_id)
     if not r:
         raise HTTPException(status_code=404, detail="Rental not found")
-    _ensure_owner_or_admin(r, user)
+    _ensure_owner_or_admin(r, user, db)
 
-    today_local = datetime.now(KST).date()
-    if r.status != models.RentalStatus.ACTIVE:
-        raise HTTPException(status_code=400, detail="Only ACTIVE rentals can request return")
-    if _to_local(datetime.combine(r.start_date, datetime.min.time())).date() > today_local:
-        raise HTTPException(status_code=400, detail="Cannot request return before rental period starts")
+    _check_request_return(r, datetime.now(KST).date())
 
-    r.status = models.RentalStatus.RETURN_REQUESTED
-    db.add(r)
+    _set_status(db, r, models.RentalStatus.RETURN_REQUESTED)
     db.commit()
     db.refresh(r)
     return r
@@ -429,7 +674,7 @@ def request_return(
 def request_return_post_alias(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return request_return(rental_id, db, user)
 
@@ -439,18 +684,16 @@ def request_return_post_alias(
 def confirm_return(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     r = db.get(models.Rental, rental_id)
     if not r:
         raise HTTPException(status_code=404, detail="Rental not found")
-    _ensure_owner_or_admin(r, user)
+    _ensure_owner_or_admin(r, user, db)
 
-    if r.status != models.RentalStatus.RETURN_REQUESTED:
-        raise HTTPException(status_code=400, detail="Only RETURN_REQUESTED rentals can be closed")
+    _check_confirm_return(r, datetime.now(KST).date())
 
-    r.status = _CLOSED
-    db.add(r)
+    _set_status(db, r, _CLOSED)
     db.commit()
     db.refresh(r)
     return r
@@ -461,6 +704,6 @@ def confirm_return(
 def confirm_return_post_alias(
     rental_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return confirm_return(rental_id, db, user)
@@ -1,11 +1,14 @@
 # app/routers/reviews.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from sqlalchemy import and_, or_
 
 from ..database import get_db
-from ..deps import get_current_user
+from ..deps import Principal, get_current_user
 from .. import models, schemas
+from ..services import product_stats, trending
+from ._cursor import encode_cursor, decode_cursor, cursor_datetime, cursor_int
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
@@ -13,7 +16,7 @@ router = APIRouter(prefix="/reviews", tags=["reviews"])
 def create_review(
     payload: schemas.ReviewCreate,  # 🔁 ReviewIn → ReviewCreate
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     # 1) 렌탈 소유자/상태 체크
     r = db.get(models.Rental, payload.rental_id)
@@ -47,20 +50,67 @@ def create_review(
         comment=payload.comment,
     )
     db.add(rev)
+    product_stats.on_review_created(db, r.product_id, payload.rating)
+    trending.record_review(db, r.product_id)
     db.commit()
     db.refresh(rev)
     return rev
 
 
-@router.get("/by-product/{product_id}", response_model=List[schemas.ReviewOut])
+@router.get("/by-product/{product_id}", response_model=List[schemas.ReviewOut], deprecated=True)
 def by_product(
     product_id: int,
     db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
 ):
+    """구버전 호환: 최신 limit건만 반환. 더 보려면 /by-product/{product_id}/page (커서) 사용"""
     rows = (
         db.query(models.Review)
         .filter(models.Review.product_id == product_id)
         .order_by(models.Review.id.desc())
+        .limit(limit)
         .all()
     )
     return rows
+
+
+@router.get("/by-product/{product_id}/page")
+def by_product_paged(
+    product_id: int,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    with_histogram: bool = Query(False, description="별점 분포(1~5) 포함 여부"),
+):
+    """
+    최신순 커서 페이지: (created_at DESC, id DESC), ix_reviews_product_created 탐색.
+    with_histogram=true면 product_stats 의 별점 분포도 같이 반환(리뷰를 읽지 않음).
+    """
+    R = models.Review
+    stmt = db.query(R).filter(R.product_id == product_id)
+
+    cur = decode_cursor(cursor) or {}
+    last_id = cursor_int(cur, "last_id")
+    last_dt = cursor_datetime(cur, "last_created_at")
+    if last_id is not None and last_dt is not None:
+        stmt = stmt.filter(
+            or_(R.created_at < last_dt, and_(R.created_at == last_dt, R.id < last_id))
+        )
+
+    rows = stmt.order_by(R.created_at.desc(), R.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = (
+        encode_cursor({"last_created_at": items[-1].created_at.isoformat(), "last_id": items[-1].id})
+        if has_more and items
+        else None
+    )
+
+    out = {
+        "items": [schemas.ReviewOut.model_validate(r).model_dump() for r in items],
+        "next_cursor": next_cursor,
+    }
+    if with_histogram:
+        out["histogram"] = product_stats.histogram(db, product_id)
+    return out
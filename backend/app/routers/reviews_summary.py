@@ -1,12 +1,13 @@
 # FILE: app/routers/reviews_summary.py
-from typing import Optional
-from fastapi import APIRouter, Depends
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy import select
 
 from app.database import get_db
 from app import models
+from app.services import product_stats
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
@@ -17,18 +18,69 @@ class ReviewSummaryOut(BaseModel):
 
     model_config = {"from_attributes": True}
 
+
+class ReviewSummaryBatchIn(BaseModel):
+    product_ids: List[int]
+
+
+MAX_BATCH = 300
+
+
+def _summaries(db: Session, product_ids: List[int]) -> List[ReviewSummaryOut]:
+    """IN 쿼리 1회로 여러 상품 요약. 요청 순서 유지, 없는 상품은 0건으로 채움."""
+    ids = list(dict.fromkeys(product_ids))  # 중복 제거(순서 유지)
+    if len(ids) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many product_ids (max {MAX_BATCH})")
+    found: Dict[int, tuple] = {}
+    if ids:
+        rows = db.execute(
+            select(models.Product.id, models.Product.avg_rating, models.Product.review_count)
+            .where(models.Product.id.in_(ids))
+        ).all()
+        found = {r.id: (r.avg_rating, int(r.review_count or 0)) for r in rows}
+    out = []
+    for pid in ids:
+        avg_, cnt_ = found.get(pid, (None, 0))
+        out.append(ReviewSummaryOut(
+            product_id=pid,
+            rating_avg=(float(avg_) if cnt_ else None),
+            rating_count=cnt_,
+        ))
+    return out
+
+
+@router.get("/summary", response_model=List[ReviewSummaryOut], summary="상품별 리뷰 요약(여러 개)")
+def get_review_summaries(
+    ids: str = Query(..., description="콤마 구분 상품 ID 목록 (예: 1,2,3)"),
+    db: Session = Depends(get_db),
+):
+    try:
+        product_ids = [int(x) for x in ids.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+    return _summaries(db, product_ids)
+
+
+@router.post("/summary/batch", response_model=List[ReviewSummaryOut], summary="상품별 리뷰 요약(여러 개)")
+def post_review_summaries(payload: ReviewSummaryBatchIn, db: Session = Depends(get_db)):
+    """상품 카드 그리드용: 카드마다 /reviews/summary/{id} 를 부르는 대신 한 번에 조회"""
+    return _summaries(db, payload.product_ids)
+
+
 @router.get("/summary/{product_id}", response_model=ReviewSummaryOut, summary="상품별 리뷰 요약")
 def get_review_summary(product_id: int, db: Session = Depends(get_db)):
-    stmt = (
-        select(
-            func.avg(models.Review.rating),
-            func.count(models.Review.id)
-        )
-        .where(models.Review.product_id == product_id)
-    )
-    avg_, cnt_ = db.execute(stmt).one()
-    return ReviewSummaryOut(
-        product_id=product_id,
-        rating_avg=(float(avg_) if avg_ is not None else None),
-        rating_count=int(cnt_ or 0),
-    )
+    """products.avg_rating / review_count (리뷰 작성 시 갱신되는 비정규화 컬럼)만 읽음"""
+    return _summaries(db, [product_id])[0]
+
+
+class ReviewHistogramOut(BaseModel):
+    product_id: int
+    counts: Dict[int, int]  # {1: n, 2: n, 3: n, 4: n, 5: n}
+    total: int
+
+
+@router.get("/histogram/{product_id}", response_model=ReviewHistogramOut, summary="상품별 별점 분포")
+def get_review_histogram(product_id: int, db: Session = Depends(get_db)):
+    """리뷰 작성 시 갱신되는 product_stats.rating_1~5 만 읽음"""
+    counts = product_stats.histogram(db, product_id)
+    return ReviewHistogramOut(product_id=product_id, counts=counts, total=sum(counts.values()))
@@ -0,0 +1,31 @@
+# FILE: app/routers/search.py
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app import schemas
+from app.routers.products import search_products
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/products", response_model=List[schemas.ProductOut], summary="상품 검색")
+@router.get("/products/", response_model=List[schemas.ProductOut])
+def search_products_alias(
+    db: Session = Depends(get_db),
+    q: Optional[str] = Query(None, description="이름/설명 검색"),
+    category: Optional[str] = Query(None, description="카테고리 라벨 또는 키"),
+    region: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=200),
+    sort: Optional[str] = Query(None),
+    available_from: Optional[date] = Query(None),
+    available_to: Optional[date] = Query(None),
+):
+    return search_products(
+        db=db, q=q, category=category, region=region, page=page, size=size, sort=sort,
+        available_from=available_from, available_to=available_to,
+    )
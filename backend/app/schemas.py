@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -22,6 +22,12 @@ class ORMSchema(BaseModel):
 class Token(ORMSchema):
     access_token: str
     token_type: str = "bearer"
+    expires_in: Optional[int] = None       # access 토큰 수명(초)
+    refresh_token: Optional[str] = None    # POST /auth/refresh 로 1회 사용 (회전)
+
+
+class RefreshIn(BaseModel):
+    refresh_token: str
 
 
 class TokenData(ORMSchema):
@@ -112,6 +118,9 @@ class ProductOut(ORMSchema):
 
     description: Optional[str] = None
     image_url: Optional[str] = None
+    # 파생본: {"thumb"|"card"|"full": {"w", "h", "webp", "jpeg"}} (생성 전이면 빈 dict)
+    thumbnail_url: Optional[str] = None
+    variants: Dict[str, Dict[str, Any]] = {}
 
     category: Optional[str] = None
     category_key: Optional[str] = None
@@ -124,6 +133,10 @@ class ProductOut(ORMSchema):
     deposit: Optional[int] = None
     owner_id: Optional[int] = None
 
+    # 리뷰 집계(비정규화 컬럼)
+    avg_rating: Optional[float] = None
+    review_count: int = 0
+
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -161,6 +174,61 @@ class RentalOut(RentalBase):
     updated_at: datetime
 
 
+class RentalProductBrief(ORMSchema):
+    """대여 목록에 함께 싣는 상품 요약 (expand=product)"""
+    id: int
+    name: Optional[str] = None
+    title: Optional[str] = None
+    image_url: Optional[str] = None
+    category: Optional[str] = None
+    region: Optional[str] = None
+    price_per_day: Optional[int] = None
+    daily_price: Optional[float] = None
+
+
+class RentalPhotoBrief(ORMSchema):
+    """대여 목록에 함께 싣는 사진 요약 (expand=photos)"""
+    id: int
+    phase: str
+    url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class RentalExpandedOut(RentalOut):
+    product: Optional[RentalProductBrief] = None
+    photos: Optional[List[RentalPhotoBrief]] = None
+
+
+class RentalBatchItem(ORMSchema):
+    rental_id: int
+    action: str  # cancel | request_return | confirm_return
+
+
+class RentalBatchTransitionIn(ORMSchema):
+    items: List[RentalBatchItem]
+
+
+class RentalEventOut(ORMSchema):
+    seq: int
+    rental_id: int
+    product_id: int
+    user_id: int
+    old_status: Optional[str] = None
+    new_status: str
+    created_at: datetime
+
+
+class RentalEventPage(BaseModel):
+    events: List[RentalEventOut]
+    next_after: int       # 다음 호출의 after (이벤트가 없으면 입력값 그대로)
+    has_more: bool
+
+
+class OutboxAckIn(BaseModel):
+    consumer: str
+    seq: int
+
+
 # ---------------------------------
 # Photo
 # ---------------------------------
@@ -0,0 +1,24 @@
+# FILE: app/scripts/backfill_ratings.py
+# products.avg_rating / review_count 백필·복구
+# 사용: python -m app.scripts.backfill_ratings
+from app.database import SessionLocal, engine, ensure_columns
+from app import models
+from app.services import product_stats
+
+models.Base.metadata.create_all(bind=engine)
+
+
+def run():
+    ensure_columns("products", {
+        "avg_rating": "FLOAT NOT NULL DEFAULT 0.0",
+        "review_count": "INTEGER NOT NULL DEFAULT 0",
+    })
+    with SessionLocal() as db:
+        product_stats.rebuild(db)  # 기준값(product_stats)부터 원본으로 재계산
+        n = product_stats.rebuild_ratings(db)
+        db.commit()
+        print(f"[ratings] recomputed avg_rating/review_count for {n} products.")
+
+
+if __name__ == "__main__":
+    run()
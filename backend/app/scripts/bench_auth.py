@@ -0,0 +1,94 @@
+# FILE: app/scripts/bench_auth.py
+"""
+로그인(bcrypt) 폭주 중 다른 엔드포인트 지연 측정: 로그인 N개 스레드가 계속 /auth/login 을 호출하는 동안
+GET /products/popular 를 반복 호출해서 p50/p99 를 로그인 없을 때와 비교, 로그인 응답 코드(200/503) 집계
+
+사용: python -m app.scripts.bench_auth [login_threads] [seconds]
+ - 임시 SQLite DB 에서 실행하므로 dev.db 는 건드리지 않음
+ - 대기열이 가득 차면 로그인은 기다리지 않고 503 (settings.PASSWORD_HASH_MAX_QUEUE)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_auth_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+os.chdir(_tmpdir)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.settings import BCRYPT_ROUNDS, PASSWORD_HASH_MAX_QUEUE, PASSWORD_HASH_WORKERS  # noqa: E402
+
+
+def _percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))] if xs else 0.0
+
+
+def _probe(client, seconds: float):
+    lat = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t = time.perf_counter()
+        client.get("/products/popular", params={"limit": 5})
+        lat.append(time.perf_counter() - t)
+        time.sleep(0.005)
+    return lat
+
+
+def _report(label, lat):
+    print(
+        f"{label:<16} n={len(lat):<5} p50={_percentile(lat, 0.5) * 1000:7.1f}ms "
+        f"p99={_percentile(lat, 0.99) * 1000:7.1f}ms max={max(lat or [0]) * 1000:7.1f}ms"
+    )
+
+
+def run(login_threads: int = 32, seconds: float = 5.0):
+    with TestClient(app) as client:
+        email = f"bench_{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/auth/register", json={"email": email, "password": "bench-pass"})
+        client.post("/products", json={"name": "bench item", "price_per_day": 1000})
+
+        _report("idle", _probe(client, seconds))
+
+        stop = threading.Event()
+        codes = {}
+        login_lat = []
+        lock = threading.Lock()
+
+        def login():
+            while not stop.is_set():
+                t = time.perf_counter()
+                r = client.post("/auth/login", json={"email": email, "password": "bench-pass"})
+                dt = time.perf_counter() - t
+                with lock:
+                    codes[r.status_code] = codes.get(r.status_code, 0) + 1
+                    if r.status_code == 200:
+                        login_lat.append(dt)
+                if r.status_code == 503:
+                    time.sleep(float(r.headers.get("retry-after", "1")) / 10)
+
+        threads = [threading.Thread(target=login, daemon=True) for _ in range(login_threads)]
+        for th in threads:
+            th.start()
+        time.sleep(0.5)
+        lat = _probe(client, seconds)
+        stop.set()
+        for th in threads:
+            th.join()
+
+        _report("during logins", lat)
+        _report("login (200)", login_lat)
+        print(f"threads={login_threads} rounds={BCRYPT_ROUNDS} workers={PASSWORD_HASH_WORKERS} "
+              f"queue={PASSWORD_HASH_MAX_QUEUE} logins={dict(sorted(codes.items()))}")
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:3]]
+    if args:
+        args[0] = int(args[0])
+    run(*args)
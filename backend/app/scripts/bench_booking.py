@@ -0,0 +1,83 @@
+# FILE: app/scripts/bench_booking.py
+"""
+동시 예약 부하 테스트: 같은 상품·같은 기간에 writer N명이 동시에 POST /rentals
+
+사용: python -m app.scripts.bench_booking [writers] [rounds]
+ - 임시 SQLite DB(별도 파일)에서 실행하므로 dev.db 는 건드리지 않음
+ - 라운드마다 정확히 1건만 201, 나머지는 409 여야 함 (500/locked 0건)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_booking_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def _percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))] if xs else 0.0
+
+
+def run(writers: int = 32, rounds: int = 20):
+    client = TestClient(app)
+
+    headers = []
+    for _ in range(writers):
+        email = f"bench_{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/auth/register", json={"email": email, "password": "bench-pass"})
+        tok = client.post("/auth/login", json={"email": email, "password": "bench-pass"}).json()["access_token"]
+        headers.append({"Authorization": f"Bearer {tok}"})
+
+    pid = client.post("/products", json={"name": "bench item", "price_per_day": 1000}).json()["id"]
+
+    codes = {}
+    latencies = []
+    lock = threading.Lock()
+    double_booked = 0
+
+    t0 = time.perf_counter()
+    for rnd in range(rounds):
+        start = date(2031, 1, 1) + timedelta(days=rnd * 10)
+        body = {"product_id": pid, "start_date": start.isoformat(), "end_date": (start + timedelta(days=3)).isoformat()}
+        barrier = threading.Barrier(writers)
+        ok = []
+
+        def worker(h):
+            barrier.wait()
+            t = time.perf_counter()
+            r = client.post("/rentals", json=body, headers=h)
+            dt = time.perf_counter() - t
+            with lock:
+                codes[r.status_code] = codes.get(r.status_code, 0) + 1
+                latencies.append(dt)
+                if r.status_code == 201:
+                    ok.append(r.json()["id"])
+
+        threads = [threading.Thread(target=worker, args=(h,)) for h in headers]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        if len(ok) != 1:
+            double_booked += max(len(ok) - 1, 0)
+    elapsed = time.perf_counter() - t0
+
+    total = writers * rounds
+    print(f"writers={writers} rounds={rounds} requests={total} elapsed={elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    print(f"status codes: {dict(sorted(codes.items()))}")
+    print(f"latency p50={_percentile(latencies, 0.5) * 1000:.1f}ms p99={_percentile(latencies, 0.99) * 1000:.1f}ms")
+    print(f"double bookings: {double_booked}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,102 @@
+# FILE: app/scripts/bench_uploads.py
+"""
+업로드 중 다른 엔드포인트 지연 측정: 업로더 N명이 큰 사진을 계속 올리는 동안
+GET /products/popular 를 반복 호출해서 p50/p99 를 업로드 없을 때와 비교
+
+사용: python -m app.scripts.bench_uploads [uploaders] [seconds] [size_mb]
+ - 임시 SQLite DB/업로드 폴더에서 실행하므로 dev.db, uploads/ 는 건드리지 않음
+ - 모든 요청이 하나의 이벤트 루프를 공유(TestClient 컨텍스트) → 루프를 막는 코드가 있으면 p99 가 크게 튐
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_uploads_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+os.chdir(_tmpdir)  # uploads/ 를 임시 폴더 아래에 생성
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def _percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))] if xs else 0.0
+
+
+def _probe(client, seconds: float):
+    lat = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t = time.perf_counter()
+        client.get("/products/popular", params={"limit": 5})
+        lat.append(time.perf_counter() - t)
+        time.sleep(0.005)
+    return lat
+
+
+def _report(label, lat):
+    print(
+        f"{label:<16} n={len(lat):<5} p50={_percentile(lat, 0.5) * 1000:7.1f}ms "
+        f"p99={_percentile(lat, 0.99) * 1000:7.1f}ms max={max(lat or [0]) * 1000:7.1f}ms"
+    )
+
+
+def run(uploaders: int = 8, seconds: float = 5.0, size_mb: float = 8.0):
+    with TestClient(app) as client:
+        email = f"bench_{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/auth/register", json={"email": email, "password": "bench-pass"})
+        tok = client.post("/auth/login", json={"email": email, "password": "bench-pass"}).json()["access_token"]
+        h = {"Authorization": f"Bearer {tok}"}
+        pid = client.post("/products", json={"name": "bench item", "price_per_day": 1000}).json()["id"]
+        rid = client.post(
+            "/rentals",
+            json={"product_id": pid, "start_date": date(2031, 1, 1).isoformat(), "end_date": date(2031, 1, 3).isoformat()},
+            headers=h,
+        ).json()["id"]
+
+        payload = os.urandom(int(size_mb * 1024 * 1024))
+
+        _report("idle", _probe(client, seconds))
+
+        stop = threading.Event()
+        codes = {}
+        sent = [0]
+        lock = threading.Lock()
+
+        def uploader():
+            while not stop.is_set():
+                r = client.post(
+                    "/photos/upload",
+                    data={"rental_id": str(rid), "phase": "BEFORE"},
+                    files={"file": ("p.jpg", payload, "image/jpeg")},
+                    headers=h,
+                )
+                with lock:
+                    codes[r.status_code] = codes.get(r.status_code, 0) + 1
+                    sent[0] += len(payload)
+
+        threads = [threading.Thread(target=uploader, daemon=True) for _ in range(uploaders)]
+        for th in threads:
+            th.start()
+        time.sleep(0.5)
+        lat = _probe(client, seconds)
+        stop.set()
+        for th in threads:
+            th.join()
+
+        _report("during uploads", lat)
+        print(f"uploaders={uploaders} size={size_mb}MB uploads={dict(sorted(codes.items()))} "
+              f"throughput={sent[0] / (1024 * 1024) / (seconds + 0.5):.0f}MB/s")
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:4]]
+    if args:
+        args[0] = int(args[0])
+    run(*args)
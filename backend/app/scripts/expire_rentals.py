@@ -0,0 +1,13 @@
+# FILE: app/scripts/expire_rentals.py
+# 종료일이 지난 활성 대여를 EXPIRED 로 일괄 처리 (cron 용)
+# 사용: python -m app.scripts.expire_rentals
+from app.services import expiry
+
+
+def run():
+    n = expiry.sweep_once()
+    print(f"[expiry] expired {n} rentals.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,39 @@
+# FILE: app/scripts/gc_uploads.py
+"""
+고아 업로드 파일 정리 (services.upload_gc)
+
+사용: python -m app.scripts.gc_uploads [--apply] [--delete] [--min-age-hours H] [--batch N] [--max N]
+ - 기본은 dry-run: 지울 대상 수/용량만 출력
+ - --apply  : uploads/_quarantine/<시각>/ 로 이동 (확인 후 폴더째 지우면 됨)
+ - --delete : --apply 와 함께 쓰면 격리 없이 바로 삭제
+"""
+import argparse
+import json
+
+from app.services import upload_gc
+
+
+def run(argv=None):
+    ap = argparse.ArgumentParser(prog="gc_uploads")
+    ap.add_argument("--apply", action="store_true", help="실제로 정리 (기본 dry-run)")
+    ap.add_argument("--delete", action="store_true", help="격리하지 않고 삭제")
+    ap.add_argument("--min-age-hours", type=float, default=1.0, help="이보다 최근 파일은 건너뜀")
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--max", type=int, default=None, help="이번 실행에서 처리할 최대 파일 수")
+    args = ap.parse_args(argv)
+
+    r = upload_gc.collect(
+        dry_run=not args.apply,
+        quarantine=not args.delete,
+        min_age_seconds=args.min_age_hours * 3600,
+        batch_size=args.batch,
+        max_files=args.max,
+    )
+    mode = "dry-run" if not args.apply else ("delete" if args.delete else "quarantine")
+    print(f"[gc_uploads] mode={mode}")
+    print(json.dumps(r.as_dict(), ensure_ascii=False, indent=2))
+    print(f"[gc_uploads] {'reclaimable' if not args.apply else 'reclaimed'} {r.reclaimed_bytes / (1024 * 1024):.1f} MiB")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,44 @@
+# FILE: app/scripts/generate_variants.py
+"""
+기존 업로드의 파생본(썸네일/카드/전체) 백필
+
+사용: python -m app.scripts.generate_variants [--force]
+ - 파생본이 없는 사진/상품 이미지만 처리 (--force 면 전부 다시 생성)
+ - Pillow 필요
+"""
+import sys
+
+from app.database import SessionLocal
+from app import models
+from app.services import media_variants
+
+
+def run(force: bool = False) -> None:
+    if not media_variants.enabled():
+        sys.exit("Pillow is required: pip install Pillow")
+
+    done = skipped = failed = 0
+    with SessionLocal() as db:
+        targets = [("photo", p, p.url, "variants") for p in db.query(models.Photo).all()]
+        targets += [("product", p, p.image_url, "image_variants") for p in db.query(models.Product).all()]
+        for kind, row, url, column in targets:
+            src = media_variants.local_path(url)
+            if (getattr(row, column) and not force) or src is None or not src.exists():
+                skipped += 1
+                continue
+            try:
+                variants = media_variants.render_sync(kind, src)
+            except Exception as e:
+                print(f"[generate_variants] {kind} {row.id} ({url}) failed:", repr(e))
+                failed += 1
+                continue
+            setattr(row, column, media_variants.dumps(variants))
+            done += 1
+            if done % 100 == 0:
+                db.commit()
+        db.commit()
+    print(f"[generate_variants] generated={done} skipped={skipped} failed={failed}")
+
+
+if __name__ == "__main__":
+    run(force="--force" in sys.argv[1:])
@@ -0,0 +1,13 @@
+# FILE: app/scripts/migrate.py
+# 사용: python -m app.scripts.migrate
+# 앱 시작 시 자동으로 도는 스키마 보정/백필(app.migrations)을 서버 없이 실행
+from app import migrations
+
+
+def run():
+    migrations.run()
+    print("[migrate] done.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,20 @@
+# FILE: app/scripts/rebuild_product_stats.py
+# 사용: python -m app.scripts.rebuild_product_stats
+from app.database import SessionLocal, engine
+from app import models
+from app.services import product_stats, trending
+
+models.Base.metadata.create_all(bind=engine)
+
+
+def run():
+    with SessionLocal() as db:
+        n = product_stats.rebuild(db)
+        m = trending.rebuild(db)
+        db.commit()
+        print(f"[product_stats] recomputed {n} products.")
+        print(f"[trending] replayed {m} events.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,21 @@
+# FILE: app/scripts/rebuild_search_index.py
+# 사용: python -m app.scripts.rebuild_search_index
+from app.database import SessionLocal, engine
+from app import models
+from app.services import search_index
+
+models.Base.metadata.create_all(bind=engine)
+
+
+def run():
+    if not search_index.ensure_index(engine):
+        print("[search_index] FTS5 not available on this DB; nothing to do.")
+        return
+    with SessionLocal() as db:
+        n = search_index.rebuild(db)
+        db.commit()
+        print(f"[search_index] reindexed {n} products.")
+
+
+if __name__ == "__main__":
+    run()
@@ -6,9 +6,11 @@ from sqlalchemy import select
 from app.database import SessionLocal, engine
 from app import models
 from app.constants.categories import CATEGORIES
+from app.services import product_stats, search_index
 
 # idempotent (단, 기존 테이블에 새 컬럼 추가는 안 함)
 models.Base.metadata.create_all(bind=engine)
+search_index.ensure_index(engine)
 
 SEED: Dict[str, List[Dict]] = {
     "living": [
@@ -171,6 +173,9 @@ def run():
             for it in SEED.get(key, []):
                 upsert_product(db, it, key)
                 cnt += 1
+        db.flush()
+        search_index.rebuild(db)
+        product_stats.ensure_backfilled(db)
         db.commit()
         print(f"[seed] upserted {cnt} products.")
 
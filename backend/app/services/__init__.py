@@ -0,0 +1 @@
+# (empty is fine)
@@ -0,0 +1,189 @@
+# FILE: app/services/availability.py
+"""
+상품별 예약 구간 캐시 (프로세스 메모리)
+
+- 상품마다 비활성(CLOSED/CANCELED/EXPIRED)이 아닌 대여의 [start, end) 구간을 시작일 순으로 보관
+- 겹침 검사: bisect + 종료일 prefix-max → O(log n)
+- 무효화: 상태 변경/생성 시 mark_dirty(db, pid) → 해당 세션이 commit 된 뒤에 캐시에서 제거
+  (commit 전에 지우면 다른 요청이 커밋 전 데이터를 다시 캐시할 수 있음)
+- 세대(generation) 번호로 "DB 읽는 사이 무효화된" 결과는 캐시에 넣지 않음
+- 워커가 여러 개면 다른 프로세스의 변경은 TTL 로만 반영됨
+  → 캐시는 조회 엔드포인트 전용. 예약 생성은 has_overlap_db + 날짜 슬롯 UNIQUE 로 판정
+"""
+from __future__ import annotations
+
+import base64
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from .. import models
+
+MAX_PRODUCTS = 4096     # LRU 상한
+TTL_SECONDS = 30.0      # 다른 워커의 변경 반영 상한
+
+INACTIVE_STATUSES = tuple(
+    s for s in (
+        models.RentalStatus.CLOSED,
+        getattr(models.RentalStatus, "CANCELED", None),
+        getattr(models.RentalStatus, "EXPIRED", None),
+    ) if s is not None
+)
+
+Interval = Tuple[date, date]
+
+
+class _Entry:
+    __slots__ = ("intervals", "starts", "max_end", "loaded_at")
+
+    def __init__(self, intervals: List[Interval]):
+        self.intervals = intervals
+        self.starts = [s for s, _ in intervals]
+        self.max_end: List[date] = []
+        cur: Optional[date] = None
+        for _, e in intervals:
+            cur = e if cur is None or e > cur else cur
+            self.max_end.append(cur)
+        self.loaded_at = time.monotonic()
+
+    def overlaps(self, start: date, end: date) -> bool:
+        # start < end 인 구간들 중 end 가 start 보다 큰 게 하나라도 있으면 겹침
+        idx = bisect_left(self.starts, end)
+        return idx > 0 and self.max_end[idx - 1] > start
+
+
+_lock = threading.Lock()
+_cache: "OrderedDict[int, _Entry]" = OrderedDict()
+_generation: Dict[int, int] = {}
+
+
+# -------------------- 무효화 --------------------
+def invalidate(product_id: int) -> None:
+    with _lock:
+        _cache.pop(product_id, None)
+        _generation[product_id] = _generation.get(product_id, 0) + 1
+
+
+def mark_dirty(db: Session, product_id: int) -> None:
+    """이 세션이 commit 되면 product_id 캐시를 무효화"""
+    db.info.setdefault("availability_dirty", set()).add(product_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for pid in session.info.pop("availability_dirty", ()):
+        invalidate(pid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("availability_dirty", None)
+
+
+# -------------------- 조회 --------------------
+def _load(db: Session, product_id: int) -> List[Interval]:
+    R = models.Rental
+    rows = db.execute(
+        select(R.start_date, R.end_date)
+        .where(R.product_id == product_id, R.status.notin_(INACTIVE_STATUSES))
+        .order_by(R.start_date, R.end_date)
+    ).all()
+    return [(r.start_date, r.end_date) for r in rows]
+
+
+def _entry(db: Session, product_id: int) -> _Entry:
+    with _lock:
+        ent = _cache.get(product_id)
+        if ent is not None and time.monotonic() - ent.loaded_at < TTL_SECONDS:
+            _cache.move_to_end(product_id)
+            return ent
+        gen = _generation.get(product_id, 0)
+
+    ent = _Entry(_load(db, product_id))
+
+    with _lock:
+        if _generation.get(product_id, 0) == gen:
+            _cache[product_id] = ent
+            _cache.move_to_end(product_id)
+            while len(_cache) > MAX_PRODUCTS:
+                _cache.popitem(last=False)
+    return ent
+
+
+def intervals(db: Session, product_id: int) -> List[Interval]:
+    """시작일 순 [start, end) 목록"""
+    return list(_entry(db, product_id).intervals)
+
+
+def is_available(db: Session, product_id: int, start: date, end: date) -> bool:
+    """캐시 기반 (조회 엔드포인트 전용: 다른 워커의 변경은 TTL 만큼 늦게 보일 수 있음)"""
+    return not _entry(db, product_id).overlaps(start, end)
+
+
+def has_overlap_db(db: Session, product_id: int, start: date, end: date) -> bool:
+    """
+    DB 직접 조회 (ix_rentals_product_period). 쓰기 경로(예약 생성)의 판정은 반드시 이것으로 —
+    캐시는 프로세스별이라 다른 워커에서 방금 생긴 예약을 못 볼 수 있음.
+    """
+    R = models.Rental
+    hit = db.execute(
+        select(R.id)
+        .where(
+            R.product_id == product_id,
+            R.status.notin_(INACTIVE_STATUSES),
+            R.start_date < end,
+            R.end_date > start,
+        )
+        .limit(1)
+    ).first()
+    return hit is not None
+
+
+# -------------------- 달력 인코딩 --------------------
+def merged(ivs: List[Interval]) -> List[Interval]:
+    """겹치거나 맞닿은 구간을 합침 (입력은 시작일 순)"""
+    out: List[Interval] = []
+    for s, e in ivs:
+        if out and s <= out[-1][1]:
+            if e > out[-1][1]:
+                out[-1] = (out[-1][0], e)
+        else:
+            out.append((s, e))
+    return out
+
+
+def expand_days(ivs: List[Interval]) -> List[str]:
+    """막힌 날짜 'YYYY-MM-DD' 목록 (정렬·중복 없음, end 제외)"""
+    days: List[str] = []
+    for s, e in merged(ivs):
+        days.extend((s + timedelta(days=i)).isoformat() for i in range((e - s).days))
+    return days
+
+
+def bitmap(ivs: List[Interval], base: Optional[date] = None, days: Optional[int] = None) -> dict:
+    """
+    base 부터 days 일 동안의 막힘 여부 비트맵.
+    bit i (바이트 i//8 의 LSB부터) = base + i 일이 막혀 있으면 1. urlsafe base64 로 반환.
+    """
+    m = merged(ivs)
+    if base is None:
+        base = m[0][0] if m else date.today()
+    if days is None:
+        days = max(((m[-1][1] - base).days if m else 0), 0)
+    buf = bytearray((days + 7) // 8)
+    for s, e in m:
+        lo = max((s - base).days, 0)
+        hi = min((e - base).days, days)
+        for i in range(lo, hi):
+            buf[i >> 3] |= 1 << (i & 7)
+    return {
+        "base": base.isoformat(),
+        "days": days,
+        "bitmap": base64.urlsafe_b64encode(bytes(buf)).decode(),
+    }
@@ -0,0 +1,228 @@
+# FILE: app/services/blob_store.py
+"""
+내용 주소(SHA-256) 기반 업로드 저장소 + 참조 카운트
+
+- 경로: uploads/blobs/ab/cd/<sha256><ext> (앞 4글자로 2단계 샤딩 → 디렉터리당 파일 수 제한)
+  URL : /media/<sha256><ext>  (내용이 바뀌면 URL 도 바뀜 → 영구 캐시 가능, routers.media)
+- 같은 바이트를 다시 올리면(앱 재시도 등) 파일은 그대로 두고 ref_count 만 +1
+- 참조 해제로 ref_count 가 0 이 되면 행 삭제, 파일은 commit 이후에 삭제
+  (롤백되면 파일은 남아 있어야 하므로)
+  · 같은 내용을 재사용하는 업로드는 put(파일) → acquire(DB) 사이에 파일 mtime 을 갱신하고,
+    commit 후 삭제는 파일을 옮겨 둔 뒤 행이 여전히 없고 최근에 재사용되지 않았을 때만 지움
+    (재사용 중이면 되돌려 놓음 → 남은 고아 파일은 upload_gc 가 정리)
+  · 업로드 실패 후 정리(cleanup_if_unreferenced)도 같은 경로로만 지움
+- Photo/Product 행이 ORM 으로 삭제되면(대여·사용자 cascade 포함) before_flush 에서 참조 해제
+- acquire/release 는 호출부 트랜잭션 안에서 실행, commit은 호출부
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+from . import uploads
+
+UPLOAD_ROOT = Path("uploads")
+BLOB_ROOT = UPLOAD_ROOT / "blobs"
+TMP_DIR = BLOB_ROOT / "tmp"
+URL_PREFIX = "/media"
+
+# /media/<sha><ext> (현재) 또는 /static/blobs/ab/cd/<sha><ext> (초기 형식)
+_URL_RE = re.compile(r"^(?:/media|/static/blobs/[0-9a-f]{2}/[0-9a-f]{2})/([0-9a-f]{64})(\.[a-z0-9]+)?$")
+_NAME_RE = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]+)$")
+_EXT_ALIASES = {".jpeg": ".jpg"}
+REUSE_GRACE_SECONDS = 600.0  # 이보다 최근에 재사용(mtime 갱신)된 파일은 commit 후 삭제하지 않음
+
+
+@dataclass
+class Blob:
+    sha256: str
+    ext: str
+    size: int
+
+    @property
+    def path(self) -> Path:
+        return path_for(self.sha256, self.ext)
+
+    @property
+    def url(self) -> str:
+        return f"{URL_PREFIX}/{self.sha256}{self.ext}"
+
+
+def path_for(sha256: str, ext: str) -> Path:
+    return BLOB_ROOT / sha256[:2] / sha256[2:4] / f"{sha256}{ext}"
+
+
+def parse_name(name: str) -> Optional[Tuple[str, str]]:
+    """'<sha256><ext>' → (sha256, ext), 형식이 아니면 None"""
+    m = _NAME_RE.match(name)
+    return (m.group(1), m.group(2)) if m else None
+
+
+def sha_from_url(url: Optional[str]) -> Optional[str]:
+    """blob URL 이면 sha256, 예전 방식 URL 이면 None"""
+    m = _URL_RE.match(url or "")
+    return m.group(1) if m else None
+
+
+# -------------------- 파일 --------------------
+def _place(tmp: Path, sha256: str, ext: str) -> str:
+    """임시 파일을 blob 위치로. 이미 같은 내용이 있으면 임시 파일만 지움. 실제 ext 반환."""
+    shard = BLOB_ROOT / sha256[:2] / sha256[2:4]
+    shard.mkdir(parents=True, exist_ok=True)
+    existing = next(iter(shard.glob(f"{sha256}.*")), None)
+    if existing is not None:
+        try:
+            # 재사용 표시: 다른 요청의 commit 후 삭제(_unlink_if_unused)가 이 파일을 건너뛰게 함
+            os.utime(existing)
+        except FileNotFoundError:
+            existing = None  # 방금 삭제됨 → 새로 올린 파일로 대체
+    if existing is not None:
+        tmp.unlink(missing_ok=True)
+        return existing.suffix
+    os.replace(tmp, path_for(sha256, ext))
+    return ext
+
+
+async def put(upload: UploadFile, ext: str) -> Blob:
+    """업로드를 스트리밍 저장 후 blob 위치로 이동 (DB 기록은 acquire)"""
+    stored = await uploads.save_temp(upload, TMP_DIR)
+    ext = _EXT_ALIASES.get(ext, ext)
+    try:
+        ext = await asyncio.to_thread(_place, stored.path, stored.sha256, ext)
+    except BaseException:
+        await uploads.discard(stored.path)
+        raise
+    return Blob(sha256=stored.sha256, ext=ext, size=stored.size)
+
+
+# -------------------- 참조 카운트 --------------------
+def acquire(db: Session, blob: Blob) -> None:
+    """참조 +1 (없으면 행 생성)"""
+    B = models.MediaBlob
+    res = db.execute(
+        update(B).where(B.sha256 == blob.sha256).values(ref_count=B.ref_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.add(B(sha256=blob.sha256, ext=blob.ext, size_bytes=blob.size, ref_count=1))
+    except IntegrityError:  # 동시에 같은 내용이 먼저 등록됨
+        db.execute(
+            update(B).where(B.sha256 == blob.sha256).values(ref_count=B.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def release(db: Session, sha256: Optional[str]) -> None:
+    """참조 -1, 0 이 되면 행 삭제 + commit 후 파일 삭제"""
+    if not sha256:
+        return
+    B = models.MediaBlob
+    db.execute(
+        update(B).where(B.sha256 == sha256, B.ref_count > 0).values(ref_count=B.ref_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(select(B.ext, B.ref_count).where(B.sha256 == sha256)).first()
+    if row is not None and row.ref_count <= 0:
+        db.execute(delete(B).where(B.sha256 == sha256).execution_options(synchronize_session=False))
+        db.info.setdefault("blob_unlink", []).append((sha256, row.ext))
+
+
+def release_urls(db: Session, urls: Iterable[Optional[str]]) -> None:
+    """URL 목록 참조 해제 (blob 이 아닌 예전 URL 은 무시)"""
+    for url in urls:
+        release(db, sha_from_url(url))
+
+
+def acquire_url(db: Session, url: Optional[str]) -> None:
+    """이미 등록된 blob URL 을 다른 행이 참조하게 될 때 (상품 image_url 수정 등)"""
+    sha = sha_from_url(url)
+    if sha:
+        db.execute(
+            update(models.MediaBlob).where(models.MediaBlob.sha256 == sha)
+            .values(ref_count=models.MediaBlob.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def cleanup_if_unreferenced(blob: Blob) -> None:
+    """
+    put 이후 DB 단계가 실패했을 때. 파일은 같은 내용을 올리는 다른 요청과 공유하므로
+    참조 해제 경로와 같은 _unlink_if_unused 로만 지움 → 방금 쓰이거나 재사용된(최근 mtime) 파일은
+    남기고, 끝내 참조되지 않으면 upload_gc(min_age) 가 정리.
+    """
+    _unlink_if_unused(blob.sha256, blob.ext)
+
+
+def _unlink_if_unused(sha256: str, ext: str) -> None:
+    """
+    행이 없는 blob 파일 삭제 (참조 0 이 된 commit 후 / 업로드 실패 정리).
+    파일을 먼저 옮겨서(rename, 원자적) 동시에 재사용하려는 _place 가 utime 에 실패하고 새 파일을 놓게 한 뒤,
+    옮긴 파일이 최근에 재사용됐거나 행이 다시 생겼으면 되돌려 놓음.
+    """
+    path = path_for(sha256, ext)
+    trash = path.with_name(f"{path.name}.{uuid.uuid4().hex}.del")
+    try:
+        os.replace(path, trash)
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        print(f"[blob_store] unlink {sha256} failed:", repr(e))
+        return
+    with SessionLocal() as db:
+        revived = db.get(models.MediaBlob, sha256) is not None
+    try:
+        recent = trash.stat().st_mtime > time.time() - REUSE_GRACE_SECONDS
+        if revived or recent:
+            if not path.exists():
+                os.replace(trash, path)
+            else:
+                trash.unlink(missing_ok=True)
+            return
+    except OSError as e:
+        print(f"[blob_store] restore {sha256} failed:", repr(e))
+        return
+    trash.unlink(missing_ok=True)
+    if not path.exists():  # 그 사이 새로 올라온 같은 내용이 없을 때만 파생본도 정리
+        from . import media_variants  # 순환 import 방지
+
+        media_variants.remove_for_stem(sha256)
+
+
+@event.listens_for(Session, "before_flush")
+def _release_deleted(session: Session, _ctx, _instances) -> None:
+    """ORM 삭제(명시적 delete + relationship cascade)되는 사진/상품 이미지의 blob 참조 해제"""
+    for obj in list(session.deleted):
+        if isinstance(obj, models.Photo):
+            release(session, getattr(obj, "sha256", None) or sha_from_url(getattr(obj, "url", None)))
+        elif isinstance(obj, models.Product):
+            release(session, sha_from_url(getattr(obj, "image_url", None)))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop("blob_unlink", None)
+    if not pending:
+        return
+    for sha256, ext in pending:
+        _unlink_if_unused(sha256, ext)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("blob_unlink", None)
@@ -0,0 +1,96 @@
+# FILE: app/services/booking.py
+"""
+예약 슬롯(rental_day_slots) 관리
+
+- 대여 생성: 대여 행 + 점유 날짜별 슬롯 행을 한 트랜잭션에서 INSERT
+  → UNIQUE(product_id, day) 위반이면 다른 요청이 먼저 잡은 것 → SlotConflict (락/재시도 없이 즉시 실패)
+- 대여가 비활성(CLOSED/CANCELED/EXPIRED)이 되면 슬롯 삭제 → 그 날짜는 다시 예약 가능
+- commit/rollback 은 호출부
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from .availability import INACTIVE_STATUSES
+
+
+class SlotConflict(Exception):
+    """요청 기간 중 하루 이상이 이미 예약됨"""
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days)]
+
+
+def reserve(db: Session, rental: models.Rental) -> None:
+    """
+    rental(flush 전/후 무관)의 [start, end) 날짜 슬롯을 잡음.
+    실패 시 SlotConflict. 세션은 호출부에서 rollback 해야 함.
+    """
+    if rental.id is None:
+        db.flush()
+    rows = [
+        {"product_id": rental.product_id, "day": d, "rental_id": rental.id}
+        for d in _days(rental.start_date, rental.end_date)
+    ]
+    try:
+        db.execute(insert(models.RentalDaySlot), rows)
+    except IntegrityError as e:
+        raise SlotConflict() from e
+
+
+def release(db: Session, rental_ids: Iterable[int]) -> None:
+    ids = list(rental_ids)
+    if ids:
+        db.execute(delete(models.RentalDaySlot).where(models.RentalDaySlot.rental_id.in_(ids)))
+
+
+def on_status_changed(db: Session, rental: models.Rental, old, new) -> None:
+    if new in INACTIVE_STATUSES and old not in INACTIVE_STATUSES:
+        release(db, [rental.id])
+
+
+# -------------------- 백필 --------------------
+def ensure_backfilled(db: Session) -> bool:
+    """
+    슬롯 테이블이 비어 있는데 활성 대여가 있으면(신규 배포) 슬롯 생성.
+    기존 데이터에 이미 겹치는 예약이 있으면 먼저 잡힌 쪽(id 작은 쪽)만 슬롯을 가짐 —
+    슬롯을 못 받은 대여 id 와 상대 대여 id 를 출력하므로 운영자가 확인 후 정리해야 함.
+    """
+    S, R = models.RentalDaySlot, models.Rental
+    if db.scalar(select(func.count(S.id))):
+        return False
+    rentals = db.execute(
+        select(R.id, R.product_id, R.start_date, R.end_date)
+        .where(R.status.notin_(INACTIVE_STATUSES))
+        .order_by(R.id)
+    ).all()
+    if not rentals:
+        return False
+
+    taken: Dict[Tuple[int, date], int] = {}
+    rows = []
+    overlaps: Dict[int, Dict[int, int]] = {}  # 밀린 대여 id → {먼저 잡은 대여 id: 겹친 일수}
+    for r in rentals:
+        for d in _days(r.start_date, r.end_date):
+            holder = taken.get((r.product_id, d))
+            if holder is not None:
+                per = overlaps.setdefault(r.id, {})
+                per[holder] = per.get(holder, 0) + 1
+                continue
+            taken[(r.product_id, d)] = r.id
+            rows.append({"product_id": r.product_id, "day": d, "rental_id": r.id})
+    if rows:
+        db.execute(insert(S), rows)
+    conflicts = sum(n for per in overlaps.values() for n in per.values())
+    print(f"[booking] backfilled {len(rows)} day slots ({conflicts} overlapping days skipped)")
+    for rid, per in overlaps.items():
+        others = ", ".join(f"#{h} ({n}d)" for h, n in sorted(per.items()))
+        print(f"[booking] WARNING rental #{rid} overlaps {others}; its overlapping days have no slot")
+    return True
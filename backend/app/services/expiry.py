@@ -0,0 +1,90 @@
+# FILE: app/services/expiry.py
+"""
+대여 만료 스위퍼
+
+- 종료일(end_date, KST 기준)이 지난 활성 대여를 EXPIRED 로: 조회 당시 상태별 UPDATE ... RETURNING (전 사용자 대상)
+- 만료된 대여의 날짜 슬롯 해제 + 가용성 캐시 무효화 + 아웃박스 기록도 같은 트랜잭션에서 처리
+- 같은 주기에 오래된 시간 단위 트렌딩 버킷(product_activity_hourly), 만료/폐기된 refresh 토큰도 정리
+- 앱 시작 시 백그라운드 태스크로 주기 실행 (settings.EXPIRY_SWEEP_INTERVAL_SECONDS)
+  cron 으로 돌리려면: python -m app.scripts.expire_rentals
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+from . import availability, booking, outbox, refresh_tokens, trending
+
+try:
+    from zoneinfo import ZoneInfo
+    KST = ZoneInfo("Asia/Seoul")
+except Exception:
+    KST = timezone(timedelta(hours=9))  # UTC+9 fixed
+
+EXPIRED_STATUS = getattr(models.RentalStatus, "EXPIRED", None) or models.RentalStatus.CLOSED
+
+
+def today_local() -> date:
+    return datetime.now(KST).date()
+
+
+def sweep(db: Session, today: Optional[date] = None) -> int:
+    """만료 대상 일괄 처리 후 commit. 만료시킨 건수 반환."""
+    today = today or today_local()
+    R = models.Rental
+    overdue = (R.status.notin_(availability.INACTIVE_STATUSES), R.end_date < today)
+
+    targets = db.execute(select(R.id, R.product_id, R.user_id, R.status).where(*overdue)).all()
+    if not targets:
+        return 0
+    by_source: dict = {}
+    for t in targets:
+        by_source.setdefault(t.status, []).append(t)
+
+    # 조회 당시 상태 그대로일 때만 전이 (RETURNING 으로 실제 바뀐 행만 후속 처리)
+    now = datetime.utcnow()
+    done = set()
+    for source, group in by_source.items():
+        done.update(db.scalars(
+            update(R)
+            .where(R.id.in_([t.id for t in group]), R.status == source, R.end_date < today)
+            .values(status=EXPIRED_STATUS, updated_at=now)
+            .returning(R.id)
+            .execution_options(synchronize_session=False)
+        ))
+    targets = [t for t in targets if t.id in done]
+    n = len(targets)
+    booking.release(db, [t.id for t in targets])
+    for pid in {t.product_id for t in targets}:
+        availability.mark_dirty(db, pid)
+    outbox.record_many(db, [(t.id, t.product_id, t.user_id, t.status) for t in targets], EXPIRED_STATUS)
+    db.commit()
+    return n
+
+
+def sweep_once() -> int:
+    with SessionLocal() as db:
+        n = sweep(db)
+        # 보관 기간이 지난 시간 단위 트렌딩 버킷, 쓸모없어진 refresh 토큰 정리
+        trending.prune_hourly(db)
+        refresh_tokens.purge(db)
+        db.commit()
+        return n
+
+
+async def run_periodically(interval_seconds: float) -> None:
+    """이벤트 루프를 막지 않도록 스레드에서 sweep 실행"""
+    while True:
+        try:
+            n = await asyncio.to_thread(sweep_once)
+            if n:
+                print(f"[expiry] expired {n} rentals")
+        except Exception as e:
+            print("[expiry] sweep failed:", repr(e))
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,50 @@
+# FILE: app/services/imaging.py
+"""
+이미지 파생본 렌더링 (프로세스 풀 워커에서 실행)
+
+- 앱 모듈(models/database)을 import 하지 않음 → spawn 워커가 가볍게 뜸
+- Pillow 는 선택 의존성: 없으면 services.media_variants 가 이 모듈을 호출하지 않음
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterable
+
+
+def render_variants(
+    src: str, out_dir: str, stem: str, sizes: Dict[str, int], formats: Iterable[str]
+) -> Dict[str, dict]:
+    """
+    src 를 sizes(이름 → 긴 변 px) 별로 축소해 out_dir 에 저장.
+    원본보다 크게 늘리지 않음. 반환: {name: {"w", "h", fmt: 파일명, ...}}
+    """
+    from PIL import Image, ImageOps
+
+    formats = tuple(formats)
+    os.makedirs(out_dir, exist_ok=True)
+    out: Dict[str, dict] = {}
+    with Image.open(src) as im:
+        # JPEG 은 디코딩 단계에서 미리 줄여 읽음 (큰 카메라 원본에서 메모리/시간 절약)
+        im.draft("RGB", (max(sizes.values()),) * 2)
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+
+        for name, box in sizes.items():
+            v = im.copy()
+            v.thumbnail((box, box), Image.Resampling.LANCZOS)
+            entry: dict = {"w": v.width, "h": v.height}
+            for fmt in formats:
+                fname = f"{stem}_{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+                path = os.path.join(out_dir, fname)
+                tmp = path + ".part"
+                if fmt == "jpeg":
+                    (v if v.mode == "RGB" else v.convert("RGB")).save(
+                        tmp, "JPEG", quality=82, optimize=True, progressive=True
+                    )
+                else:
+                    v.save(tmp, "WEBP", quality=80, method=4)
+                os.replace(tmp, path)
+                entry[fmt] = fname
+            out[name] = entry
+    return out
@@ -0,0 +1,72 @@
+# FILE: app/services/live_events.py
+"""
+대여 상태 변경 실시간 전달 (프로세스 내 pub/sub)
+
+- 발행: services.outbox 가 커밋된 이벤트만 publish (롤백된 변경은 나가지 않음)
+  · 동기 엔드포인트(스레드풀)/스위퍼 스레드에서 불리므로 loop.call_soon_threadsafe 로 전달
+- 구독: 사용자별 asyncio.Queue (SSE 연결 1개당 1개)
+  · 큐가 가득 차면(느린 클라이언트) overflow 표시만 하고 버림 → 스트림이 아웃박스에서 다시 읽음
+- 같은 프로세스의 변경만 전달됨. 워커가 여러 개면 스트림의 주기적 아웃박스 재조회로 보완
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict, Iterable, Set
+
+QUEUE_SIZE = 100
+
+
+class Subscription:
+    __slots__ = ("user_id", "loop", "queue", "overflow")
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflow = False
+
+
+_lock = threading.Lock()
+_subs: Dict[int, Set[Subscription]] = {}
+
+
+def subscribe(user_id: int) -> Subscription:
+    """실행 중인 이벤트 루프 안에서 호출"""
+    sub = Subscription(user_id, asyncio.get_running_loop())
+    with _lock:
+        _subs.setdefault(user_id, set()).add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    with _lock:
+        subs = _subs.get(sub.user_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                _subs.pop(sub.user_id, None)
+
+
+def _put(sub: Subscription, event: dict) -> None:
+    try:
+        sub.queue.put_nowait(event)
+    except asyncio.QueueFull:
+        sub.overflow = True
+
+
+def publish(events: Iterable[dict]) -> None:
+    """이벤트 dict(user_id 포함) 전달. 어느 스레드에서 불러도 됨."""
+    for ev in events:
+        with _lock:
+            targets = list(_subs.get(ev["user_id"], ()))
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(_put, sub, ev)
+            except RuntimeError:  # 루프 종료됨
+                unsubscribe(sub)
+
+
+def subscriber_count() -> int:
+    with _lock:
+        return sum(len(s) for s in _subs.values())
@@ -0,0 +1,211 @@
+# FILE: app/services/media_variants.py
+"""
+업로드 이미지 파생본(썸네일/카드/전체) 생성
+
+- 업로드 응답을 보낸 뒤(BackgroundTasks) 프로세스 풀에서 렌더링 → API 워커의 CPU/GIL 을 쓰지 않음
+- 결과는 원본 행에 JSON 으로 기록 (photos.variants / products.image_variants)
+  · {"thumb": {"w", "h", "webp": url, "jpeg": url}, "card": {...}, "full": {...}}
+  · 목록 응답은 행만 읽으면 되므로 추가 쿼리 없음
+- Pillow 가 없으면 아무것도 하지 않음 (원본 URL 만 제공)
+- 기존 업로드 백필: python -m app.scripts.generate_variants
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from .. import models
+from ..database import SessionLocal
+from ..settings import MEDIA_WORKERS
+from . import imaging
+
+SIZES = {"thumb": 240, "card": 720, "full": 1600}  # 긴 변 px
+FORMATS = ("webp", "jpeg")                           # webp 우선, jpeg 은 호환용
+
+UPLOAD_ROOT = Path("uploads")
+VARIANT_ROOT = UPLOAD_ROOT / "variants"
+STATIC_PREFIX = "/static"
+URL_PREFIX = "/media/v"  # 파생본도 내용 해시 파일명 → 영구 캐시 (routers.media)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_enabled: Optional[bool] = None
+
+
+def enabled() -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = importlib.util.find_spec("PIL") is not None
+        if not _enabled:
+            print("[media_variants] Pillow not installed, serving originals only")
+    return _enabled
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MEDIA_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# -------------------- 경로/URL --------------------
+def local_path(url: Optional[str]) -> Optional[Path]:
+    """
+    '/static/photos/a.jpg' → uploads/photos/a.jpg, '/media/<sha>.jpg' → blob 경로
+    (우리 업로드가 아니면 None)
+    """
+    from . import blob_store  # 순환 import 방지
+
+    if not url:
+        return None
+    if url.startswith(blob_store.URL_PREFIX + "/"):
+        parsed = blob_store.parse_name(url[len(blob_store.URL_PREFIX) + 1:])
+        return blob_store.path_for(*parsed) if parsed else None
+    if not url.startswith(STATIC_PREFIX + "/"):
+        return None
+    return UPLOAD_ROOT / url[len(STATIC_PREFIX) + 1:]
+
+
+def file_for(subdir: str, stem: str, name: str, fmt: str) -> Path:
+    return VARIANT_ROOT / subdir / f"{stem}_{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+
+def _to_urls(rendered: Dict[str, dict], subdir: str) -> Dict[str, dict]:
+    out: Dict[str, dict] = {}
+    for name, entry in rendered.items():
+        out[name] = {
+            k: (f"{URL_PREFIX}/{subdir}/{v}" if k in FORMATS else v) for k, v in entry.items()
+        }
+    return out
+
+
+def subdirs():
+    return [t[3] for t in _TARGETS.values()]
+
+
+def remove_for_stem(stem: str) -> None:
+    """원본 파일이 삭제될 때 그 파생본도 삭제"""
+    for _, _, _, subdir in _TARGETS.values():
+        for name in SIZES:
+            for fmt in FORMATS:
+                path = file_for(subdir, stem, name, fmt)
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+
+def parse(raw: Optional[str]) -> Dict[str, dict]:
+    if not raw:
+        return {}
+    try:
+        v = json.loads(raw)
+        return v if isinstance(v, dict) else {}
+    except ValueError:
+        return {}
+
+
+def dumps(variants: Dict[str, dict]) -> str:
+    return json.dumps(variants, separators=(",", ":"))
+
+
+def thumbnail_url(variants: Dict[str, dict], fallback: Optional[str] = None) -> Optional[str]:
+    thumb = variants.get("thumb") or {}
+    return thumb.get("webp") or thumb.get("jpeg") or fallback
+
+
+# -------------------- 생성 --------------------
+_TARGETS = {
+    # kind → (모델, 원본 URL 컬럼, JSON 컬럼, 파생본 하위 폴더)
+    "photo": (models.Photo, "url", "variants", "photos"),
+    "product": (models.Product, "image_url", "image_variants", "products"),
+}
+
+
+def _copy_existing(kind: str, row_id: int) -> bool:
+    """
+    같은 원본(내용 주소 URL)의 파생본이 이미 있으면 그 JSON 을 복사하고 True.
+    앱 재시도 등으로 같은 사진이 다시 올라오면 렌더링하지 않음.
+    """
+    model, url_col, column, _ = _TARGETS[kind]
+    with SessionLocal() as db:
+        row = db.get(model, row_id)
+        url = getattr(row, url_col, None) if row is not None else None
+        if not url:
+            return row is None
+        other = db.execute(
+            select(getattr(model, column))
+            .where(getattr(model, url_col) == url, getattr(model, column).isnot(None), model.id != row_id)
+            .limit(1)
+        ).scalar()
+        if other is None:
+            return False
+        setattr(row, column, other)
+        db.commit()
+        return True
+
+
+def _store(kind: str, row_id: int, variants: Dict[str, dict]) -> None:
+    model, _, column, _ = _TARGETS[kind]
+    with SessionLocal() as db:
+        row = db.get(model, row_id)
+        if row is None:  # 그 사이 삭제됨
+            return
+        setattr(row, column, dumps(variants))
+        db.commit()
+
+
+def render_sync(kind: str, src: Path) -> Dict[str, dict]:
+    """현재 프로세스에서 렌더링 (백필 스크립트용)"""
+    subdir = _TARGETS[kind][3]
+    rendered = imaging.render_variants(str(src), str(VARIANT_ROOT / subdir), src.stem, SIZES, FORMATS)
+    return _to_urls(rendered, subdir)
+
+
+async def generate(kind: str, row_id: int, src: Path) -> None:
+    """업로드 응답 후 BackgroundTasks 로 실행. 실패해도 원본은 그대로 제공되므로 로그만 남김."""
+    if not enabled():
+        return
+    subdir = _TARGETS[kind][3]
+    loop = asyncio.get_running_loop()
+    try:
+        if await asyncio.to_thread(_copy_existing, kind, row_id):
+            return
+        rendered = await loop.run_in_executor(
+            _executor(), imaging.render_variants,
+            str(src), str(VARIANT_ROOT / subdir), src.stem, SIZES, FORMATS,
+        )
+        await asyncio.to_thread(_store, kind, row_id, _to_urls(rendered, subdir))
+    except BrokenProcessPool as e:  # 워커가 죽으면 다음 요청에서 풀을 새로 만듦
+        shutdown()
+        print(f"[media_variants] {kind} {row_id} failed:", repr(e))
+    except Exception as e:
+        print(f"[media_variants] {kind} {row_id} failed:", repr(e))
+
+
+async def generate_many(kind: str, items: List[Tuple[int, Path]]) -> None:
+    """여러 행을 한 번에: 원본별 첫 행은 병렬 렌더링, 같은 원본의 나머지 행은 결과만 복사"""
+    firsts: Dict[Path, int] = {}
+    rest: List[Tuple[int, Path]] = []
+    for row_id, src in items:
+        if src in firsts:
+            rest.append((row_id, src))
+        else:
+            firsts[src] = row_id
+    await asyncio.gather(*(generate(kind, row_id, src) for src, row_id in firsts.items()))
+    for row_id, src in rest:
+        await generate(kind, row_id, src)
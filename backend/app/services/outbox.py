@@ -0,0 +1,142 @@
+# FILE: app/services/outbox.py
+"""
+대여 상태 변경 아웃박스
+
+- 생성/상태 전이를 rental_events 에 기록: 호출부 트랜잭션 안에서 실행, commit은 호출부
+  (원본 변경과 이벤트가 같이 커밋되거나 같이 롤백됨)
+- 소비자(집계/캐시/알림 작업)는 seq 기준으로 증분 조회: read(after=마지막 seq)
+  → 변경 건수에 비례한 비용, rentals 전체 재스캔 불필요
+- 소비자별 위치는 outbox_offsets 에 저장 (get_offset / ack)
+- 커밋된 이벤트는 services.live_events 로도 발행 (SSE 스트림)
+  · flush 후 seq 가 정해진 이벤트를 dict 로 모아 두었다가 after_commit 에서 발행
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import live_events
+
+MAX_READ = 1000
+
+
+def _status(s) -> Optional[str]:
+    return getattr(s, "value", s)
+
+
+def to_dict(e: models.RentalEvent) -> dict:
+    return {
+        "seq": e.seq,
+        "rental_id": e.rental_id,
+        "product_id": e.product_id,
+        "user_id": e.user_id,
+        "old_status": e.old_status,
+        "new_status": e.new_status,
+        "created_at": e.created_at.isoformat() if e.created_at else None,
+    }
+
+
+# -------------------- 커밋 후 발행 --------------------
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, _ctx) -> None:
+    pending = session.info.get("outbox_pending")
+    if not pending:
+        return
+    flushed = session.info.setdefault("outbox_flushed", [])
+    rest = []
+    for e in pending:
+        if e.seq is not None:
+            flushed.append(to_dict(e))
+        else:
+            rest.append(e)
+    session.info["outbox_pending"] = rest
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    session.info.pop("outbox_pending", None)
+    events = session.info.pop("outbox_flushed", None)
+    if events:
+        live_events.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("outbox_pending", None)
+    session.info.pop("outbox_flushed", None)
+
+
+# -------------------- 기록 --------------------
+def record(db: Session, rental: models.Rental, old, new) -> None:
+    """단건 전이 (old=None 이면 생성). rental.id 가 필요하므로 flush 이후에 호출."""
+    if rental.id is None:
+        db.flush()
+    record_many(db, [(rental.id, rental.product_id, rental.user_id, old)], new)
+
+
+def record_many(db: Session, rows: Iterable[Tuple[int, int, int, object]], new) -> int:
+    """
+    일괄 전이: rows = (rental_id, product_id, user_id, old_status).
+    flush 시 다중행 INSERT(+RETURNING seq)로 묶여 나감.
+    """
+    now = datetime.utcnow()
+    events = [
+        models.RentalEvent(
+            rental_id=rid,
+            product_id=pid,
+            user_id=uid,
+            old_status=_status(old),
+            new_status=_status(new),
+            created_at=now,
+        )
+        for rid, pid, uid, old in rows
+    ]
+    db.add_all(events)
+    db.info.setdefault("outbox_pending", []).extend(events)
+    return len(events)
+
+
+# -------------------- 조회 --------------------
+def read(
+    db: Session, after: int = 0, limit: int = 100, user_id: Optional[int] = None
+) -> List[models.RentalEvent]:
+    """seq > after 인 이벤트를 seq 순으로 최대 limit 건"""
+    E = models.RentalEvent
+    q = select(E).where(E.seq > after)
+    if user_id is not None:
+        q = q.where(E.user_id == user_id)
+    q = q.order_by(E.seq).limit(max(1, min(limit, MAX_READ)))
+    return list(db.scalars(q))
+
+
+def head(db: Session) -> int:
+    """현재 마지막 seq (없으면 0)"""
+    return int(db.scalar(select(func.max(models.RentalEvent.seq))) or 0)
+
+
+# -------------------- 소비자 위치 --------------------
+def get_offset(db: Session, consumer: str) -> int:
+    row = db.get(models.OutboxOffset, consumer)
+    return int(row.last_seq) if row else 0
+
+
+def ack(db: Session, consumer: str, seq: int) -> int:
+    """consumer 위치를 seq 로 전진 (뒤로는 가지 않음). 저장된 위치 반환. commit은 호출부."""
+    O = models.OutboxOffset
+    row = db.get(O, consumer)
+    if row is None:
+        db.add(O(consumer=consumer, last_seq=seq))
+        db.flush()
+        return seq
+    db.execute(
+        update(O)
+        .where(O.consumer == consumer, O.last_seq < seq)
+        .values(last_seq=seq, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.refresh(row)
+    return int(row.last_seq)
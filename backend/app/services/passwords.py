@@ -0,0 +1,91 @@
+# FILE: app/services/passwords.py
+"""
+비밀번호 해시(bcrypt) 전용 실행기 + 입장 제한
+
+- bcrypt 는 요청당 수백 ms CPU → Starlette 기본 스레드풀에서 돌리면 로그인 폭주 시 다른 동기 라우트가 굶음
+- 전용 스레드풀(PASSWORD_HASH_WORKERS)에서만 실행, 대기열 상한(PASSWORD_HASH_MAX_QUEUE)을 넘으면
+  기다리지 않고 바로 Overloaded → 라우터에서 503 + Retry-After
+- 검증 시 저장된 해시의 cost 가 현재 설정(BCRYPT_ROUNDS)과 다르면 새 해시를 같이 돌려줌 (로그인 시 재해시)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..settings import BCRYPT_ROUNDS, PASSWORD_HASH_MAX_QUEUE, PASSWORD_HASH_NICE, PASSWORD_HASH_WORKERS
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+def _lower_priority() -> None:
+    # 해시 스레드는 nice 를 올려서 CPU 가 부족할 때 요청 처리 스레드(이벤트 루프 등)가 먼저 돌게 함 (Linux 만)
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), PASSWORD_HASH_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt", initializer=_lower_priority
+)
+_CAPACITY = PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE  # 실행 중 + 대기
+_lock = threading.Lock()
+_active = 0
+
+
+class Overloaded(Exception):
+    """해시 대기열이 가득 참 (잠시 후 재시도)"""
+
+
+def _admit() -> bool:
+    global _active
+    with _lock:
+        if _active >= _CAPACITY:
+            return False
+        _active += 1
+        return True
+
+
+def _leave(_fut=None) -> None:
+    global _active
+    with _lock:
+        _active -= 1
+
+
+async def _run(fn, *args):
+    """
+    자리는 풀 작업이 실제로 끝날 때(done callback) 반납.
+    요청이 취소돼도 이미 큐에 들어간/실행 중인 해시는 계속 돌기 때문에 await 쪽 finally 에서
+    반납하면 실제 대기열이 상한을 넘어감.
+    """
+    if not _admit():
+        raise Overloaded()
+    try:
+        fut = _pool.submit(fn, *args)
+    except BaseException:
+        _leave()
+        raise
+    fut.add_done_callback(_leave)
+    return await asyncio.wrap_future(fut)
+
+
+async def hash_password(plain: str) -> str:
+    return await _run(pwd_context.hash, plain)
+
+
+async def verify_and_update(plain: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """(일치 여부, 재해시가 필요하면 새 해시 아니면 None)"""
+    if not hashed:
+        return False, None
+    return await _run(pwd_context.verify_and_update, plain, hashed)
+
+
+def in_flight() -> int:
+    """현재 실행 중 + 대기 중인 해시 작업 수 (모니터링용)"""
+    with _lock:
+        return _active
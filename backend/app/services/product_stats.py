@@ -0,0 +1,202 @@
+# FILE: app/services/product_stats.py
+"""
+상품 인기 집계(product_stats) 증분 갱신
+
+- 호출부(리뷰/대여 라우터)의 트랜잭션 안에서 실행, commit은 호출부
+- 카운터는 SQL 식(col = col + 1)으로 올려서 동시 요청에서도 유실 없음
+- popularity 는 갱신된 카운터로 다시 계산해 같은 행에 저장
+- 리뷰 집계의 기준(source of truth)은 product_stats(review_count / rating_sum / rating_1..5).
+  products.avg_rating / review_count 는 목록 조회용 사본이며 _sync_rating 으로만 씀
+"""
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from .. import models
+
+_CANCELED = getattr(models.RentalStatus, "CANCELED", None)
+
+# 별점 분포 컬럼 (rating_1 ~ rating_5)
+HISTOGRAM_COLUMNS = {f"rating_{i}": "INTEGER NOT NULL DEFAULT 0" for i in range(1, 6)}
+
+
+def popularity_score(avg: Optional[float], review_count: int, rental_count: int) -> float:
+    """
+    인기 점수(popularity) 산식:
+      - 평점 기여: (avg_rating / 5.0) * 0.7
+      - 리뷰수 기여: ln(1 + review_count) * 0.2
+      - 대여수 기여: ln(1 + rental_count) * 0.3
+    """
+    s_avg = ((avg or 0.0) / 5.0) * 0.7
+    s_rev = math.log1p(max(review_count, 0)) * 0.2
+    s_ren = math.log1p(max(rental_count, 0)) * 0.3
+    return float(s_avg + s_rev + s_ren)
+
+
+def _get_or_create(db: Session, product_id: int) -> models.ProductStats:
+    row = db.get(models.ProductStats, product_id)
+    if row is None:
+        row = models.ProductStats(
+            product_id=product_id, review_count=0, rating_sum=0, rental_count=0, popularity=0.0,
+            **{name: 0 for name in HISTOGRAM_COLUMNS},
+        )
+        db.add(row)
+        db.flush()
+    return row
+
+
+def _bump(db: Session, product_id: int, **deltas: int) -> models.ProductStats:
+    row = _get_or_create(db, product_id)
+    S = models.ProductStats
+    for field, delta in deltas.items():
+        if delta:
+            setattr(row, field, getattr(S, field) + delta)
+    db.flush()
+    db.refresh(row)
+
+    avg = (row.rating_sum / row.review_count) if row.review_count else None
+    row.popularity = popularity_score(avg, row.review_count, row.rental_count)
+    db.flush()
+    return row
+
+
+# -------------------- 이벤트 훅 --------------------
+def on_product_created(db: Session, product_id: int) -> None:
+    """상품 생성 시 0점 행을 만들어 인기 목록(정렬 인덱스)에 바로 포함되게 함"""
+    _get_or_create(db, product_id)
+
+
+def _sync_rating(db: Session, product_id: Optional[int] = None) -> int:
+    """
+    products.avg_rating / review_count 를 product_stats 값으로 덮어씀 (UPDATE 1회).
+    product_id 가 없으면 전체. 같은 트랜잭션의 카운터 증가 뒤에 호출하므로 두 값이 어긋나지 않음.
+    """
+    P, S = models.Product, models.ProductStats
+    cnt = select(S.review_count).where(S.product_id == P.id).scalar_subquery()
+    total = select(S.rating_sum).where(S.product_id == P.id).scalar_subquery()
+    stmt = update(P).values(
+        review_count=func.coalesce(cnt, 0),
+        avg_rating=func.coalesce(total * 1.0 / func.nullif(cnt, 0), 0.0),
+    )
+    if product_id is not None:
+        stmt = stmt.where(P.id == product_id)
+    res = db.execute(stmt.execution_options(synchronize_session=False))
+    # 세션에 이미 올라온 Product 가 있으면 새 값을 다시 읽도록 만료
+    if product_id is not None:
+        product = db.identity_map.get(identity_key(P, product_id))
+        if product is not None:
+            db.expire(product, ["avg_rating", "review_count"])
+    return res.rowcount or 0
+
+
+def on_review_created(db: Session, product_id: int, rating: int) -> None:
+    _bump(db, product_id, review_count=1, rating_sum=int(rating), **{f"rating_{int(rating)}": 1})
+    _sync_rating(db, product_id)
+
+
+def histogram(db: Session, product_id: int) -> dict:
+    """{1: n1, ..., 5: n5} (집계 행이 없으면 모두 0)"""
+    row = db.get(models.ProductStats, product_id)
+    return {i: int(getattr(row, f"rating_{i}", 0) or 0) if row else 0 for i in range(1, 6)}
+
+
+def on_rental_created(db: Session, product_id: int) -> None:
+    _bump(db, product_id, rental_count=1)
+
+
+def on_rental_status_changed(db: Session, product_id: int, old, new) -> None:
+    """
+    CANCELED 로 들어가거나 빠질 때만 대여수가 변함 (그 외 전이는 no-op)
+    - 취소(cancel): PENDING/ACTIVE → CANCELED → -1
+    - 반납 완료(confirm_return) → CLOSED, 기간 만료 → EXPIRED: 대여는 성사됐으므로 그대로
+    """
+    if _CANCELED is None or old == new:
+        return
+    if new == _CANCELED:
+        _bump(db, product_id, rental_count=-1)
+    elif old == _CANCELED:
+        _bump(db, product_id, rental_count=1)
+
+
+# -------------------- 백필/복구 --------------------
+def rebuild(db: Session) -> int:
+    """원본(reviews/rentals)에서 전체 재계산. 갱신한 상품 수 반환."""
+    rev = dict(
+        (pid, (int(cnt or 0), int(total or 0)))
+        for pid, cnt, total in db.execute(
+            select(models.Review.product_id, func.count(models.Review.id), func.sum(models.Review.rating))
+            .group_by(models.Review.product_id)
+        )
+    )
+    rental_q = select(models.Rental.product_id, func.count(models.Rental.id)).group_by(models.Rental.product_id)
+    if _CANCELED is not None:
+        rental_q = rental_q.where(models.Rental.status != _CANCELED)
+    ren = dict((pid, int(cnt or 0)) for pid, cnt in db.execute(rental_q))
+    hist: dict = {}
+    for pid, rating, cnt in db.execute(
+        select(models.Review.product_id, models.Review.rating, func.count(models.Review.id))
+        .group_by(models.Review.product_id, models.Review.rating)
+    ):
+        hist.setdefault(pid, {})[int(rating)] = int(cnt or 0)
+
+    n = 0
+    for (pid,) in db.execute(select(models.Product.id)).all():
+        rcnt, rsum = rev.get(pid, (0, 0))
+        rencnt = ren.get(pid, 0)
+        row = _get_or_create(db, pid)
+        row.review_count = rcnt
+        row.rating_sum = rsum
+        row.rental_count = rencnt
+        for i in range(1, 6):
+            setattr(row, f"rating_{i}", hist.get(pid, {}).get(i, 0))
+        row.popularity = popularity_score((rsum / rcnt) if rcnt else None, rcnt, rencnt)
+        n += 1
+    db.flush()
+    return n
+
+
+def rebuild_ratings(db: Session) -> int:
+    """products.avg_rating / review_count 를 product_stats 기준으로 일괄 재설정 (UPDATE 1회)"""
+    return _sync_rating(db)
+
+
+def _out_of_sync(db: Session) -> bool:
+    """집계 행 누락, 리뷰 원본과 합계 불일치, 분포 합 불일치, products 사본 불일치 중 하나라도 있으면 True"""
+    P, S, R = models.Product, models.ProductStats, models.Review
+    n_products = db.scalar(select(func.count(P.id))) or 0
+    n_stats = db.scalar(select(func.count(S.product_id))) or 0
+    if n_products != n_stats:
+        return True
+    n_reviews = db.scalar(select(func.count(R.id))) or 0
+    stats_reviews, hist_total = db.execute(
+        select(
+            func.coalesce(func.sum(S.review_count), 0),
+            func.coalesce(func.sum(sum(getattr(S, name) for name in HISTOGRAM_COLUMNS)), 0),
+        )
+    ).one()
+    if int(stats_reviews) != n_reviews or int(hist_total) != n_reviews:
+        return True
+    mismatched = db.scalar(
+        select(func.count(P.id))
+        .join(S, S.product_id == P.id)
+        .where(P.review_count != S.review_count)
+    )
+    return bool(mismatched)
+
+
+def ensure_backfilled(db: Session) -> bool:
+    """
+    집계가 원본/사본과 어긋나 있으면(신규 테이블·컬럼, 누락, 과거 버그) 재계산. 재계산 여부 반환.
+    컬럼을 방금 추가했는지와 무관하게 값으로 판단하므로 기본값 0 으로 남은 행도 복구됨.
+    """
+    if not _out_of_sync(db):
+        return False
+    n = rebuild(db)
+    rebuild_ratings(db)
+    print(f"[product_stats] rebuilt {n} rows")
+    return True
@@ -0,0 +1,119 @@
+# FILE: app/services/refresh_tokens.py
+"""
+회전식 refresh 토큰
+
+- access 토큰은 짧게(ACCESS_TOKEN_EXPIRE_MINUTES) + 클레임만으로 인가 → 요청마다 DB 조회 없음
+- 폐기/권한 변경 확인은 refresh 때만: token_hash 유니크 인덱스로 1건 조회
+- 회전: 쓴 토큰은 즉시 폐기(guarded UPDATE), 같은 family 로 새 토큰 발급
+- 재사용 감지: 이미 폐기된 토큰이 다시 오면 그 family(로그인 1회에서 이어진 토큰들) 전체 폐기
+- 원문은 클라이언트만 가짐, DB 에는 sha256 만 저장
+- 정리(purge): 만료된 행 + 살아 있는 토큰이 하나도 없는 family 의 행 (만료 스위퍼가 주기 실행)
+  · 살아 있는 family 의 폐기 행은 재사용 감지에 필요하므로 만료될 때까지 남김
+"""
+from __future__ import annotations
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..settings import REFRESH_TOKEN_EXPIRE_DAYS
+
+
+class InvalidRefreshToken(Exception):
+    """없음 / 만료 / 폐기됨(재사용) / 사용자 없음"""
+
+
+def _hash(raw: str) -> str:
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def issue(db: Session, user_id: int, family_id: Optional[str] = None) -> str:
+    """새 refresh 토큰 행 추가 후 원문 반환 (commit 은 호출 측)"""
+    raw = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    db.add(models.RefreshToken(
+        token_hash=_hash(raw),
+        family_id=family_id or secrets.token_hex(16),
+        user_id=user_id,
+        created_at=now,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return raw
+
+
+def revoke_family(db: Session, family_id: str) -> int:
+    RT = models.RefreshToken
+    res = db.execute(
+        update(RT)
+        .where(RT.family_id == family_id, RT.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return res.rowcount or 0
+
+
+def rotate(db: Session, raw: str) -> Tuple[models.User, str]:
+    """
+    refresh 토큰 1회 사용 → (현재 사용자, 새 refresh 토큰 원문). commit 까지 수행.
+    실패하면 InvalidRefreshToken (재사용이면 family 폐기까지 commit 한 뒤)
+    """
+    RT = models.RefreshToken
+    row = db.query(RT).filter(RT.token_hash == _hash(raw)).first()
+    if row is None:
+        raise InvalidRefreshToken()
+
+    now = datetime.utcnow()
+    if row.revoked_at is not None:
+        revoke_family(db, row.family_id)
+        db.commit()
+        raise InvalidRefreshToken()
+    if row.expires_at <= now:
+        raise InvalidRefreshToken()
+
+    # 동시에 같은 토큰으로 두 번 오면 한쪽만 통과 (나머지는 재사용으로 처리)
+    res = db.execute(
+        update(RT).where(RT.id == row.id, RT.revoked_at.is_(None)).values(revoked_at=now)
+    )
+    if res.rowcount != 1:
+        db.rollback()
+        revoke_family(db, row.family_id)
+        db.commit()
+        raise InvalidRefreshToken()
+
+    user = db.get(models.User, row.user_id)
+    if user is None:
+        revoke_family(db, row.family_id)
+        db.commit()
+        raise InvalidRefreshToken()
+
+    new_raw = issue(db, user.id, row.family_id)
+    db.commit()
+    return user, new_raw
+
+
+def revoke(db: Session, raw: str) -> bool:
+    """로그아웃: 이 토큰이 속한 family 전체 폐기"""
+    RT = models.RefreshToken
+    family_id = db.query(RT.family_id).filter(RT.token_hash == _hash(raw)).scalar()
+    if family_id is None:
+        return False
+    revoke_family(db, family_id)
+    db.commit()
+    return True
+
+
+def purge(db: Session, now: Optional[datetime] = None) -> int:
+    """더 이상 쓸모없는 행 삭제 (commit 은 호출 측). 삭제 건수 반환."""
+    RT = models.RefreshToken
+    now = now or datetime.utcnow()
+    live_families = select(RT.family_id).where(RT.revoked_at.is_(None), RT.expires_at > now)
+    res = db.execute(
+        delete(RT)
+        .where(or_(RT.expires_at <= now, RT.family_id.notin_(live_families)))
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
@@ -0,0 +1,173 @@
+# FILE: app/services/search_index.py
+"""
+상품 전문 검색 인덱스 (SQLite FTS5)
+
+- products_fts(rowid = products.id, body = 이름+설명의 n-gram 토큰)
+- 한국어는 띄어쓰기 단위로 검색되지 않으므로 단어마다 2-gram + 마지막 글자(1-gram)를 저장
+  · "텐트"   → "텐트 트"
+  · "캠핑텐트" → "캠핑 핑텐 텐트 트"
+- 질의는 같은 방식으로 2-gram 구(phrase)로 바꿔서 MATCH → LIKE '%q%'와 같은 부분일치 의미
+- SQLite가 아니거나 FTS5가 없으면 비활성(None 반환) → 호출부에서 LIKE로 폴백
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Optional
+
+from sqlalchemy import literal_column, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+FTS_TABLE = "products_fts"
+
+# 밑줄은 FTS5 unicode61 토크나이저에서 구분자이므로 단어 문자에서 제외
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# 엔진(bind)별 FTS 사용 가능 여부 캐시
+_ready: dict = {}
+
+
+# -------------------- 토큰화 --------------------
+def _words(s: Optional[str]) -> List[str]:
+    return _WORD_RE.findall((s or "").lower())
+
+
+def _bigrams(word: str) -> List[str]:
+    return [word[i : i + 2] for i in range(len(word) - 1)]
+
+
+def index_text(*parts: Optional[str]) -> str:
+    """저장용 토큰 문자열 (공백 구분)"""
+    tokens: List[str] = []
+    for part in parts:
+        for w in _words(part):
+            if len(w) > 1:
+                tokens.extend(_bigrams(w))
+            tokens.append(w[-1])  # 한 글자 검색용
+    return " ".join(tokens)
+
+
+def match_query(q: Optional[str]) -> Optional[str]:
+    """
+    검색어 → FTS5 MATCH 식
+    - 두 글자 이상 단어: 연속된 2-gram 구 ("캠핑 핑텐")
+    - 한 글자 단어: 접두 검색 ("텐"*)
+    - 단어가 여러 개면 AND
+    """
+    clauses: List[str] = []
+    for w in _words(q):
+        if len(w) == 1:
+            clauses.append(f'"{w}"*')
+        else:
+            clauses.append('"' + " ".join(_bigrams(w)) + '"')
+    return " AND ".join(clauses) or None
+
+
+# -------------------- 스키마 --------------------
+def _bind_key(bind) -> str:
+    return str(getattr(bind, "url", bind))
+
+
+def ensure_index(engine) -> bool:
+    """
+    가상 테이블이 없으면 생성하고 전체 색인(백필)까지 수행.
+    앱 시작 시 한 번 호출. 사용 가능 여부 반환.
+    """
+    key = _bind_key(engine)
+    if engine.dialect.name != "sqlite":
+        _ready[key] = False
+        return False
+
+    with engine.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (FTS_TABLE,)
+        ).first()
+        if not exists:
+            try:
+                conn.exec_driver_sql(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    "body, tokenize='unicode61 remove_diacritics 0')"
+                )
+            except OperationalError as e:
+                print("[search_index] FTS5 unavailable, falling back to LIKE:", repr(e))
+                _ready[key] = False
+                return False
+            rows = conn.exec_driver_sql("SELECT id, name, description FROM products").fetchall()
+            if rows:
+                conn.exec_driver_sql(
+                    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (?, ?)",
+                    [(r[0], index_text(r[1], r[2])) for r in rows],
+                )
+            print(f"[search_index] created {FTS_TABLE} ({len(rows)} products indexed)")
+
+    _ready[key] = True
+    return True
+
+
+def is_ready(db: Session) -> bool:
+    bind = db.get_bind()
+    key = _bind_key(bind)
+    if key not in _ready:
+        if bind.dialect.name != "sqlite":
+            _ready[key] = False
+        else:
+            row = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": FTS_TABLE},
+            ).first()
+            _ready[key] = row is not None
+    return _ready[key]
+
+
+# -------------------- 동기화 (호출부 트랜잭션 안에서 실행, commit은 호출부) --------------------
+def upsert_product(db: Session, p: models.Product) -> None:
+    """생성/수정 후 호출. p.id가 필요하므로 flush 이후에 호출해야 함."""
+    if not is_ready(db):
+        return
+    if p.id is None:
+        db.flush()
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": p.id})
+    db.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (:id, :body)"),
+        {"id": p.id, "body": index_text(p.name, p.description)},
+    )
+
+
+def remove_product(db: Session, product_id: int) -> None:
+    if not is_ready(db):
+        return
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": product_id})
+
+
+def rebuild(db: Session, products: Optional[Iterable[models.Product]] = None) -> int:
+    """전체 재색인 (복구/시드 후 사용). 색인한 상품 수 반환."""
+    if not is_ready(db):
+        return 0
+    rows = products if products is not None else db.query(models.Product).all()
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    n = 0
+    for p in rows:
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (:id, :body)"),
+            {"id": p.id, "body": index_text(p.name, p.description)},
+        )
+        n += 1
+    return n
+
+
+# -------------------- 조회 --------------------
+def matching_ids(db: Session, q: Optional[str]):
+    """
+    q에 매칭되는 products.id 서브쿼리(select) 반환.
+    인덱스를 쓸 수 없거나 검색어가 비어 있으면 None → 호출부에서 LIKE 폴백.
+    """
+    expr = match_query(q)
+    if not expr or not is_ready(db):
+        return None
+    return (
+        select(literal_column("rowid"))
+        .select_from(text(FTS_TABLE))
+        .where(text(f"{FTS_TABLE} MATCH :fts_q").bindparams(fts_q=expr))
+    )
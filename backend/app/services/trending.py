@@ -0,0 +1,252 @@
+# FILE: app/services/trending.py
+"""
+트렌딩(시간 감쇠 인기) 점수 + 시간/일 단위 활동 카운터
+
+- 이벤트마다 weight · 2^((t - EPOCH) / HALF_LIFE) 를 더한 값을 log2 로 저장(score_log)
+  · 현재 점수 = 2^(score_log - (now - EPOCH) / HALF_LIFE)
+  · 모든 상품이 같은 비율로 감쇠하므로 score_log 순서 = 현재 점수 순서
+  · log 영역에서 더하므로(logaddexp2) 시간이 오래 지나도 overflow 없음
+- 갱신은 INSERT ... ON CONFLICT DO UPDATE 한 문장 (SQL 함수 logaddexp2/logsubexp2 를 연결마다 등록)
+  → 같은 상품에 동시 이벤트가 와도 유실/PK 충돌 없음
+  · SQLite 외 DB: SELECT ... FOR UPDATE 로 행을 잠그고 파이썬에서 계산해 UPDATE,
+    행이 없으면 savepoint 안에서 INSERT (동시 INSERT 와 부딪히면 잠그고 다시 갱신)
+- 취소된 대여는 생성 시각 기준 기여분과 버킷 카운트를 되돌림
+- 시간 버킷(product_activity_hourly)은 HOURLY_RETENTION_HOURS 만 보관 (prune_hourly, 만료 스위퍼가 호출)
+- 호출부 트랜잭션 안에서 실행, commit은 호출부
+"""
+from __future__ import annotations
+
+import math
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import engine
+
+EPOCH = datetime(2025, 1, 1)
+HALF_LIFE_HOURS = 72.0  # 3일마다 기여도 절반
+HOURLY_RETENTION_HOURS = 7 * 24
+
+WEIGHT_RENTAL = 1.0
+WEIGHT_REVIEW = 0.5
+
+_FLOOR = -1e9  # 사실상 0점 (score_log 는 NOT NULL)
+_CANCELED = getattr(models.RentalStatus, "CANCELED", None)
+
+
+def _age_units(at: datetime) -> float:
+    return (at - EPOCH).total_seconds() / 3600.0 / HALF_LIFE_HOURS
+
+
+def _logaddexp2(a: float, b: float) -> float:
+    hi, lo = (a, b) if a >= b else (b, a)
+    return hi + math.log2(1.0 + 2.0 ** (lo - hi))
+
+
+def _logsubexp2(a: float, b: float) -> float:
+    """log2(2^a - 2^b). 남는 게 없으면(반올림 포함) _FLOOR"""
+    if b >= a or a - b < 1e-9:
+        return _FLOOR
+    return a + math.log2(1.0 - 2.0 ** (b - a))
+
+
+@event.listens_for(engine, "connect")
+def _register_sql_functions(dbapi_conn, _record):
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        dbapi_conn.create_function("logaddexp2", 2, _logaddexp2, deterministic=True)
+        dbapi_conn.create_function("logsubexp2", 2, _logsubexp2, deterministic=True)
+
+
+def current_score(score_log: Optional[float], now: Optional[datetime] = None) -> float:
+    if score_log is None:
+        return 0.0
+    return 2.0 ** (score_log - _age_units(now or datetime.utcnow()))
+
+
+# -------------------- 증분 갱신 --------------------
+def _is_sqlite(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _locked_row(db: Session, model, keys: dict, columns: Tuple[str, ...]):
+    cond = [getattr(model, k) == v for k, v in keys.items()]
+    return db.execute(
+        select(*[getattr(model, c) for c in columns]).where(*cond).with_for_update()
+    ).first()
+
+
+def _upsert_portable(db: Session, model, keys: dict, values: dict, merge) -> None:
+    """
+    ON CONFLICT 가 없는 경로: 잠근 행을 merge(row) 로 갱신, 없으면 keys+values 로 INSERT.
+    동시 INSERT 와 부딪히면(IntegrityError) savepoint 만 되돌리고 상대가 넣은 행을 갱신
+    """
+    columns = tuple(values)
+    row = _locked_row(db, model, keys, columns)
+    if row is None:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(**keys, **values))
+            return
+        except IntegrityError:
+            row = _locked_row(db, model, keys, columns)
+    cond = [getattr(model, k) == v for k, v in keys.items()]
+    db.execute(update(model).where(*cond).values(**merge(row)))
+
+
+def _add(db: Session, product_id: int, weight: float, at: datetime) -> None:
+    T = models.ProductTrend
+    x = math.log2(weight) + _age_units(at)
+    if not _is_sqlite(db):
+        _upsert_portable(
+            db, T, {"product_id": product_id}, {"score_log": x, "last_event_at": at},
+            lambda row: {"score_log": _logaddexp2(row.score_log, x), "last_event_at": max(row.last_event_at, at)},
+        )
+        return
+    stmt = sqlite_insert(T).values(product_id=product_id, score_log=x, last_event_at=at)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[T.product_id],
+        set_={
+            "score_log": func.logaddexp2(T.score_log, stmt.excluded.score_log),
+            "last_event_at": func.max(T.last_event_at, stmt.excluded.last_event_at),
+        },
+    ))
+
+
+def _subtract(db: Session, product_id: int, weight: float, at: datetime) -> None:
+    T = models.ProductTrend
+    x = math.log2(weight) + _age_units(at)
+    if not _is_sqlite(db):
+        row = _locked_row(db, T, {"product_id": product_id}, ("score_log",))
+        if row is not None:
+            db.execute(update(T).where(T.product_id == product_id).values(score_log=_logsubexp2(row.score_log, x)))
+        return
+    db.execute(
+        update(T).where(T.product_id == product_id).values(score_log=func.logsubexp2(T.score_log, x))
+    )
+
+
+def _bump_buckets(db: Session, product_id: int, at: datetime, rentals: int = 0, reviews: int = 0) -> None:
+    for model, key, value in (
+        (models.ProductActivityDaily, "day", at.date()),
+        (models.ProductActivityHourly, "hour", at.replace(minute=0, second=0, microsecond=0)),
+    ):
+        if not _is_sqlite(db):
+            _upsert_portable(
+                db, model, {"product_id": product_id, key: value}, {"rentals": rentals, "reviews": reviews},
+                lambda row: {"rentals": row.rentals + rentals, "reviews": row.reviews + reviews},
+            )
+            continue
+        stmt = sqlite_insert(model).values(product_id=product_id, rentals=rentals, reviews=reviews, **{key: value})
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[model.product_id, getattr(model, key)],
+            set_={
+                "rentals": model.rentals + stmt.excluded.rentals,
+                "reviews": model.reviews + stmt.excluded.reviews,
+            },
+        ))
+
+
+def record_rental(db: Session, product_id: int, at: Optional[datetime] = None) -> None:
+    """at: 대여 생성 시각 (취소 시 같은 값으로 되돌리므로 rental.created_at 을 넘길 것)"""
+    at = at or datetime.utcnow()
+    _add(db, product_id, WEIGHT_RENTAL, at)
+    _bump_buckets(db, product_id, at, rentals=1)
+
+
+def record_review(db: Session, product_id: int, at: Optional[datetime] = None) -> None:
+    at = at or datetime.utcnow()
+    _add(db, product_id, WEIGHT_REVIEW, at)
+    _bump_buckets(db, product_id, at, reviews=1)
+
+
+def on_rental_status_changed(db: Session, product_id: int, created_at: datetime, old, new) -> None:
+    """CANCELED 로 들어가면 그 대여의 기여분을 빼고, (드물게) 빠져나오면 다시 더함"""
+    if _CANCELED is None or old == new or created_at is None:
+        return
+    if new == _CANCELED:
+        _subtract(db, product_id, WEIGHT_RENTAL, created_at)
+        _bump_buckets(db, product_id, created_at, rentals=-1)
+    elif old == _CANCELED:
+        record_rental(db, product_id, created_at)
+
+
+def prune_hourly(db: Session, now: Optional[datetime] = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=HOURLY_RETENTION_HOURS)
+    H = models.ProductActivityHourly
+    return db.execute(delete(H).where(H.hour < cutoff)).rowcount or 0
+
+
+# -------------------- 조회 보조 --------------------
+def window_counts(
+    db: Session, product_ids: Iterable[int], days: int, today: Optional[date] = None
+) -> Dict[int, Tuple[int, int]]:
+    """상품별 최근 days일 (대여수, 리뷰수). 일 단위 버킷만 읽음(상품당 최대 days행)."""
+    ids = list(product_ids)
+    if not ids:
+        return {}
+    since = (today or datetime.utcnow().date()) - timedelta(days=days - 1)
+    A = models.ProductActivityDaily
+    rows = db.execute(
+        select(A.product_id, func.sum(A.rentals), func.sum(A.reviews))
+        .where(A.product_id.in_(ids), A.day >= since)
+        .group_by(A.product_id)
+    ).all()
+    return {pid: (int(ren or 0), int(rev or 0)) for pid, ren, rev in rows}
+
+
+def window_counts_hourly(
+    db: Session, product_ids: Iterable[int], hours: int, now: Optional[datetime] = None
+) -> Dict[int, Tuple[int, int]]:
+    """상품별 최근 hours시간 (대여수, 리뷰수). 현재 시각이 속한 정시 버킷 포함."""
+    ids = list(product_ids)
+    if not ids:
+        return {}
+    current = (now or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+    since = current - timedelta(hours=hours - 1)
+    H = models.ProductActivityHourly
+    rows = db.execute(
+        select(H.product_id, func.sum(H.rentals), func.sum(H.reviews))
+        .where(H.product_id.in_(ids), H.hour >= since)
+        .group_by(H.product_id)
+    ).all()
+    return {pid: (int(ren or 0), int(rev or 0)) for pid, ren, rev in rows}
+
+
+# -------------------- 백필/복구 --------------------
+def rebuild(db: Session) -> int:
+    """원본 rentals/reviews 의 created_at 으로 전체 재계산 (복구용, 평소에는 호출하지 않음)"""
+    db.query(models.ProductTrend).delete(synchronize_session=False)
+    db.query(models.ProductActivityDaily).delete(synchronize_session=False)
+    db.query(models.ProductActivityHourly).delete(synchronize_session=False)
+    db.flush()
+
+    rental_q = select(models.Rental.product_id, models.Rental.created_at)
+    if _CANCELED is not None:
+        rental_q = rental_q.where(models.Rental.status != _CANCELED)
+    n = 0
+    for pid, at in db.execute(rental_q).all():
+        record_rental(db, pid, at)
+        n += 1
+    for pid, at in db.execute(select(models.Review.product_id, models.Review.created_at)).all():
+        record_review(db, pid, at)
+        n += 1
+    prune_hourly(db)
+    return n
+
+
+def ensure_backfilled(db: Session) -> bool:
+    """트렌드 테이블이 비어 있는데 원본 이벤트가 있으면(신규 배포) 1회 재계산"""
+    if db.scalar(select(func.count(models.ProductTrend.product_id))):
+        return False
+    has_events = db.scalar(select(func.count(models.Rental.id))) or db.scalar(select(func.count(models.Review.id)))
+    if not has_events:
+        return False
+    n = rebuild(db)
+    print(f"[trending] rebuilt from {n} events")
+    return True
@@ -0,0 +1,205 @@
+# FILE: app/services/upload_gc.py
+"""
+고아 업로드 정리 (uploads/ ↔ DB 대조)
+
+- DB 가 참조하는 파일 집합: photos.url, products.image_url, 파생본 JSON(photos.variants /
+  products.image_variants), media_blobs(참조 중인 blob) → 행을 yield_per 로 나눠 읽음
+- uploads/ 를 os.scandir 로 순회하며 참조되지 않은 파일을 batch_size 개씩 삭제 또는 격리(quarantine)
+  · 격리: uploads/_quarantine/<YYYYmmdd-HHMMSS>/<원래 상대경로> 로 이동 (되살리기 쉬움)
+- 업로드 중인 파일(쓰기 완료 → DB commit 사이)을 지우지 않도록 min_age 보다 최근 파일은 건너뜀
+- placeholder.png 와 격리 폴더는 대상 아님
+- CLI: python -m app.scripts.gc_uploads, 주기 실행: settings.UPLOAD_GC_INTERVAL_SECONDS
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+from . import blob_store, media_variants
+
+UPLOAD_ROOT = Path("uploads")
+QUARANTINE_DIR = "_quarantine"
+KEEP_NAMES = {"placeholder.png"}
+YIELD_PER = 1000
+
+
+@dataclass
+class GcReport:
+    scanned: int = 0
+    referenced: int = 0
+    skipped_recent: int = 0
+    orphans: int = 0
+    reclaimed_bytes: int = 0
+    removed: int = 0
+    errors: int = 0
+    samples: List[str] = field(default_factory=list)  # 처음 몇 개 경로 (로그용)
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in self.__dict__.items()}
+
+
+# -------------------- 참조 집합 --------------------
+def _rel_from_url(url: Optional[str]) -> Optional[str]:
+    """URL → uploads/ 기준 상대경로 (우리 업로드가 아니면 None)"""
+    if not url:
+        return None
+    if url.startswith(media_variants.URL_PREFIX + "/"):
+        return "variants/" + url[len(media_variants.URL_PREFIX) + 1:]
+    path = media_variants.local_path(url)
+    if path is None:
+        return None
+    try:
+        return path.relative_to(UPLOAD_ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+def _variant_urls(raw: Optional[str]) -> Iterator[str]:
+    for entry in media_variants.parse(raw).values():
+        if isinstance(entry, dict):
+            for fmt in media_variants.FORMATS:
+                if entry.get(fmt):
+                    yield entry[fmt]
+
+
+def referenced_paths(db: Session) -> Set[str]:
+    refs: Set[str] = set()
+
+    def add(url):
+        rel = _rel_from_url(url)
+        if rel:
+            refs.add(rel)
+
+    P, Pr, B = models.Photo, models.Product, models.MediaBlob
+    for url, file_path, variants in db.execute(
+        select(P.url, P.file_path, P.variants).execution_options(yield_per=YIELD_PER)
+    ):
+        add(url)
+        add(file_path)
+        for v in _variant_urls(variants):
+            add(v)
+    for url, variants in db.execute(
+        select(Pr.image_url, Pr.image_variants).execution_options(yield_per=YIELD_PER)
+    ):
+        add(url)
+        for v in _variant_urls(variants):
+            add(v)
+    for sha, ext in db.execute(
+        select(B.sha256, B.ext).where(B.ref_count > 0).execution_options(yield_per=YIELD_PER)
+    ):
+        refs.add(blob_store.path_for(sha, ext).relative_to(UPLOAD_ROOT).as_posix())
+    return refs
+
+
+# -------------------- 디렉터리 순회 --------------------
+def _walk(root: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+    """(상대경로, DirEntry) — 격리 폴더는 건너뜀"""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        if not (d == root and e.name == QUARANTINE_DIR):
+                            stack.append(Path(e.path))
+                    elif e.is_file(follow_symlinks=False):
+                        yield Path(e.path).relative_to(root).as_posix(), e
+        except FileNotFoundError:
+            continue
+
+
+def _remove(rel: str, quarantine_to: Optional[Path]) -> None:
+    src = UPLOAD_ROOT / rel
+    if quarantine_to is None:
+        src.unlink(missing_ok=True)
+        return
+    dst = quarantine_to / rel
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(src), str(dst))
+
+
+# -------------------- 실행 --------------------
+def collect(
+    dry_run: bool = True,
+    quarantine: bool = True,
+    min_age_seconds: float = 3600.0,
+    batch_size: int = 500,
+    max_files: Optional[int] = None,
+) -> GcReport:
+    """
+    고아 파일 정리. dry_run 이면 집계만.
+    batch_size 개씩 처리하고 배치 사이에 잠깐 쉬어서 디스크 I/O 를 독점하지 않음.
+    max_files 를 주면 그 개수만큼만 처리하고 종료 (다음 실행에서 이어감).
+    """
+    report = GcReport()
+    with SessionLocal() as db:
+        refs = referenced_paths(db)
+
+    cutoff = time.time() - min_age_seconds
+    quarantine_to = (
+        UPLOAD_ROOT / QUARANTINE_DIR / datetime.now().strftime("%Y%m%d-%H%M%S") if quarantine else None
+    )
+    batch: List[Tuple[str, int]] = []
+
+    def flush():
+        for rel, size in batch:
+            try:
+                _remove(rel, quarantine_to)
+                report.removed += 1
+                report.reclaimed_bytes += size
+            except OSError as e:
+                report.errors += 1
+                print(f"[upload_gc] {rel} failed:", repr(e))
+        batch.clear()
+        time.sleep(0.01)
+
+    for rel, entry in _walk(UPLOAD_ROOT):
+        report.scanned += 1
+        if rel in refs:
+            report.referenced += 1
+            continue
+        if entry.name in KEEP_NAMES:
+            continue
+        st = entry.stat(follow_symlinks=False)
+        if st.st_mtime > cutoff:
+            report.skipped_recent += 1
+            continue
+        report.orphans += 1
+        if len(report.samples) < 20:
+            report.samples.append(rel)
+        if dry_run:
+            report.reclaimed_bytes += st.st_size
+        else:
+            batch.append((rel, st.st_size))
+            if len(batch) >= batch_size:
+                flush()
+        if max_files is not None and report.orphans >= max_files:
+            break
+    if batch:
+        flush()
+    return report
+
+
+async def run_periodically(interval_seconds: float) -> None:
+    """이벤트 루프를 막지 않도록 스레드에서 실행. 주기 실행은 항상 격리(삭제 아님)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            r = await asyncio.to_thread(collect, False, True)
+            if r.orphans:
+                print("[upload_gc]", json.dumps(r.as_dict(), ensure_ascii=False))
+        except Exception as e:
+            print("[upload_gc] run failed:", repr(e))
@@ -0,0 +1,104 @@
+# FILE: app/services/uploads.py
+"""
+업로드 파일 저장 (이벤트 루프를 막지 않음)
+
+- UploadFile 을 청크 단위로 읽어 임시 파일(.part)에 쓰고, 끝나면 최종 이름으로 rename
+  · 파일 열기/쓰기/해시/rename 은 모두 스레드에서 실행 (asyncio.to_thread)
+  · 쓰는 동안 크기 상한 검사 → 넘으면 즉시 중단, 임시 파일 삭제, 413
+  · SHA-256 을 쓰면서 같이 계산 (다시 읽지 않음)
+- 실패하면 최종 경로에는 아무것도 남지 않음
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from ..settings import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES
+
+ALLOWED_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+@dataclass
+class StoredFile:
+    path: Path
+    size: int
+    sha256: str
+
+
+def image_ext(filename: Optional[str]) -> str:
+    """허용된 이미지 확장자(소문자) 반환, 아니면 400"""
+    ext = Path(filename or "").suffix.lower()
+    if ext not in ALLOWED_IMAGE_EXTS:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+    return ext
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (max {max_bytes} bytes)")
+
+
+def _write_chunk(f, h, chunk: bytes) -> None:
+    h.update(chunk)
+    f.write(chunk)
+
+
+def _discard(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(upload: UploadFile, dst: Path, max_bytes: Optional[int] = None) -> StoredFile:
+    """upload 를 dst 로 저장하고 (경로, 크기, sha256) 반환"""
+    return await _copy(upload, dst.with_name(dst.name + ".part"), dst, max_bytes)
+
+
+async def save_temp(upload: UploadFile, tmp_dir: Path, max_bytes: Optional[int] = None) -> StoredFile:
+    """
+    이름을 아직 모를 때(내용 해시로 정할 때) 사용: tmp_dir 아래 임시 파일로 저장.
+    호출부가 최종 위치로 옮기거나 discard 해야 함.
+    """
+    await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+    tmp = tmp_dir / f"{uuid.uuid4().hex}.part"
+    return await _copy(upload, tmp, tmp, max_bytes)
+
+
+async def _copy(upload: UploadFile, tmp: Path, dst: Path, max_bytes: Optional[int]) -> StoredFile:
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+    # 멀티파트 파서가 이미 크기를 알고 있으면 복사 전에 거절
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    h = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(tmp.open, "wb")
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            await asyncio.to_thread(_write_chunk, f, h, chunk)
+        await asyncio.to_thread(f.close)
+        if tmp != dst:
+            await asyncio.to_thread(os.replace, tmp, dst)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(_discard, tmp)
+        raise
+    return StoredFile(path=dst, size=size, sha256=h.hexdigest())
+
+
+async def discard(path: Path) -> None:
+    """저장 후 DB 단계가 실패했을 때 파일 정리"""
+    await asyncio.to_thread(_discard, path)
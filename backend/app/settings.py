@@ -4,7 +4,31 @@ from datetime import timedelta
 # 하나의 소스에서만 관리
 SECRET_KEY = "dev_secret_change_me"  # 운영에서는 환경변수로!
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24h
+ACCESS_TOKEN_EXPIRE_MINUTES = 15  # 짧게: 클라이언트는 401 때 /auth/refresh 로 갱신해야 함 (lib/services/api_service.dart)
+REFRESH_TOKEN_EXPIRE_DAYS = 14    # 회전식 refresh 토큰 (services.refresh_tokens)
+
+# 토큰 → 사용자(Principal) 캐시 (deps.get_current_user)
+AUTH_CACHE_TTL_SECONDS = 60.0
+AUTH_CACHE_MAX_ENTRIES = 10000
+
+# 비밀번호 해시 (services.passwords)
+BCRYPT_ROUNDS = 12             # 바꾸면 기존 사용자는 다음 로그인 때 새 cost 로 재해시
+PASSWORD_HASH_WORKERS = 2      # bcrypt 전용 스레드 수
+PASSWORD_HASH_MAX_QUEUE = 16   # 이보다 많이 밀려 있으면 즉시 503
+PASSWORD_HASH_NICE = 10        # 해시 스레드 CPU 우선순위 낮춤 (Linux)
+
+# 대여 만료 스위퍼 주기 (services.expiry)
+EXPIRY_SWEEP_INTERVAL_SECONDS = 300
+
+# 업로드 (services.uploads)
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024  # 파일당 상한 (초과 시 413)
+UPLOAD_CHUNK_BYTES = 1024 * 1024     # 디스크로 옮길 때 청크 크기
+
+# 썸네일 등 파생본 생성 프로세스 수 (services.media_variants)
+MEDIA_WORKERS = 2
+
+# 고아 업로드 격리 주기 (services.upload_gc). 0 이면 끔 → CLI(app.scripts.gc_uploads)로만 실행
+UPLOAD_GC_INTERVAL_SECONDS = 0
 
 def jwt_exp_delta():
     return timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,82 @@
+# FILE: tests/conftest.py
+"""
+공용 픽스처: 임시 폴더의 SQLite DB + uploads/ 에서 앱을 띄움 (dev.db 는 건드리지 않음)
+실행: cd backend && python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TMP = tempfile.mkdtemp(prefix="sallae_test_")
+sys.path.insert(0, _BACKEND)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.chdir(_TMP)  # uploads/ 상대경로
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import passwords  # noqa: E402
+
+passwords.pwd_context.update(bcrypt__rounds=4)  # 테스트 속도용 (운영 설정은 settings.BCRYPT_ROUNDS)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:  # startup 에서 app.migrations.run()
+        yield c
+
+
+@pytest.fixture
+def db(client):  # client: startup 에서 스키마가 만들어진 뒤에 세션을 엶
+    with SessionLocal() as s:
+        yield s
+
+
+def _set_admin(email: str, is_admin: bool = True) -> None:
+    with SessionLocal() as s:
+        u = s.query(models.User).filter_by(email=email).one()
+        u.is_admin = is_admin
+        s.commit()
+
+
+@pytest.fixture
+def make_user(client):
+    """make_user(admin=False) → (user_id, headers, login 응답)"""
+    def _make(admin: bool = False, password: str = "secret-pw"):
+        email = f"u{uuid.uuid4().hex[:10]}@example.com"
+        r = client.post("/auth/register", json={"email": email, "password": password})
+        assert r.status_code == 201, r.text
+        if admin:
+            _set_admin(email)
+        tok = client.post("/auth/login", json={"email": email, "password": password})
+        assert tok.status_code == 200, tok.text
+        body = tok.json()
+        return r.json()["id"], {"Authorization": f"Bearer {body['access_token']}"}, body
+    return _make
+
+
+@pytest.fixture
+def make_product(client):
+    def _make(name: str = "테스트 상품", price: int = 1000, **extra):
+        r = client.post("/products", json={"name": name, "price_per_day": price, **extra})
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+    return _make
+
+
+@pytest.fixture
+def book(client):
+    """book(headers, product_id, start, end) → 응답 (date 또는 'YYYY-MM-DD')"""
+    def _book(headers, product_id: int, start, end):
+        return client.post(
+            "/rentals",
+            json={"product_id": product_id, "start_date": str(start), "end_date": str(end)},
+            headers=headers,
+        )
+    return _book
@@ -0,0 +1,127 @@
+# FILE: tests/test_auth.py
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+
+from app import deps, models
+from app.routers import auth
+from app.services import passwords, refresh_tokens
+
+
+def test_register_race_returns_400(client):
+    email = f"race-{uuid.uuid4().hex[:8]}@example.com"
+    assert client.post("/auth/register", json={"email": email, "password": "secret-pw"}).status_code == 201
+
+    # _email_taken 검사를 통과한 두 번째 요청이 INSERT 에서 부딪힌 경우
+    dup = models.User(email=email, hashed_password="x", is_admin=False)
+    with pytest.raises(HTTPException) as exc:
+        auth._add_user(dup)
+    assert exc.value.status_code == 400
+
+
+def test_cancelled_hash_keeps_slot_until_work_finishes():
+    gate = threading.Event()
+
+    async def scenario():
+        task = asyncio.ensure_future(passwords._run(gate.wait, 5))
+        await asyncio.sleep(0.05)
+        assert passwords.in_flight() == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # 풀에서 아직 실행 중 → 자리 유지
+        assert passwords.in_flight() == 1
+        gate.set()
+        for _ in range(100):
+            if passwords.in_flight() == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert passwords.in_flight() == 0
+
+    asyncio.run(scenario())
+
+
+def test_overloaded_when_queue_full(monkeypatch):
+    monkeypatch.setattr(passwords, "_CAPACITY", 0)
+
+    async def scenario():
+        with pytest.raises(passwords.Overloaded):
+            await passwords.hash_password("pw")
+
+    asyncio.run(scenario())
+    assert passwords.in_flight() == 0
+
+
+def test_refresh_reuse_revokes_family(client, make_user):
+    _, _, body = make_user()
+    first = body["refresh_token"]
+    r = client.post("/auth/refresh", json={"refresh_token": first})
+    assert r.status_code == 200
+    second = r.json()["refresh_token"]
+
+    # 이미 쓴 토큰 재사용 → 거절 + 같은 family 의 새 토큰도 폐기
+    assert client.post("/auth/refresh", json={"refresh_token": first}).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": second}).status_code == 401
+
+
+def test_demoted_admin_is_rejected_before_token_expiry(client, db, make_user):
+    uid, admin, _ = make_user(admin=True)
+    assert client.get("/rentals/events", headers=admin).status_code == 200
+
+    # 다른 프로세스에서 강등된 경우처럼 ORM 이벤트 없이 직접 UPDATE (이 프로세스의 캐시는 모름)
+    db.execute(update(models.User).where(models.User.id == uid).values(is_admin=False))
+    db.commit()
+    assert client.get("/rentals/events", headers=admin).status_code == 403
+
+
+def test_user_change_evicts_cached_principal(client, db, make_user):
+    uid, admin, _ = make_user(admin=True)
+    token = admin["Authorization"].split(" ", 1)[1]
+    assert client.get("/rentals/events", headers=admin).status_code == 200
+    assert deps._cache_get(token).is_admin is True
+
+    # ORM commit → after_commit 훅이 캐시에서 제거, 이후 요청은 DB 의 현재 값으로 Principal 생성
+    db.get(models.User, uid).is_admin = False
+    db.commit()
+    assert deps._cache_get(token) is None
+    assert client.get("/rentals/events", headers=admin).status_code == 403
+    assert deps.get_current_user(token).is_admin is False
+
+    # ORM 밖의 변경은 invalidate_user 로 직접 알림 (삭제된 사용자 → 401)
+    db.execute(update(models.User).where(models.User.id == uid).values(is_admin=True))
+    db.commit()
+    assert deps._cache_get(token) is not None  # ORM 이벤트 없음 → 아직 캐시에 남아 있음
+    db.execute(models.User.__table__.delete().where(models.User.id == uid))
+    db.commit()
+    deps.invalidate_user(uid)
+    assert deps._cache_get(token) is None
+    assert client.get("/auth/me", headers=admin).status_code == 401
+
+
+def test_purge_keeps_only_live_families(client, db, make_user):
+    uid, _, _ = make_user()
+    now = datetime.utcnow()
+    RT = models.RefreshToken
+
+    def add(family, expires_in_days, revoked=False):
+        db.add(RT(token_hash=uuid.uuid4().hex, family_id=family, user_id=uid, created_at=now,
+                  expires_at=now + timedelta(days=expires_in_days), revoked_at=now if revoked else None))
+
+    live, dead, old = (f"{name}-{uuid.uuid4().hex[:8]}" for name in ("live", "dead", "old"))
+    add(live, 10, revoked=True)   # 살아 있는 family 의 폐기 행 → 재사용 감지용으로 유지
+    add(live, 10)
+    add(dead, 10, revoked=True)   # 로그아웃 등으로 family 전체 폐기
+    add(old, -1)                  # 만료
+    db.commit()
+
+    refresh_tokens.purge(db, now=now)
+    db.commit()
+    left = dict(db.execute(
+        select(RT.family_id, func.count(RT.id)).where(RT.family_id.in_([live, dead, old])).group_by(RT.family_id)
+    ).all())
+    assert left == {live: 2}
@@ -0,0 +1,100 @@
+# FILE: tests/test_blob_store.py
+import asyncio
+import hashlib
+import io
+import os
+import time
+from datetime import date, timedelta
+
+from fastapi import UploadFile
+
+from app import models
+from app.services import blob_store
+
+FUTURE = date.today() + timedelta(days=800)
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _blob(db, sha):
+    db.expire_all()
+    return db.get(models.MediaBlob, sha)
+
+
+def _stored(content: bytes) -> blob_store.Blob:
+    """테스트용: 파일을 blob 위치에 직접 두고 mtime 을 과거로 (오래전에 올라온 파일)"""
+    sha = hashlib.sha256(content).hexdigest()
+    blob = blob_store.Blob(sha256=sha, ext=".png", size=len(content))
+    blob.path.parent.mkdir(parents=True, exist_ok=True)
+    blob.path.write_bytes(content)
+    old = time.time() - 2 * blob_store.REUSE_GRACE_SECONDS
+    os.utime(blob.path, (old, old))
+    return blob
+
+
+def test_release_to_zero_unlinks_after_commit(db):
+    blob = _stored(PNG + b"a")
+    blob_store.acquire(db, blob)
+    db.commit()
+
+    blob_store.release(db, blob.sha256)
+    assert blob.path.exists()  # commit 전에는 남아 있음
+    db.commit()
+    assert _blob(db, blob.sha256) is None
+    assert not blob.path.exists()
+
+
+def test_concurrent_reuse_keeps_file(db, tmp_path):
+    blob = _stored(PNG + b"b")
+    blob_store.acquire(db, blob)
+    db.commit()
+
+    # 같은 바이트의 새 업로드가 put 까지 마친 상태 (acquire 는 아직 commit 전)
+    tmp = tmp_path / "upload.tmp"
+    tmp.write_bytes(PNG + b"b")
+    assert blob_store._place(tmp, blob.sha256, blob.ext) == blob.ext
+
+    blob_store.release(db, blob.sha256)
+    db.commit()
+    assert blob.path.exists()
+    assert not list(blob.path.parent.glob("*.del"))
+
+
+def test_cascade_delete_releases_photo_refs(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    rids = [
+        book(h, pid, FUTURE + timedelta(days=i * 2), FUTURE + timedelta(days=i * 2 + 1)).json()["id"]
+        for i in range(2)
+    ]
+    for rid in rids:  # 같은 사진을 두 대여에 업로드 → blob 1개, 참조 2
+        r = client.post("/photos/upload", headers=h, data={"rental_id": str(rid), "phase": "BEFORE"},
+                        files={"file": ("a.png", PNG, "image/png")})
+        assert r.status_code == 201, r.text
+    sha = hashlib.sha256(PNG).hexdigest()
+    assert _blob(db, sha).ref_count == 2
+
+    # 상품 삭제 → 대여 → 사진 ORM cascade 로 참조 해제
+    assert client.delete(f"/products/{pid}").status_code == 204
+    assert _blob(db, sha) is None
+
+
+def test_failed_upload_keeps_file_for_in_flight_put(db):
+    content = PNG + b"in-flight"
+
+    async def _put():
+        return await blob_store.put(UploadFile(file=io.BytesIO(content), filename="a.png"), ".png")
+
+    # B: 같은 바이트 put 완료, 아직 acquire/commit 전 / A: 같은 바이트 put 후 DB 단계 실패
+    b = asyncio.run(_put())
+    a = asyncio.run(_put())
+    blob_store.cleanup_if_unreferenced(a)
+    assert b.path.exists()
+    assert not list(b.path.parent.glob("*.del"))
+
+    blob_store.acquire(db, b)
+    db.commit()
+    assert _blob(db, b.sha256).ref_count == 1
+    assert b.path.read_bytes() == content
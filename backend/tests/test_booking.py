@@ -0,0 +1,58 @@
+# FILE: tests/test_booking.py
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, select
+
+from app import models
+from app.services import booking
+
+FUTURE = date.today() + timedelta(days=700)
+
+
+def _slots(db, **where):
+    db.expire_all()
+    return db.scalar(select(func.count(models.RentalDaySlot.id)).filter_by(**where))
+
+
+def test_slot_conflict_returns_409(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    _, h2, _ = make_user()
+    pid = make_product()
+    assert book(h, pid, FUTURE, FUTURE + timedelta(days=3)).status_code == 201
+    assert _slots(db, product_id=pid) == 3
+
+    r = book(h2, pid, FUTURE + timedelta(days=2), FUTURE + timedelta(days=4))
+    assert r.status_code == 409
+    assert _slots(db, product_id=pid) == 3
+    # 종료일은 미포함 → 바로 이어지는 기간은 가능
+    assert book(h2, pid, FUTURE + timedelta(days=3), FUTURE + timedelta(days=4)).status_code == 201
+
+
+def test_deleting_product_removes_day_slots(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    assert book(h, pid, FUTURE + timedelta(days=10), FUTURE + timedelta(days=12)).status_code == 201
+    assert _slots(db, product_id=pid) == 2
+
+    assert client.delete(f"/products/{pid}").status_code == 204
+    assert _slots(db, product_id=pid) == 0
+    assert not db.scalar(select(func.count()).select_from(models.ProductActivityHourly).filter_by(product_id=pid))
+
+
+def test_backfill_reports_overlapping_rental_ids(client, db, make_user, make_product, capsys):
+    uid, _, _ = make_user()
+    pid = make_product()
+    start = FUTURE + timedelta(days=20)
+    first = models.Rental(user_id=uid, product_id=pid, start_date=start, end_date=start + timedelta(days=3),
+                          total_price=3000, status=models.RentalStatus.ACTIVE)
+    second = models.Rental(user_id=uid, product_id=pid, start_date=start + timedelta(days=1),
+                           end_date=start + timedelta(days=4), total_price=3000, status=models.RentalStatus.ACTIVE)
+    db.add_all([first, second])
+    db.execute(delete(models.RentalDaySlot))
+    db.commit()
+
+    assert booking.ensure_backfilled(db)
+    db.commit()
+    out = capsys.readouterr().out
+    assert f"rental #{second.id} overlaps #{first.id} (2d)" in out
+    assert _slots(db, rental_id=first.id) == 3 and _slots(db, rental_id=second.id) == 1
@@ -0,0 +1,63 @@
+# FILE: tests/test_expiry.py
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app import models
+from app.services import expiry
+
+# 다른 테스트 파일(400일 이후)보다 앞선 날짜 → sweep(today=...) 이 이 파일의 대여만 건드림
+FUTURE = date.today() + timedelta(days=300)
+S = models.RentalStatus
+
+
+def _slots(db, rid):
+    return db.scalar(select(func.count(models.RentalDaySlot.id)).where(models.RentalDaySlot.rental_id == rid))
+
+
+def test_sweep_expires_only_overdue_active_rentals(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+
+    def _book(i, days=2):
+        r = book(h, pid, FUTURE + timedelta(days=i * 3), FUTURE + timedelta(days=i * 3 + days))
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    pending, active, returning, closed, canceled = (_book(i) for i in range(5))
+    not_due = _book(10)
+    db.get(models.Rental, active).status = S.ACTIVE
+    db.get(models.Rental, returning).status = S.RETURN_REQUESTED
+    db.get(models.Rental, closed).status = S.RETURN_REQUESTED
+    db.commit()
+    assert client.patch(f"/rentals/{closed}/confirm-return", headers=h).status_code == 200
+    assert client.patch(f"/rentals/{canceled}/cancel", headers=h).status_code == 200
+    before = db.scalar(select(func.max(models.RentalEvent.seq)))
+
+    today = FUTURE + timedelta(days=20)  # not_due 는 FUTURE+30 ~ +32
+    assert expiry.sweep(db, today=today) == 3
+
+    db.expire_all()
+    status = {rid: db.get(models.Rental, rid).status for rid in (pending, active, returning, closed, canceled, not_due)}
+    assert status == {
+        pending: S.EXPIRED, active: S.EXPIRED, returning: S.EXPIRED,
+        closed: S.CLOSED, canceled: S.CANCELED, not_due: S.PENDING,
+    }
+    assert [_slots(db, rid) for rid in (pending, active, returning)] == [0, 0, 0]
+    assert _slots(db, not_due) == 2
+
+    events = db.execute(
+        select(models.RentalEvent.rental_id, models.RentalEvent.old_status, models.RentalEvent.new_status)
+        .where(models.RentalEvent.seq > before)
+    ).all()
+    assert sorted(events) == sorted([
+        (pending, "PENDING", "EXPIRED"),
+        (active, "ACTIVE", "EXPIRED"),
+        (returning, "RETURN_REQUESTED", "EXPIRED"),
+    ])
+
+    # 슬롯 해제 + 캐시 무효화 → 만료된 기간은 다시 예약 가능, 두 번째 실행은 할 일 없음
+    assert client.get("/rentals/availability", params={
+        "product_id": pid, "start": FUTURE.isoformat(), "end": (FUTURE + timedelta(days=2)).isoformat(),
+    }).json()["available"] is True
+    assert expiry.sweep(db, today=today) == 0
@@ -0,0 +1,98 @@
+# FILE: tests/test_media.py
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import BytesIO
+
+import pytest
+
+from app.services import blob_store, media_variants
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes
+
+
+@pytest.fixture
+def blob_url(client):
+    sha = hashlib.sha256(CONTENT).hexdigest()
+    path = blob_store.path_for(sha, ".png")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(CONTENT)
+    return f"/media/{sha}.png", f'"{sha}"'
+
+
+def test_range_returns_206(client, blob_url):
+    url, _ = blob_url
+    r = client.get(url, headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206
+    assert r.headers["content-range"] == "bytes 10-19/1024"
+    assert r.content == CONTENT[10:20]
+
+    r = client.get(url, headers={"Range": "bytes=-4"})
+    assert r.status_code == 206 and r.content == CONTENT[-4:]
+
+
+def test_unsatisfiable_range_returns_416(client, blob_url):
+    url, _ = blob_url
+    r = client.get(url, headers={"Range": "bytes=5000-"})
+    assert r.status_code == 416
+    assert r.headers["content-range"] == "bytes */1024"
+
+
+def test_if_none_match_returns_304(client, blob_url):
+    url, etag = blob_url
+    full = client.get(url)
+    assert full.status_code == 200 and full.headers["etag"] == etag
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+
+@pytest.mark.parametrize("name", ["%2e", "%2e%2e", ".hidden_thumb.webp", "x_thumb.webp.tmp", "x_huge.webp"])
+def test_variant_rejects_names_outside_scheme(client, name):
+    kind = media_variants.subdirs()[0]
+    assert client.get(f"/media/v/{kind}/{name}").status_code == 404
+
+
+def test_non_regular_file_is_404(client):
+    sha = hashlib.sha256(b"not-a-file").hexdigest()
+    blob_store.path_for(sha, ".png").mkdir(parents=True, exist_ok=True)
+    assert client.get(f"/media/{sha}.png").status_code == 404
+
+    kind = media_variants.subdirs()[0]
+    (media_variants.VARIANT_ROOT / kind / "dir_thumb.webp").mkdir(parents=True, exist_ok=True)
+    assert client.get(f"/media/v/{kind}/dir_thumb.webp").status_code == 404
+
+
+def test_photo_upload_generates_served_variants(client, make_user, make_product, book, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")  # Pillow 는 선택 의존성
+    # 프로세스 풀(spawn) 대신 스레드 풀: 렌더링 경로는 같고 테스트가 빠름
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(media_variants, "_executor", lambda: pool)
+    buf = BytesIO()
+    Image.new("RGB", (2000, 1000), (200, 30, 30)).save(buf, "PNG")
+
+    _, h, _ = make_user()
+    pid = make_product()
+    start = date.today() + timedelta(days=880)
+    rids = [book(h, pid, start + timedelta(days=i * 2), start + timedelta(days=i * 2 + 1)).json()["id"]
+            for i in range(2)]
+    for rid in rids:  # BackgroundTasks 는 TestClient 응답 직후 실행됨
+        r = client.post("/photos/upload", headers=h, data={"rental_id": str(rid), "phase": "BEFORE"},
+                        files={"file": ("big.png", buf.getvalue(), "image/png")})
+        assert r.status_code == 201, r.text
+    pool.shutdown()
+
+    first, second = (client.get(f"/photos/by-rental/{rid}").json()[0] for rid in rids)
+    variants = first["variants"]
+    assert {k: (v["w"], v["h"]) for k, v in variants.items()} == {
+        "thumb": (240, 120), "card": (720, 360), "full": (1600, 800),
+    }
+    assert first["thumbnail_url"] == variants["thumb"]["webp"]
+    assert second["variants"] == variants  # 같은 내용 → 렌더링 없이 복사
+
+    r = client.get(variants["thumb"]["webp"])
+    assert r.status_code == 200 and r.headers["content-type"] == "image/webp"
+    assert "immutable" in r.headers["cache-control"]
+    with Image.open(BytesIO(r.content)) as im:
+        assert im.size == (240, 120)
+    r = client.get(variants["card"]["jpeg"])
+    assert r.status_code == 200 and r.headers["content-type"] == "image/jpeg"
@@ -0,0 +1,36 @@
+# FILE: tests/test_outbox.py
+from datetime import date, timedelta
+
+FUTURE = date.today() + timedelta(days=900)
+
+
+def test_incremental_read_and_consumer_offset(client, make_user, make_product, book):
+    _, h, _ = make_user()
+    _, admin, _ = make_user(admin=True)
+    start = client.get("/rentals/events/me", headers=h).json()["next_after"]
+
+    pid = make_product()
+    rid = book(h, pid, FUTURE, FUTURE + timedelta(days=2)).json()["id"]
+    assert client.patch(f"/rentals/{rid}/cancel", headers=h).status_code == 200
+
+    mine = client.get("/rentals/events/me", headers=h, params={"after": start}).json()
+    assert [(e["rental_id"], e["old_status"], e["new_status"]) for e in mine["events"]] == [
+        (rid, None, "PENDING"),
+        (rid, "PENDING", "CANCELED"),
+    ]
+    assert mine["next_after"] == mine["events"][-1]["seq"]
+    # 다음 증분 호출은 비어 있음
+    assert client.get("/rentals/events/me", headers=h, params={"after": mine["next_after"]}).json()["events"] == []
+
+    # 소비자 위치 저장 후 after 생략 시 그 다음부터
+    consumer = f"test-{pid}"
+    first = mine["events"][0]["seq"]
+    r = client.post("/rentals/events/ack", headers=admin, json={"consumer": consumer, "seq": first})
+    assert r.status_code == 200 and r.json()["last_seq"] == first
+    page = client.get("/rentals/events", headers=admin, params={"consumer": consumer}).json()
+    assert page["events"][0]["seq"] > first
+
+
+def test_events_are_admin_only(client, make_user):
+    _, h, _ = make_user()
+    assert client.get("/rentals/events", headers=h).status_code == 403
@@ -0,0 +1,51 @@
+# FILE: tests/test_pagination.py
+import base64
+import json
+import uuid
+
+import pytest
+
+
+def _cursor(obj) -> str:
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode()
+
+
+def test_products_keyset_walks_every_row_once(client, make_product):
+    cat = f"cat-{uuid.uuid4().hex[:8]}"
+    made = {make_product(f"상품 {i}", category=cat) for i in range(7)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"category": cat, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/products/page", params=params).json()
+        seen += [p["id"] for p in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 7
+    assert set(seen) == made
+    assert seen == sorted(seen, reverse=True)  # 같은 시각이면 id 내림차순
+
+
+@pytest.mark.parametrize("payload", [[1, 2], 42, "x", None])
+def test_non_object_cursor_is_first_page(client, payload):
+    r = client.get("/products/page", params={"cursor": _cursor(payload)})
+    assert r.status_code == 200
+
+
+@pytest.mark.parametrize("payload", [
+    {"last_id": "1 OR 1=1", "last_created_at": "2025-01-01T00:00:00"},
+    {"last_id": 5, "last_created_at": "not-a-date"},
+    {"last_id": 5, "last_created_at": 123},
+])
+def test_malformed_cursor_fields_are_400(client, make_user, payload):
+    _, h, _ = make_user()
+    c = _cursor(payload)
+    assert client.get("/products/page", params={"cursor": c}).status_code == 400
+    assert client.get("/reviews/by-product/1/page", params={"cursor": c}).status_code == 400
+    if not isinstance(payload["last_id"], int):
+        assert client.get("/rentals/me/page", params={"cursor": c}, headers=h).status_code == 400
+        assert client.get("/rentals/owner", params={"cursor": c}, headers=h).status_code == 400
@@ -0,0 +1,71 @@
+# FILE: tests/test_photos.py
+import hashlib
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app import models
+from app.services import blob_store, upload_gc, uploads
+
+FUTURE = date.today() + timedelta(days=870)
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _photos(db, rid):
+    return db.scalar(select(func.count(models.Photo.id)).where(models.Photo.rental_id == rid))
+
+
+def _blob(db, content):
+    db.expire_all()
+    return db.get(models.MediaBlob, hashlib.sha256(content).hexdigest())
+
+
+def test_batch_upload_partial_failure_keeps_refcounts(client, db, make_user, make_product, book, monkeypatch):
+    _, h, _ = make_user()
+    rid = book(h, make_product(), FUTURE, FUTURE + timedelta(days=1)).json()["id"]
+    form = {"rental_id": str(rid), "phase": "BEFORE"}
+    shared, fresh = PNG + b"batch-shared", PNG + b"batch-fresh"
+
+    r = client.post("/photos/upload", headers=h, data=form, files={"file": ("a.png", shared, "image/png")})
+    assert r.status_code == 201, r.text
+    assert _blob(db, shared).ref_count == 1
+
+    # 세 번째 파일이 상한 초과 → 앞의 두 장(기존 blob 1, 새 blob 1)도 반영되지 않음
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", len(fresh))
+    r = client.post("/photos/upload/batch", headers=h, data=form, files=[
+        ("files", ("a.png", shared, "image/png")),
+        ("files", ("b.png", fresh, "image/png")),
+        ("files", ("c.png", fresh + b"-too-big", "image/png")),
+    ])
+    assert r.status_code == 413
+    assert _photos(db, rid) == 1
+    assert _blob(db, shared).ref_count == 1
+    assert _blob(db, fresh) is None
+    assert blob_store.path_for(hashlib.sha256(shared).hexdigest(), ".png").exists()
+    # 새로 저장된 파일은 참조가 없으므로 upload_gc 가 고아로 회수
+    fresh_rel = blob_store.path_for(hashlib.sha256(fresh).hexdigest(), ".png").relative_to(upload_gc.UPLOAD_ROOT)
+    assert fresh_rel.as_posix() not in upload_gc.referenced_paths(db)
+
+    # 지원하지 않는 확장자는 저장 전에 전체 거절
+    r = client.post("/photos/upload/batch", headers=h, data=form, files=[
+        ("files", ("a.png", shared, "image/png")),
+        ("files", ("notes.txt", b"text", "text/plain")),
+    ])
+    assert r.status_code == 400
+    assert _photos(db, rid) == 1
+    assert _blob(db, shared).ref_count == 1
+
+    # 정상 일괄 업로드: 같은 내용 2장 → blob 참조 +2, 응답은 업로드 순서
+    monkeypatch.undo()
+    r = client.post("/photos/upload/batch", headers=h, data=form, files=[
+        ("files", ("a.png", shared, "image/png")),
+        ("files", ("b.png", fresh, "image/png")),
+        ("files", ("c.png", shared, "image/png")),
+    ])
+    assert r.status_code == 201, r.text
+    assert [p["sha256"] for p in r.json()] == [hashlib.sha256(c).hexdigest() for c in (shared, fresh, shared)]
+    assert _photos(db, rid) == 4
+    assert (_blob(db, shared).ref_count, _blob(db, fresh).ref_count) == (3, 1)
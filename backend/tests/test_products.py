@@ -0,0 +1,35 @@
+# FILE: tests/test_products.py
+import uuid
+from datetime import date, timedelta
+
+FUTURE = date.today() + timedelta(days=1000)
+
+
+def _ids(resp):
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    return {p["id"] for p in (body["items"] if isinstance(body, dict) else body)}
+
+
+def test_available_date_filter(client, make_user, make_product, book):
+    _, h, _ = make_user()
+    category = f"avail-{uuid.uuid4().hex[:8]}"
+    busy, free, canceled = (make_product(category=category) for _ in range(3))
+    assert book(h, busy, FUTURE, FUTURE + timedelta(days=3)).status_code == 201
+    rid = book(h, canceled, FUTURE, FUTURE + timedelta(days=3)).json()["id"]
+    assert client.patch(f"/rentals/{rid}/cancel", headers=h).status_code == 200
+
+    def query(path, start, end):
+        return client.get(path, params={
+            "category": category, "available_from": start.isoformat(), "available_to": end.isoformat(),
+        })
+
+    for path in ("/products", "/products/page"):
+        # 겹치는 활성 대여가 있는 상품만 빠짐 (취소된 대여는 막지 않음)
+        assert _ids(query(path, FUTURE + timedelta(days=1), FUTURE + timedelta(days=2))) == {free, canceled}
+        # 종료일 미포함: 반납일부터는 가능
+        assert _ids(query(path, FUTURE + timedelta(days=3), FUTURE + timedelta(days=5))) == {busy, free, canceled}
+
+    one_bound = client.get("/products", params={"category": category, "available_from": FUTURE.isoformat()})
+    assert one_bound.status_code == 400
+    assert query("/products", FUTURE, FUTURE).status_code == 400
@@ -0,0 +1,91 @@
+# FILE: tests/test_ratings.py
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app import migrations, models
+from app.routers.reviews_summary import MAX_BATCH
+
+FUTURE = date.today() + timedelta(days=600)
+
+
+def _review(client, db, headers, book, pid, offset, rating):
+    start = FUTURE + timedelta(days=offset)
+    rid = book(headers, pid, start, start + timedelta(days=1)).json()["id"]
+    db.get(models.Rental, rid).status = models.RentalStatus.CLOSED
+    db.commit()
+    r = client.post("/reviews", headers=headers, json={"product_id": pid, "rental_id": rid, "rating": rating})
+    assert r.status_code == 201, r.text
+
+
+def _ratings(db, pid):
+    db.expire_all()
+    p, s = db.get(models.Product, pid), db.get(models.ProductStats, pid)
+    return p.review_count, p.avg_rating, s.review_count, s.rating_sum, s.rating_4, s.rating_5
+
+
+def test_product_columns_follow_product_stats(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    _review(client, db, h, book, pid, 0, 4)
+    _review(client, db, h, book, pid, 3, 5)
+    assert _ratings(db, pid) == (2, 4.5, 2, 9, 1, 1)
+
+
+def test_migration_backfills_zeroed_aggregates(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    _review(client, db, h, book, pid, 10, 5)
+
+    # 컬럼은 이미 있지만 기본값 0 으로 남은 상태 (과거 배포에서 백필이 안 된 경우)
+    db.execute(update(models.Product).values(review_count=0, avg_rating=0.0))
+    db.execute(update(models.ProductStats).values(review_count=0, rating_sum=0, rating_5=0))
+    db.commit()
+
+    migrations.run()
+    assert _ratings(db, pid) == (1, 5.0, 1, 5, 0, 1)
+
+
+def test_batch_summary_zero_fills_and_validates(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    rated, unrated = make_product(), make_product()
+    _review(client, db, h, book, rated, 20, 4)
+    _review(client, db, h, book, rated, 23, 5)
+    missing = 10**9
+
+    r = client.post("/reviews/summary/batch", json={"product_ids": [unrated, rated, missing, rated]})
+    assert r.status_code == 200, r.text
+    # 요청 순서 유지 + 중복 제거, 리뷰 없는/없는 상품은 0건
+    assert r.json() == [
+        {"product_id": unrated, "rating_avg": None, "rating_count": 0},
+        {"product_id": rated, "rating_avg": 4.5, "rating_count": 2},
+        {"product_id": missing, "rating_avg": None, "rating_count": 0},
+    ]
+    assert client.get("/reviews/summary", params={"ids": f"{rated},{missing}"}).json() == r.json()[1:]
+
+    assert client.post("/reviews/summary/batch", json={"product_ids": ["x"]}).status_code == 422
+    assert client.post("/reviews/summary/batch", json={}).status_code == 422
+    assert client.get("/reviews/summary", params={"ids": "1,abc"}).status_code == 422
+    too_many = list(range(1, MAX_BATCH + 2))
+    assert client.post("/reviews/summary/batch", json={"product_ids": too_many}).status_code == 400
+
+
+def test_review_page_histogram_and_legacy_limit(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    for i, rating in enumerate((5, 3, 5)):
+        _review(client, db, h, book, pid, 30 + i * 3, rating)
+
+    first = client.get(f"/reviews/by-product/{pid}/page", params={"limit": 2, "with_histogram": True}).json()
+    assert [r["rating"] for r in first["items"]] == [5, 3]  # 최신순
+    assert first["histogram"] == {"1": 0, "2": 0, "3": 1, "4": 0, "5": 2}
+    second = client.get(f"/reviews/by-product/{pid}/page", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [r["rating"] for r in second["items"]] == [5]
+    assert second["next_cursor"] is None and "histogram" not in second
+
+    assert client.get(f"/reviews/histogram/{pid}").json() == {"product_id": pid, "counts": first["histogram"], "total": 3}
+
+    # 구버전 목록은 limit 까지만
+    assert len(client.get(f"/reviews/by-product/{pid}").json()) == 3
+    assert len(client.get(f"/reviews/by-product/{pid}", params={"limit": 1}).json()) == 1
+    assert client.get(f"/reviews/by-product/{pid}", params={"limit": 1000}).status_code == 422
@@ -0,0 +1,142 @@
+# FILE: tests/test_rentals.py
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app import models
+from app.database import SessionLocal
+from app.routers.rentals import _apply_bulk_status
+
+FUTURE = date.today() + timedelta(days=400)
+
+
+def _stats(db, pid):
+    db.expire_all()
+    return db.get(models.ProductStats, pid)
+
+
+def test_cancel_sets_canceled_and_drops_rental_count(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    r = book(h, pid, FUTURE, FUTURE + timedelta(days=3))
+    assert r.status_code == 201
+    assert _stats(db, pid).rental_count == 1
+
+    c = client.patch(f"/rentals/{r.json()['id']}/cancel", headers=h)
+    assert c.status_code == 200 and c.json()["status"] == "CANCELED"
+    assert _stats(db, pid).rental_count == 0
+
+    # 취소된 기간은 다시 예약 가능
+    assert client.get("/rentals/blocked-dates", params={"product_id": pid}).json() == []
+    assert book(h, pid, FUTURE, FUTURE + timedelta(days=3)).status_code == 201
+
+
+def test_confirm_return_keeps_rental_count(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    rid = book(h, pid, FUTURE, FUTURE + timedelta(days=2)).json()["id"]
+    db.get(models.Rental, rid).status = models.RentalStatus.RETURN_REQUESTED
+    db.commit()
+
+    c = client.patch(f"/rentals/{rid}/confirm-return", headers=h)
+    assert c.status_code == 200 and c.json()["status"] == "CLOSED"
+    assert _stats(db, pid).rental_count == 1
+
+
+def test_overlap_is_checked_against_db_not_cache(client, db, make_user, make_product, book):
+    uid, h, _ = make_user()
+    pid = make_product()
+    start, end = FUTURE + timedelta(days=30), FUTURE + timedelta(days=33)
+    # 캐시를 "비어 있음"으로 채워 둔 뒤, 다른 워커가 만든 것처럼 캐시 무효화 없이 DB 에 직접 예약 추가
+    assert client.get("/rentals/availability", params={
+        "product_id": pid, "start": start.isoformat(), "end": end.isoformat(),
+    }).json()["available"] is True
+    db.add(models.Rental(user_id=uid, product_id=pid, start_date=start, end_date=end,
+                         total_price=3000, status=models.RentalStatus.ACTIVE))
+    db.commit()
+
+    r = book(h, pid, start + timedelta(days=1), end + timedelta(days=1))
+    assert r.status_code == 409
+
+
+def test_batch_duplicate_ids_are_not_applied(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    _, admin, _ = make_user(admin=True)
+    pid = make_product()
+    rid = book(h, pid, FUTURE + timedelta(days=40), FUTURE + timedelta(days=41)).json()["id"]
+
+    r = client.post("/rentals/batch/transition", headers=admin, json={"items": [
+        {"rental_id": rid, "action": "cancel"},
+        {"rental_id": rid, "action": "request_return"},
+    ]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["applied"] == 0 and body["results"][0]["error"] == "Duplicate rental_id in batch"
+    db.expire_all()
+    assert db.get(models.Rental, rid).status == models.RentalStatus.PENDING
+    assert _stats(db, pid).rental_count == 1
+
+
+def test_bulk_status_skips_rows_changed_concurrently(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    rid = book(h, pid, FUTURE + timedelta(days=45), FUTURE + timedelta(days=46)).json()["id"]
+    stale = db.get(models.Rental, rid)  # 검증 시점: PENDING
+
+    # 그 사이 다른 요청이 먼저 취소
+    assert client.patch(f"/rentals/{rid}/cancel", headers=h).status_code == 200
+    events = db.scalar(select(func.count(models.RentalEvent.seq)).where(models.RentalEvent.rental_id == rid))
+
+    assert _apply_bulk_status(db, [stale], models.RentalStatus.CANCELED) == []
+    db.commit()
+    with SessionLocal() as fresh:
+        assert fresh.get(models.ProductStats, pid).rental_count == 0
+        assert fresh.scalar(
+            select(func.count(models.RentalEvent.seq)).where(models.RentalEvent.rental_id == rid)
+        ) == events
+
+
+def test_owner_revenue_excludes_pending_and_canceled(client, db, make_user, make_product, book):
+    owner, oh, _ = make_user()
+    _, h, _ = make_user()
+    pid = make_product(price=1000, owner_id=owner)
+    base = FUTURE + timedelta(days=60)
+    rids = [book(h, pid, base + timedelta(days=i * 3), base + timedelta(days=i * 3 + 2)).json()["id"]
+            for i in range(3)]
+    assert client.patch(f"/rentals/{rids[0]}/cancel", headers=h).status_code == 200
+    db.get(models.Rental, rids[2]).status = models.RentalStatus.ACTIVE
+    db.commit()
+
+    summary = client.get("/rentals/owner", headers=oh).json()["summary"]
+    assert summary["by_status"] == {
+        "CANCELED": {"count": 1, "revenue": 2000},
+        "PENDING": {"count": 1, "revenue": 2000},
+        "ACTIVE": {"count": 1, "revenue": 2000},
+    }
+    assert summary["total_count"] == 3
+    assert summary["total_revenue"] == 2000
+
+
+def test_my_rentals_expand_product_and_photos(client, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product(name="expand-상품", price=1500)
+    base = FUTURE + timedelta(days=80)
+    with_photo = book(h, pid, base, base + timedelta(days=1)).json()["id"]
+    bare = book(h, pid, base + timedelta(days=2), base + timedelta(days=3)).json()["id"]
+    r = client.post("/photos/upload", headers=h, data={"rental_id": str(with_photo), "phase": "BEFORE"},
+                    files={"file": ("a.png", b"\x89PNG\r\n\x1a\nexpand", "image/png")})
+    assert r.status_code == 201, r.text
+    photo = r.json()
+
+    rows = {x["id"]: x for x in client.get("/rentals/me", headers=h, params={"expand": "product,photos"}).json()}
+    assert rows[with_photo]["product"]["id"] == pid
+    assert rows[with_photo]["product"]["name"] == "expand-상품"
+    assert rows[with_photo]["product"]["price_per_day"] == 1500
+    assert [(p["id"], p["phase"]) for p in rows[with_photo]["photos"]] == [(photo["id"], "BEFORE")]
+    assert rows[bare]["photos"] == []
+
+    # 요청한 것만 채움 (모르는 값은 무시)
+    rows = {x["id"]: x for x in client.get("/rentals/me", headers=h, params={"expand": "product,bogus"}).json()}
+    assert rows[bare]["product"]["id"] == pid and rows[bare]["photos"] is None
+    plain = {x["id"]: x for x in client.get("/rentals/me", headers=h).json()}
+    assert plain[with_photo]["product"] is None and plain[with_photo]["photos"] is None
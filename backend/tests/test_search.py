@@ -0,0 +1,18 @@
+# FILE: tests/test_search.py
+def test_fts_matches_korean_substring(client, make_product):
+    pid = make_product("초경량 캠핑텐트 2인용")
+    other = make_product("등산 스틱")
+
+    ids = [p["id"] for p in client.get("/products/search", params={"q": "텐트"}).json()]
+    assert pid in ids and other not in ids
+
+    ids = [p["id"] for p in client.get("/search/products", params={"q": "핑텐"}).json()]
+    assert pid in ids
+
+
+def test_search_follows_rename(client, make_product):
+    pid = make_product("접이식 의자")
+    assert client.patch(f"/products/{pid}", json={"name": "캠핑 테이블"}).status_code == 200
+
+    assert pid not in [p["id"] for p in client.get("/products/search", params={"q": "의자"}).json()]
+    assert pid in [p["id"] for p in client.get("/products/search", params={"q": "테이블"}).json()]
@@ -0,0 +1,63 @@
+# FILE: tests/test_sse.py
+import asyncio
+import json
+from datetime import date, timedelta
+
+from app.routers import rental_events
+from app.services import live_events
+
+FUTURE = date.today() + timedelta(days=950)
+
+
+class _Request:
+    """is_disconnected 가 connected_checks 번만 False 를 돌려주는 가짜 요청"""
+
+    def __init__(self, connected_checks: int = 0):
+        self.left = connected_checks
+
+    async def is_disconnected(self) -> bool:
+        self.left -= 1
+        return self.left < 0
+
+
+def _events(chunks):
+    return [json.loads(c.split("data: ", 1)[1]) for c in chunks if c.startswith("id: ")]
+
+
+def test_stream_replays_backlog_after_last_event_id(client, make_user, make_product, book):
+    uid, h, _ = make_user()
+    pid = make_product()
+    rid = book(h, pid, FUTURE, FUTURE + timedelta(days=2)).json()["id"]
+    assert client.patch(f"/rentals/{rid}/cancel", headers=h).status_code == 200
+    created, canceled = client.get("/rentals/events/me", headers=h).json()["events"]
+
+    async def collect(last_seq):
+        return [c async for c in rental_events._stream(_Request(), uid, last_seq)]
+
+    chunks = asyncio.run(collect(0))
+    assert chunks[0].startswith("retry:")
+    assert [e["seq"] for e in _events(chunks)] == [created["seq"], canceled["seq"]]
+    assert chunks[1].startswith(f"id: {created['seq']}\n")
+
+    # 재연결(Last-Event-ID = 첫 이벤트) → 그 이후분만
+    assert [e["new_status"] for e in _events(asyncio.run(collect(created["seq"])))] == ["CANCELED"]
+
+
+def test_stream_delivers_live_events(client, make_user):
+    uid, _, _ = make_user()
+
+    async def scenario():
+        agen = rental_events._stream(_Request(connected_checks=1), uid, 0)
+        assert (await agen.__anext__()).startswith("retry:")
+        nxt = asyncio.ensure_future(agen.__anext__())
+        while live_events.subscriber_count() == 0:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)  # 재생(빈 backlog) 후 큐 대기 상태
+        live_events.publish([{"seq": 10**9, "user_id": uid, "rental_id": 1, "new_status": "ACTIVE"}])
+        chunk = await asyncio.wait_for(nxt, timeout=2)
+        await agen.aclose()
+        return chunk
+
+    chunk = asyncio.run(scenario())
+    assert chunk.startswith(f"id: {10**9}\nevent: rental_status\n")
+    assert live_events.subscriber_count() == 0
@@ -0,0 +1,99 @@
+# FILE: tests/test_trending.py
+import math
+import threading
+from datetime import date, datetime, timedelta
+
+from app import models
+from app.database import SessionLocal
+from app.services import trending
+
+FUTURE = date.today() + timedelta(days=500)
+
+
+def _trend(db, pid):
+    db.expire_all()
+    return db.get(models.ProductTrend, pid)
+
+
+def _hourly(db, pid):
+    db.expire_all()
+    return sum(h.rentals for h in db.query(models.ProductActivityHourly).filter_by(product_id=pid))
+
+
+def test_concurrent_events_are_all_counted(client, db, make_product):
+    pid = make_product()
+    at = datetime(2026, 1, 1, 12)
+    n = 8
+
+    def _one():
+        with SessionLocal() as s:
+            trending.record_rental(s, pid, at)
+            s.commit()
+
+    threads = [threading.Thread(target=_one) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    expected = math.log2(n * trending.WEIGHT_RENTAL) + trending._age_units(at)
+    assert abs(_trend(db, pid).score_log - expected) < 1e-9
+    assert _hourly(db, pid) == n
+
+
+def test_cancel_removes_trending_contribution(client, db, make_user, make_product, book):
+    _, h, _ = make_user()
+    pid = make_product()
+    keep = book(h, pid, FUTURE, FUTURE + timedelta(days=1)).json()["id"]
+    gone = book(h, pid, FUTURE + timedelta(days=5), FUTURE + timedelta(days=6)).json()["id"]
+    assert _hourly(db, pid) == 2
+
+    assert client.patch(f"/rentals/{gone}/cancel", headers=h).status_code == 200
+    assert _hourly(db, pid) == 1
+    kept_at = db.get(models.Rental, keep).created_at
+    expected = math.log2(trending.WEIGHT_RENTAL) + trending._age_units(kept_at)
+    assert abs(_trend(db, pid).score_log - expected) < 1e-6
+
+    rows = client.get("/products/trending", params={"window_hours": 2, "limit": 100}).json()
+    assert next(r for r in rows if r["id"] == pid)["rentals_window"] == 1
+
+
+def test_prune_hourly_drops_old_buckets(client, db, make_product):
+    pid = make_product()
+    old = datetime.utcnow() - timedelta(hours=trending.HOURLY_RETENTION_HOURS + 2)
+    trending.record_review(db, pid, old)
+    db.commit()
+    assert trending.prune_hourly(db) >= 1
+    db.commit()
+    assert not db.query(models.ProductActivityHourly).filter_by(product_id=pid).count()
+    # 일 단위 버킷과 점수는 그대로
+    assert db.query(models.ProductActivityDaily).filter_by(product_id=pid).count() == 1
+
+
+def test_portable_path_without_on_conflict(db, make_product, monkeypatch):
+    """SQLite 외 DB 경로 (FOR UPDATE + 파이썬 계산) 를 SQLite 위에서 돌려 봄"""
+    monkeypatch.setattr(trending, "_is_sqlite", lambda _db: False)
+    pid = make_product()
+    at = datetime(2026, 2, 1, 9, 30)
+    trending.record_rental(db, pid, at)
+    db.commit()
+
+    # 동시 INSERT 에 밀린 경우: 처음 조회에선 행이 없다가 INSERT 가 충돌
+    real = trending._locked_row
+    calls = []
+
+    def _first_miss(*args):
+        calls.append(1)
+        return None if len(calls) == 1 else real(*args)
+
+    monkeypatch.setattr(trending, "_locked_row", _first_miss)
+    trending.record_rental(db, pid, at)
+    monkeypatch.setattr(trending, "_locked_row", real)
+    trending.record_rental(db, pid, at)
+    trending.on_rental_status_changed(db, pid, at, models.RentalStatus.PENDING, models.RentalStatus.CANCELED)
+    db.commit()
+
+    expected = math.log2(2 * trending.WEIGHT_RENTAL) + trending._age_units(at)
+    assert abs(_trend(db, pid).score_log - expected) < 1e-9
+    assert _hourly(db, pid) == 2
+    assert trending.window_counts(db, [pid], 1, today=at.date()) == {pid: (2, 0)}
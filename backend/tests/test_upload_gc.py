@@ -0,0 +1,38 @@
+# FILE: tests/test_upload_gc.py
+import hashlib
+import os
+import time
+
+from app.services import blob_store, upload_gc
+
+
+def _file(rel: str, content: bytes, age_seconds: float):
+    path = upload_gc.UPLOAD_ROOT / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    t = time.time() - age_seconds
+    os.utime(path, (t, t))
+    return path
+
+
+def test_dry_run_reports_without_touching_files(db):
+    content = b"gc-referenced"
+    sha = hashlib.sha256(content).hexdigest()
+    blob = blob_store.Blob(sha256=sha, ext=".png", size=len(content))
+    kept = _file(blob.path.relative_to(upload_gc.UPLOAD_ROOT).as_posix(), content, 7200)
+    blob_store.acquire(db, blob)
+    db.commit()
+    orphan = _file("products/gc-orphan.png", b"orphan", 7200)
+    recent = _file("products/gc-recent.png", b"recent", 0)
+
+    report = upload_gc.collect(dry_run=True, min_age_seconds=3600)
+    assert report.removed == 0
+    assert report.orphans >= 1 and report.reclaimed_bytes >= len(b"orphan")
+    assert report.skipped_recent >= 1
+    assert kept.exists() and orphan.exists() and recent.exists()
+
+    # 실제 실행(격리): 오래된 고아만 _quarantine 으로 이동
+    applied = upload_gc.collect(dry_run=False, quarantine=True, min_age_seconds=3600)
+    assert applied.removed >= 1
+    assert not orphan.exists() and kept.exists() and recent.exists()
+    assert list((upload_gc.UPLOAD_ROOT / upload_gc.QUARANTINE_DIR).rglob("gc-orphan.png"))
@@ -0,0 +1,59 @@
+# FILE: tests/test_uploads.py
+import asyncio
+import hashlib
+import io
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services import blob_store, uploads
+
+FUTURE = date.today() + timedelta(days=850)
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _save(content: bytes, dst, size=None):
+    return asyncio.run(uploads.save_upload(UploadFile(file=io.BytesIO(content), filename="a.png", size=size), dst))
+
+
+def test_save_upload_caps_size_and_leaves_no_part(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 10)
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_BYTES", 4)
+    dst = tmp_path / "a.png"
+
+    # 크기를 모르는 스트림: 쓰는 도중 상한 초과 → 중단
+    with pytest.raises(HTTPException) as exc:
+        _save(b"x" * 11, dst)
+    assert exc.value.status_code == 413
+    # 멀티파트 파서가 크기를 알려 준 경우: 복사 전에 거절
+    with pytest.raises(HTTPException) as exc:
+        _save(b"x" * 11, dst, size=11)
+    assert exc.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+    stored = _save(b"x" * 10, dst)
+    assert (stored.path, stored.size, stored.sha256) == (dst, 10, hashlib.sha256(b"x" * 10).hexdigest())
+    assert dst.read_bytes() == b"x" * 10
+    assert [p.name for p in tmp_path.iterdir()] == ["a.png"]
+
+
+def test_photo_upload_records_hash_and_size(client, make_user, make_product, book, monkeypatch):
+    _, h, _ = make_user()
+    rid = book(h, make_product(), FUTURE, FUTURE + timedelta(days=1)).json()["id"]
+    content = PNG + b"upload-meta"
+
+    def upload():
+        return client.post("/photos/upload", headers=h, data={"rental_id": str(rid), "phase": "BEFORE"},
+                           files={"file": ("a.png", content, "image/png")})
+
+    r = upload()
+    assert r.status_code == 201, r.text
+    assert (r.json()["sha256"], r.json()["size_bytes"]) == (hashlib.sha256(content).hexdigest(), len(content))
+
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", len(content) - 1)
+    assert upload().status_code == 413
+    assert not list(blob_store.TMP_DIR.glob("*.part"))
@@ -31,27 +31,18 @@ class ApiService {
           }
           handler.next(options);
         },
+        // validateStatus 가 401 을 허용하므로 대부분의 401 은 onResponse 로 옴
+        onResponse: (res, handler) async {
+          if (res.statusCode == 401) {
+            final retry = await _recover401(res.requestOptions);
+            if (retry != null) return handler.resolve(retry);
+          }
+          handler.next(res);
+        },
         onError: (e, handler) async {
-          final status = e.response?.statusCode;
-          // 인증 엔드포인트가 아닌데 401이 오면 1회 재시도
-          if (status == 401 && !_isAuthEndpoint(e.requestOptions.path)) {
-            if (_isRetrying401) return handler.next(e);
-            if (!isAuthenticated) return handler.next(e);
-
-            try {
-              _isRetrying401 = true;
-              final ok = await refreshMe(silent: true);
-              if (ok) {
-                final retry = await _retryRequest(e.requestOptions);
-                _isRetrying401 = false;
-                return handler.resolve(retry);
-              } else {
-                await _saveToken(null);
-              }
-            } catch (_) {
-            } finally {
-              _isRetrying401 = false;
-            }
+          if (e.response?.statusCode == 401) {
+            final retry = await _recover401(e.requestOptions);
+            if (retry != null) return handler.resolve(retry);
           }
           handler.next(e);
         },
@@ -81,7 +72,9 @@ class ApiService {
       const String.fromEnvironment('API_BASE_URL', defaultValue: _defaultBaseUrl);
 
   String? _token;
-  bool _isRetrying401 = false;
+  String? _refreshToken;
+  // 동시에 여러 요청이 401 을 받아도 refresh 는 한 번만 (회전식이라 같은 토큰 재사용 시 로그인 전체가 폐기됨)
+  Future<bool>? _refreshing;
 
   bool get isAuthenticated => (_token ?? '').isNotEmpty;
   Dio get dio => _dio;
@@ -106,21 +99,70 @@ class ApiService {
   Future<void> initToken() async {
     final sp = await SharedPreferences.getInstance();
     _token = sp.getString('access_token') ?? sp.getString('auth_token');
+    _refreshToken = sp.getString('refresh_token');
     if (_token != null && _token!.isNotEmpty) {
       _dio.options.headers['Authorization'] = 'Bearer $_token';
     }
   }
 
-  Future<void> _saveToken(String? t) async {
+  /// access 토큰 저장. 비우면 refresh 토큰도 함께 지움 (로그아웃 상태)
+  Future<void> _saveToken(String? t, {String? refresh}) async {
     final sp = await SharedPreferences.getInstance();
     _token = t;
     if (t == null || t.isEmpty) {
+      _refreshToken = null;
       await sp.remove('access_token');
       await sp.remove('auth_token');
+      await sp.remove('refresh_token');
       _dio.options.headers.remove('Authorization');
     } else {
       await sp.setString('access_token', t);
       _dio.options.headers['Authorization'] = 'Bearer $t';
+      if (refresh != null && refresh.isNotEmpty) {
+        _refreshToken = refresh;
+        await sp.setString('refresh_token', refresh);
+      }
+    }
+  }
+
+  /// /auth/refresh 로 access/refresh 쌍 회전. 실패하면 false (토큰은 호출 측에서 정리)
+  Future<bool> _refreshAccessToken() {
+    final rt = _refreshToken;
+    if (rt == null || rt.isEmpty) return Future.value(false);
+    return _refreshing ??= () async {
+      try {
+        final r = await _dio.post('/auth/refresh', data: {'refresh_token': rt});
+        final data = r.data;
+        if (r.statusCode != 200 || data is! Map) return false;
+        final access = data['access_token'];
+        if (access is! String || access.isEmpty) return false;
+        final refresh = data['refresh_token'];
+        await _saveToken(access, refresh: refresh is String ? refresh : null);
+        return true;
+      } catch (_) {
+        return false;
+      } finally {
+        _refreshing = null;
+      }
+    }();
+  }
+
+  /// 인증 엔드포인트가 아닌 요청의 401 → refresh 후 1회 재시도. 복구 못 하면 null
+  Future<Response<dynamic>?> _recover401(RequestOptions req) async {
+    if (_isAuthEndpoint(req.path) || req.extra['_retried401'] == true) return null;
+    if (!isAuthenticated) return null;
+    final sent = req.headers['Authorization'];
+    // 다른 요청이 이미 토큰을 갈아 끼웠으면 refresh 없이 새 토큰으로 재시도.
+    // refresh 토큰이 없는 세션(이전 버전에서 로그인)은 여기서 로그아웃 → 다시 로그인하면 refresh 토큰을 받음
+    final ok = (sent != null && sent != 'Bearer $_token') || await _refreshAccessToken();
+    if (!ok) {
+      await _saveToken(null);
+      return null;
+    }
+    try {
+      return await _retryRequest(req);
+    } on DioException catch (e) {
+      return e.response;
     }
   }
 
@@ -160,6 +202,11 @@ class ApiService {
       return null;
     }
 
+    String? _extractRefresh(dynamic data) {
+      final v = data is Map ? data['refresh_token'] : null;
+      return v is String && v.isNotEmpty ? v : null;
+    }
+
     // 1) JSON 로그인
     try {
       final r = await _dio.post(
@@ -168,7 +215,7 @@ class ApiService {
         options: Options(headers: {'Content-Type': 'application/json'}),
       );
       final token = _extractToken(r.data);
-      await _saveToken(token);
+      await _saveToken(token, refresh: _extractRefresh(r.data));
       if (token != null && token.isNotEmpty) return token;
     } catch (_) {}
 
@@ -180,7 +227,7 @@ class ApiService {
         options: Options(contentType: Headers.formUrlEncodedContentType),
       );
       final token = _extractToken(r.data);
-      await _saveToken(token);
+      await _saveToken(token, refresh: _extractRefresh(r.data));
       if (token != null && token.isNotEmpty) return token;
     } catch (_) {}
 
@@ -188,6 +235,13 @@ class ApiService {
   }
 
   Future<void> logout() async {
+    final rt = _refreshToken;
+    if (rt != null && rt.isNotEmpty) {
+      // 서버 쪽 refresh 토큰 폐기 (실패해도 로컬 로그아웃은 진행)
+      try {
+        await _dio.post('/auth/logout', data: {'refresh_token': rt});
+      } catch (_) {}
+    }
     await _saveToken(null);
   }
 
@@ -379,10 +433,15 @@ class ApiService {
   }
 
   // ===== Reviews =====
-  Future<List<Map<String, dynamic>>> getReviewsByProduct(int productId) async {
+  // 최신순 첫 페이지만 (/reviews/by-product/{id} 는 deprecated)
+  Future<List<Map<String, dynamic>>> getReviewsByProduct(int productId, {int limit = 20}) async {
     try {
-      final r = await _dio.get('/reviews/by-product/$productId');
-      final list = (r.data as List?) ?? const [];
+      final r = await _dio.get(
+        '/reviews/by-product/$productId/page',
+        queryParameters: {'limit': limit},
+      );
+      final data = r.data;
+      final list = (data is Map ? data['items'] as List? : null) ?? const [];
       return list.cast<Map<String, dynamic>>();
     } catch (_) {
       return <Map<String, dynamic>>[];
@@ -847,7 +906,9 @@ class ApiService {
   bool _isAuthEndpoint(String path) {
     return path.startsWith('/auth/login') ||
         path.startsWith('/auth/token') ||
-        path.startsWith('/auth/register');
+        path.startsWith('/auth/register') ||
+        path.startsWith('/auth/refresh') ||
+        path.startsWith('/auth/logout');
   }
 
   Future<Response<dynamic>> _retryRequest(RequestOptions req) {
@@ -861,6 +922,7 @@ class ApiService {
           ...?req.headers,
           ...?_authHeader(),
         },
+        extra: {...req.extra, '_retried401': true},
         contentType: req.contentType,
         responseType: req.responseType,
         followRedirects: req.followRedirects,